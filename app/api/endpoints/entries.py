@@ -1,13 +1,67 @@
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, Request, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, Header, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.core.errors import NotFoundError
-from app.core.repository import EntryRepository
-from app.core.security import ENDPOINT_LIMITS, limiter
-from app.domain.models import Entry, EntryCreate, EntryStatus, EntryUpdate
+from app.core.cache import EntryCache, get_entry_cache
+from app.core.database import (
+    API_OWNER_ID,
+    async_owner_session,
+    get_async_db,
+    get_async_read_db,
+    owner_session,
+)
+from app.core.duplicates import DuplicatePolicy
+from app.core.errors import (
+    ConflictError,
+    NotFoundError,
+    PreconditionFailedError,
+    ValidationError,
+)
+from app.core.etag import (
+    collection_etag,
+    entry_etag,
+    etag_matches,
+    if_match_versions,
+    not_modified,
+)
+from app.core.export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    ExportResponse,
+    encode_export,
+    export_slots,
+)
+from app.core.fieldsets import ENTRY_FIELDS, parse_fields
+from app.core.group_commit import GroupCommitWriter, get_entry_writer
+from app.core.importer import format_from_filename, import_entries
+from app.core.pagination import EntrySort, encode_cursor
+from app.core.repository import (
+    AsyncEntryRepository,
+    CachedEntryRepository,
+    VersionMismatchError,
+)
+from app.core.security import ENDPOINT_LIMITS, EXPORT_LIMIT, limiter
+from app.core.streaming import entry_list_json
+from app.core.suggest import get_suggest_index, normalize_title
+from app.domain.models import (
+    Entry,
+    EntryBatchRequest,
+    EntryBatchResponse,
+    EntryBulkResult,
+    EntryCreate,
+    EntryDuplicateReport,
+    EntryImportReport,
+    EntryKind,
+    EntryList,
+    EntryStats,
+    EntryStatus,
+    EntrySuggestionList,
+    EntryUpdate,
+)
 
 router = APIRouter()
 
@@ -17,40 +71,494 @@ router = APIRouter()
     response_model=Entry,
     status_code=status.HTTP_201_CREATED,
     summary="Создать новую запись",
+    description=(
+        "Похожие записи ищутся только среди активных: перенесённые в архив "
+        "завершённые записи проверкой дубликатов не учитываются."
+    ),
 )
 @limiter.limit(
     ENDPOINT_LIMITS["create_entry"] if ENDPOINT_LIMITS["create_entry"] else None
 )
 async def create_entry(
-    request: Request, entry_data: EntryCreate, db: Session = Depends(get_db)
+    request: Request,
+    entry_data: EntryCreate,
+    on_duplicate: DuplicatePolicy = Query(
+        DuplicatePolicy.WARN, description="Что делать с похожими записями"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    cache: EntryCache = Depends(get_entry_cache),
+    writer: Optional[GroupCommitWriter] = Depends(get_entry_writer),
 ) -> Entry:
-    repository = EntryRepository(db)
-    return repository.create(entry_data)
+    repository = AsyncEntryRepository(db, cache)
+    duplicates = await repository.find_duplicates(entry_data.title, entry_data.link)
+    if duplicates and on_duplicate == DuplicatePolicy.REJECT:
+        raise ConflictError(
+            "Entry looks like a duplicate",
+            details={"duplicates": [match.to_dict() for match in duplicates]},
+        )
+
+    if writer is not None:
+        # Читающая транзакция отпускает соединение до записи: в профиле
+        # production пул писателя состоит из одного соединения.
+        await db.rollback()
+        entry = await writer.create(entry_data)
+    else:
+        entry = await repository.create(entry_data)
+    headers = {"ETag": entry_etag(entry.id, entry.version, None)}
+    if duplicates:
+        headers["X-Duplicate-Of"] = ", ".join(
+            str(match.record.id) for match in duplicates
+        )
+    return JSONResponse(
+        entry.to_dict(), status_code=status.HTTP_201_CREATED, headers=headers
+    )
+
+
+@router.post(
+    ":batch",
+    response_model=EntryBatchResponse,
+    summary="Пакетно создать, обновить и удалить записи",
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["batch_entries"] if ENDPOINT_LIMITS["batch_entries"] else None
+)
+async def batch_entries(
+    request: Request,
+    batch: EntryBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryBatchResponse:
+    repository = AsyncEntryRepository(db, cache)
+    records = await repository.apply_batch(batch.operations)
+
+    results = []
+    for index, (operation, record) in enumerate(zip(batch.operations, records)):
+        result = {"index": index, "op": operation.op}
+        if record is None:
+            result.update(
+                status=status.HTTP_404_NOT_FOUND,
+                id=operation.id,
+                detail=f"Entry with id {operation.id} not found",
+            )
+        elif operation.op == "delete":
+            result.update(status=status.HTTP_204_NO_CONTENT, id=record.id)
+        else:
+            result.update(
+                status=(
+                    status.HTTP_201_CREATED
+                    if operation.op == "create"
+                    else status.HTTP_200_OK
+                ),
+                id=record.id,
+                entry=record.to_dict(),
+            )
+        results.append(result)
+
+    return JSONResponse({"results": results})
 
 
-@router.get("/", response_model=List[Entry], summary="Получить список записей")
+@router.get("/", response_model=EntryList, summary="Получить список записей")
 @limiter.limit(
     ENDPOINT_LIMITS["get_entries"] if ENDPOINT_LIMITS["get_entries"] else None
 )
 async def get_entries(
     request: Request,
     status: Optional[EntryStatus] = Query(None, description="Фильтр по статусу"),
-    db: Session = Depends(get_db),
-) -> List[Entry]:
-    repository = EntryRepository(db)
-    return repository.get_all(status.value if status else None)
+    kind: Optional[EntryKind] = Query(None, description="Фильтр по типу"),
+    limit: int = Query(50, ge=1, le=200, description="Размер страницы"),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Курсор из next_cursor предыдущей страницы"
+    ),
+    sort: EntrySort = Query(EntrySort.ID, description="Поле сортировки"),
+    fields: Optional[str] = Query(
+        None, max_length=200, description="Поля через запятую, id включается всегда"
+    ),
+    stream: bool = Query(
+        False, description="Все записи после cursor одним потоковым ответом"
+    ),
+    include_archived: bool = Query(
+        False, description="Вместе с перенесёнными в архив завершёнными записями"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryList:
+    status_value = status.value if status else None
+    kind_value = kind.value if kind else None
+    projection = parse_fields(fields)
+    repository = AsyncEntryRepository(db, cache)
+
+    # Версия читается до строк: если запись успеет проскочить между запросами,
+    # клиент получит новые данные со старым ETag и просто перезапросит их.
+    version = await repository.get_collection_version()
+    etag = collection_etag(
+        version,
+        status_value,
+        kind_value,
+        None if stream else limit,
+        cursor,
+        sort.value,
+        projection,
+        # Без флага ETag прежний: параметр добавляется, только когда он задан.
+        *(("archived",) if include_archived else ()),
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    if stream:
+        # limit не действует: отдаются все строки после cursor, пачками по
+        # мере чтения курсора БД, без сборки списка и тела ответа в памяти.
+        batches = _stream_entries(
+            status=status_value,
+            kind=kind_value,
+            fields=projection,
+            sort=sort.value,
+            cursor=cursor,
+            include_archived=include_archived,
+        )
+        return StreamingResponse(
+            entry_list_json(batches),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+
+    items, next_cursor = await repository.get_page(
+        status_value,
+        limit,
+        cursor,
+        sort.value,
+        kind=kind_value,
+        fields=projection,
+        include_archived=include_archived,
+        version=version,
+    )
+    # Строки из БД уже валидированы при записи: отдаём их без повторной валидации
+    # через response_model.
+    return JSONResponse(
+        {
+            "items": items if projection else [item.to_dict() for item in items],
+            "total": len(items),
+            "next_cursor": next_cursor,
+        },
+        headers={"ETag": etag},
+    )
+
+
+async def _stream_entries(**query):
+    # Ответ читается уже после выхода из зависимостей эндпоинта, поэтому у
+    # потока своя сессия, которая живёт до последней пачки.
+    async with async_owner_session(API_OWNER_ID, read_only=True) as db:
+        async for items in AsyncEntryRepository(db).stream_all(**query):
+            yield items
+
+
+@router.get(
+    "/search",
+    response_model=EntryList,
+    summary="Полнотекстовый поиск по названию",
+    description=(
+        "Ищет только среди активных записей: перенесённые в архив завершённые "
+        "записи в полнотекстовый индекс не входят."
+    ),
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["search_entries"] if ENDPOINT_LIMITS["search_entries"] else None
+)
+async def search_entries(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    limit: int = Query(20, ge=1, le=100, description="Размер страницы"),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Курсор из next_cursor предыдущей страницы"
+    ),
+    fields: Optional[str] = Query(
+        None, max_length=200, description="Поля через запятую, id включается всегда"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryList:
+    projection = parse_fields(fields)
+    repository = AsyncEntryRepository(db, cache)
+
+    version = await repository.get_collection_version()
+    etag = collection_etag(version, "search", q, limit, cursor, projection)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    items, next_cursor = await repository.search(q, limit, cursor, fields=projection)
+    return JSONResponse(
+        {
+            "items": items if projection else [item.to_dict() for item in items],
+            "total": len(items),
+            "next_cursor": next_cursor,
+        },
+        headers={"ETag": etag},
+    )
+
+
+@router.get(
+    "/suggest",
+    response_model=EntrySuggestionList,
+    summary="Подсказки по началу названия",
+    description="Подсказки строятся только по активным записям, без архива.",
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["suggest_entries"] if ENDPOINT_LIMITS["suggest_entries"] else None
+)
+async def suggest_entries(
+    request: Request,
+    prefix: str = Query(..., min_length=1, max_length=100, description="Начало слова"),
+    limit: int = Query(10, ge=1, le=50, description="Число подсказок"),
+    db: AsyncSession = Depends(get_async_read_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntrySuggestionList:
+    if not normalize_title(prefix):
+        raise ValidationError("Prefix must not be blank")
+    index = get_suggest_index()
+    items = index.lookup(API_OWNER_ID, prefix, limit)
+    if items is None:
+        repository = AsyncEntryRepository(db, cache)
+        if index.begin_build(API_OWNER_ID):
+            try:
+                rows = await repository.get_all(
+                    owner_id=API_OWNER_ID, fields=("id", "title")
+                )
+            except Exception:
+                index.abort_build(API_OWNER_ID)
+                raise
+            index.finish_build(API_OWNER_ID, rows)
+            items = index.lookup(API_OWNER_ID, prefix, limit)
+        if items is None:
+            # Индекс строит параллельный запрос или он не помещается в память.
+            items, _ = await repository.search(
+                prefix, limit, owner_id=API_OWNER_ID, fields=("id", "title")
+            )
+    return JSONResponse({"items": items})
+
+
+@router.get(
+    "/stats", response_model=EntryStats, summary="Число записей по статусам и типам"
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["entry_stats"] if ENDPOINT_LIMITS["entry_stats"] else None
+)
+async def entry_stats(
+    request: Request,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryStats:
+    # Ответ собирается из entry_counters, а не подсчётом по entries.
+    repository = AsyncEntryRepository(db, cache)
+    version = await repository.get_collection_version()
+    etag = collection_etag(version, "stats")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    stats = await repository.get_stats()
+    return JSONResponse(stats, headers={"ETag": etag})
+
+
+@router.get(
+    "/duplicates",
+    response_model=EntryDuplicateReport,
+    summary="Группы записей с одинаковой ссылкой",
+    description="Группы собираются только из активных записей, без архива.",
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["duplicate_entries"]
+    if ENDPOINT_LIMITS["duplicate_entries"]
+    else None
+)
+async def duplicate_entries(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100, description="Групп на страницу"),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Курсор из next_cursor предыдущей страницы"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryDuplicateReport:
+    repository = AsyncEntryRepository(db, cache)
+    groups, next_cursor = await repository.duplicate_groups(limit, cursor)
+    return JSONResponse(
+        {
+            "groups": [
+                {"items": [record.to_dict() for record in group]} for group in groups
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@router.post(
+    "/import",
+    response_model=EntryImportReport,
+    summary="Импортировать записи из NDJSON или CSV",
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["import_entries"] if ENDPOINT_LIMITS["import_entries"] else None
+)
+async def import_entries_file(
+    request: Request,
+    file: UploadFile = File(...),
+    format: Optional[ExportFormat] = Query(
+        None, description="Формат файла; по умолчанию — по расширению"
+    ),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryImportReport:
+    file_format = format or format_from_filename(file.filename)
+    if file_format is None:
+        raise ValidationError("Cannot infer file format, pass format=ndjson|csv")
+
+    # Загрузка уже лежит во временном файле; чтение, проверка и вставка пачек
+    # идут в отдельном потоке, не занимая цикл событий.
+    def run():
+        with owner_session(API_OWNER_ID) as db:
+            repository = CachedEntryRepository(db, cache)
+            return import_entries(repository, file.file, file_format)
+
+    report = await run_in_threadpool(run)
+    return JSONResponse(report.to_dict())
+
+
+@router.get("/export", summary="Выгрузить все записи в NDJSON или CSV")
+@limiter.limit(EXPORT_LIMIT if EXPORT_LIMIT else None)
+async def export_entries(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.NDJSON, description="Формат выгрузки"),
+    gzip: bool = Query(False, description="Сжимать ответ (Content-Encoding: gzip)"),
+    after_id: int = Query(
+        0,
+        ge=0,
+        description="Токен продолжения: id последней полученной записи",
+    ),
+    fields: Optional[str] = Query(
+        None, max_length=200, description="Поля через запятую, id включается всегда"
+    ),
+):
+    # Строки читаются по возрастанию id серверным курсором, поэтому прерванную
+    # выгрузку можно продолжить с after_id, не начиная заново. Выгрузка — это
+    # резервная копия: архивные записи входят в неё, слои сливаются по id.
+    projection = parse_fields(fields) or ENTRY_FIELDS
+    export_slots.acquire()
+    batches = _stream_entries(
+        fields=projection,
+        cursor=encode_cursor("id", after_id, after_id) if after_id else None,
+        include_archived=True,
+    )
+    headers = {"Content-Disposition": f'attachment; filename="entries.{format.value}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return ExportResponse(
+        encode_export(batches, format, projection, gzip),
+        export_slots,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
+
+
+def _require_filter(status: Optional[EntryStatus], kind: Optional[EntryKind]) -> None:
+    # Массовая операция без фильтра затронула бы все записи владельца.
+    if status is None and kind is None:
+        raise ValidationError("At least one filter (status or kind) is required")
+
+
+@router.patch(
+    "/",
+    response_model=EntryBulkResult,
+    summary="Обновить все записи, подходящие под фильтр",
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["bulk_update_entries"]
+    if ENDPOINT_LIMITS["bulk_update_entries"]
+    else None
+)
+async def bulk_update_entries(
+    request: Request,
+    entry_data: EntryUpdate,
+    status: Optional[EntryStatus] = Query(None, description="Фильтр по статусу"),
+    kind: Optional[EntryKind] = Query(None, description="Фильтр по типу"),
+    db: AsyncSession = Depends(get_async_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryBulkResult:
+    _require_filter(status, kind)
+    repository = AsyncEntryRepository(db, cache)
+    ids = await repository.update_where(
+        entry_data,
+        status.value if status else None,
+        kind.value if kind else None,
+    )
+    return JSONResponse({"affected": len(ids), "ids": ids})
+
+
+@router.delete(
+    "/",
+    response_model=EntryBulkResult,
+    summary="Удалить все записи, подходящие под фильтр",
+)
+@limiter.limit(
+    ENDPOINT_LIMITS["bulk_delete_entries"]
+    if ENDPOINT_LIMITS["bulk_delete_entries"]
+    else None
+)
+async def bulk_delete_entries(
+    request: Request,
+    status: Optional[EntryStatus] = Query(None, description="Фильтр по статусу"),
+    kind: Optional[EntryKind] = Query(None, description="Фильтр по типу"),
+    db: AsyncSession = Depends(get_async_db),
+    cache: EntryCache = Depends(get_entry_cache),
+) -> EntryBulkResult:
+    _require_filter(status, kind)
+    repository = AsyncEntryRepository(db, cache)
+    ids = await repository.delete_where(
+        status.value if status else None, kind.value if kind else None
+    )
+    return JSONResponse({"affected": len(ids), "ids": ids})
+
+
+@contextmanager
+def _precondition(entry_id: int):
+    # If-Match не совпал с версией строки: 412 с актуальным ETag записи (тем
+    # же, что отдаёт GET без fields).
+    try:
+        yield
+    except VersionMismatchError as e:
+        raise PreconditionFailedError(
+            f"Entry with id {entry_id} has been modified",
+            details={"etag": entry_etag(entry_id, e.version, None)},
+        )
 
 
 @router.get("/{entry_id}", response_model=Entry, summary="Получить запись по ID")
 @limiter.limit(ENDPOINT_LIMITS["get_entry"] if ENDPOINT_LIMITS["get_entry"] else None)
 async def get_entry(
-    request: Request, entry_id: int, db: Session = Depends(get_db)
+    request: Request,
+    entry_id: int,
+    fields: Optional[str] = Query(
+        None, max_length=200, description="Поля через запятую, id включается всегда"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    cache: EntryCache = Depends(get_entry_cache),
 ) -> Entry:
-    repository = EntryRepository(db)
-    entry = repository.get_by_id(entry_id)
+    projection = parse_fields(fields)
+    # ETag и тело берутся из одной записи (из кэша или БД), поэтому ETag
+    # всегда описывает отданную версию, а попадание в кэш обходится без БД.
+    # Проекция читается вместе с version, но отдаётся без неё.
+    columns = (*projection, "version") if projection else None
+    entry = await AsyncEntryRepository(db, cache).get_by_id(entry_id, columns)
     if not entry:
         raise NotFoundError(f"Entry with id {entry_id}")
-    return entry
+    if projection:
+        version, payload = entry.pop("version"), entry
+    else:
+        version, payload = entry.version, entry.to_dict()
+    etag = entry_etag(entry_id, version, projection)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return JSONResponse(payload, headers={"ETag": etag})
 
 
 @router.put("/{entry_id}", response_model=Entry, summary="Обновить запись")
@@ -61,13 +569,22 @@ async def update_entry(
     request: Request,
     entry_id: int,
     entry_data: EntryUpdate,
-    db: Session = Depends(get_db),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    cache: EntryCache = Depends(get_entry_cache),
+    writer: Optional[GroupCommitWriter] = Depends(get_entry_writer),
 ) -> Entry:
-    repository = EntryRepository(db)
-    entry = repository.update(entry_id, entry_data)
+    versions = if_match_versions(if_match, entry_id)
+    if writer is not None and versions is None:
+        entry = await writer.update(entry_id, entry_data)
+    else:
+        repository = AsyncEntryRepository(db, cache)
+        with _precondition(entry_id):
+            entry = await repository.update(entry_id, entry_data, versions)
     if not entry:
         raise NotFoundError(f"Entry with id {entry_id}")
-    return entry
+    etag = entry_etag(entry_id, entry.version, None)
+    return JSONResponse(entry.to_dict(), headers={"ETag": etag})
 
 
 @router.delete(
@@ -76,7 +593,20 @@ async def update_entry(
 @limiter.limit(
     ENDPOINT_LIMITS["delete_entry"] if ENDPOINT_LIMITS["delete_entry"] else None
 )
-async def delete_entry(request: Request, entry_id: int, db: Session = Depends(get_db)):
-    repository = EntryRepository(db)
-    if not repository.delete(entry_id):
+async def delete_entry(
+    request: Request,
+    entry_id: int,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    cache: EntryCache = Depends(get_entry_cache),
+    writer: Optional[GroupCommitWriter] = Depends(get_entry_writer),
+):
+    versions = if_match_versions(if_match, entry_id)
+    if writer is not None and versions is None:
+        deleted = await writer.delete(entry_id)
+    else:
+        repository = AsyncEntryRepository(db, cache)
+        with _precondition(entry_id):
+            deleted = await repository.delete(entry_id, versions)
+    if not deleted:
         raise NotFoundError(f"Entry with id {entry_id}")
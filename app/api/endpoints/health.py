@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request
 
+from app.core.cache import get_entry_cache
 from app.core.security import ENDPOINT_LIMITS, limiter
 
 router = APIRouter()
@@ -11,3 +12,11 @@ router = APIRouter()
 )
 async def health_check(request: Request):
     return {"status": "ok", "service": "Reading List API"}
+
+
+@router.get("/health/cache")
+@limiter.limit(
+    ENDPOINT_LIMITS["health_check"] if ENDPOINT_LIMITS["health_check"] else None
+)
+async def cache_stats(request: Request):
+    return get_entry_cache().stats()
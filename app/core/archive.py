@@ -0,0 +1,79 @@
+"""Перенос давно завершённых записей из entries в entries_archive.
+
+Большая часть строк — status=completed, их почти не читают, но они раздувают
+entries и её индексы, а с ними каждый скан и фильтр списка. Задача переносит
+завершённые записи, не менявшиеся дольше --days, небольшими пачками: одна
+пачка — одна короткая транзакция, между пачками пауза для других писателей.
+Запись по id по-прежнему читается (read-through), список отдаёт их с
+include_archived=true, а изменение архивной записи возвращает её в entries.
+
+Запуск: python -m app.core.archive [--days 90] [--batch-size 500] [--owner-id 1]
+"""
+
+import argparse
+import time
+from datetime import timedelta
+from typing import Optional
+
+from app.core.cache import get_entry_cache
+from app.core.database import SessionLocal, engine, owner_session, shard_router
+from app.core.repository import CachedEntryRepository
+from app.domain.database_models import utcnow
+
+ARCHIVE_AFTER_DAYS = 90
+ARCHIVE_BATCH_SIZE = 500
+# Пауза между пачками, секунды: писатели API не ждут всю архивацию целиком.
+ARCHIVE_PAUSE = 0.05
+
+
+def archive_session(
+    db,
+    days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    owner_id: Optional[int] = None,
+    pause: float = ARCHIVE_PAUSE,
+) -> int:
+    # Через кэш приложения: с общим Redis страницы списков сбрасываются и в
+    # процессах API, иначе они доживают до ENTRY_CACHE_TTL.
+    repository = CachedEntryRepository(db, get_entry_cache())
+    before = utcnow() - timedelta(days=days)
+    archived = 0
+    while True:
+        archived_ids = repository.archive_completed(before, batch_size, owner_id)
+        moved = sum(len(ids) for ids in archived_ids.values())
+        archived += moved
+        if moved < batch_size:
+            return archived
+        time.sleep(pause)
+
+
+def archive(
+    days: int = ARCHIVE_AFTER_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    owner_id: Optional[int] = None,
+) -> int:
+    if owner_id is not None:
+        with owner_session(owner_id) as db:
+            return archive_session(db, days, batch_size, owner_id)
+    # Без владельца архивируются все шарды.
+    binds = shard_router.writers() if shard_router is not None else [engine]
+    archived = 0
+    for bind in binds:
+        with SessionLocal(bind=bind) as db:
+            archived += archive_session(db, days, batch_size)
+    return archived
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--owner-id", type=int, default=None)
+    args = parser.parse_args()
+
+    archived = archive(args.days, args.batch_size, args.owner_id)
+    print(f"entries_archive: {archived} entries archived")
+
+
+if __name__ == "__main__":
+    main()
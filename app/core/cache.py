@@ -0,0 +1,283 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from itertools import product
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import redis
+
+from app.core.secrets import secrets_manager
+from app.domain.models import EntryKind, EntryStatus
+
+ENTRY_CACHE_SIZE = 10_000
+ENTRY_CACHE_TTL = 30
+# Поколения записей живут дольше значений: сброс счётчика в 0 не вернёт
+# к жизни значение, записанное под старым нулевым поколением.
+ENTRY_GENERATION_TTL = 24 * 60 * 60
+
+STATUSES = frozenset(status.value for status in EntryStatus)
+KINDS = frozenset(kind.value for kind in EntryKind)
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    def __init__(
+        self,
+        maxsize: int = ENTRY_CACHE_SIZE,
+        ttl: float = ENTRY_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._lookup(key)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "size": len(self._data),
+        }
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= self.clock():
+            del self._data[key]
+            self.expirations += 1
+            return None
+        return value
+
+
+class RedisCache:
+    # Второй уровень, общий для всех процессов. Ошибки Redis не роняют запрос:
+    # кэш просто пропускается, а ошибка попадает в счётчик.
+    def __init__(self, client: "redis.Redis", ttl: float = ENTRY_CACHE_TTL):
+        self.client = client
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self.client.get(key)
+        except redis.RedisError as e:
+            self._failed("get", e)
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            self.client.set(key, json.dumps(value), ex=int(self.ttl))
+        except redis.RedisError as e:
+            self._failed("set", e)
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except redis.RedisError as e:
+            self._failed("delete", e)
+
+    def get_int(self, key: str) -> Optional[int]:
+        try:
+            raw = self.client.get(key)
+        except redis.RedisError as e:
+            self._failed("get", e)
+            return None
+        return int(raw) if raw is not None else 0
+
+    def incr(self, *keys: str, ttl: Optional[int] = None) -> None:
+        if not keys:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.incr(key)
+                if ttl is not None:
+                    pipe.expire(key, ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._failed("incr", e)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning(f"Redis cache {operation} failed: {error}")
+
+
+class EntryCache:
+    # Ключи списков содержат поколение своей группы (owner, status, kind):
+    # запись в группу увеличивает поколение, и все её страницы становятся
+    # недостижимы, не трогая списки других фильтров. С Redis так же устроены
+    # ключи записей (entry:{id}:{поколение}): локальный уровень другого
+    # процесса не отдаст запись, изменённую здесь. Без Redis процесс один,
+    # и ключ entry:{id} просто удаляется.
+    def __init__(self, local: LRUCache, shared: Optional[RedisCache] = None):
+        self.local = local
+        self.shared = shared
+        self._generations: Dict[str, int] = {}
+
+    @classmethod
+    def from_url(cls, redis_url: Optional[str] = None) -> "EntryCache":
+        shared = RedisCache(redis.Redis.from_url(redis_url)) if redis_url else None
+        return cls(LRUCache(), shared)
+
+    def entry_key(self, entry_id: int) -> Optional[str]:
+        # Ключ берётся до чтения из БД и им же записывается результат: запись,
+        # закоммиченная между ними, сменит поколение, и старое значение
+        # окажется под уже недостижимым ключом. None — Redis недоступен.
+        if self.shared is None:
+            return f"entry:{entry_id}"
+        generation = self.shared.get_int(self._entry_generation(entry_id))
+        if generation is None:
+            return None
+        return f"entry:{entry_id}:{generation}"
+
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._get(key)
+
+    def peek_entry(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        key = self.entry_key(entry_id)
+        return self.local.peek(key) if key else None
+
+    def set_entry(self, key: str, data: Dict[str, Any]) -> None:
+        self._set(key, data)
+
+    def list_key(
+        self, owner_id: int, status: Optional[str], kind: Optional[str], *params
+    ) -> Optional[str]:
+        group = self._group(owner_id, status, kind)
+        if self.shared is not None:
+            generation = self.shared.get_int(group)
+            if generation is None:
+                return None
+        else:
+            generation = self._generations.get(group, 0)
+        suffix = ":".join("" if param is None else str(param) for param in params)
+        return f"entries:{owner_id}:{status or ''}:{kind or ''}:{generation}:{suffix}"
+
+    def get_list(self, key: str) -> Optional[Any]:
+        return self._get(key)
+
+    def set_list(self, key: str, payload: Any) -> None:
+        self._set(key, payload)
+
+    def invalidate(
+        self,
+        owner_id: int,
+        entry_ids: Iterable[int] = (),
+        statuses: Optional[Set[str]] = None,
+        kinds: Optional[Set[str]] = None,
+    ) -> None:
+        # statuses/kinds — значения затронутых строк; None значит «любое».
+        # Списки без фильтра по измерению затрагиваются всегда.
+        entry_ids = list(entry_ids)
+        groups = [
+            self._group(owner_id, status, kind)
+            for status, kind in product(
+                [None, *(STATUSES if statuses is None else statuses)],
+                [None, *(KINDS if kinds is None else kinds)],
+            )
+        ]
+
+        for group in groups:
+            self._generations[group] = self._generations.get(group, 0) + 1
+        if self.shared is None:
+            self.local.delete(*(f"entry:{entry_id}" for entry_id in entry_ids))
+            return
+        self.shared.incr(*groups)
+        self.shared.incr(
+            *(self._entry_generation(entry_id) for entry_id in entry_ids),
+            ttl=ENTRY_GENERATION_TTL,
+        )
+
+    def clear(self) -> None:
+        self.local.clear()
+        self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "local": self.local.stats(),
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
+
+    def _entry_generation(self, entry_id: int) -> str:
+        return f"entries:generation:entry:{entry_id}"
+
+    def _group(self, owner_id: int, status: Optional[str], kind: Optional[str]) -> str:
+        return f"entries:generation:{owner_id}:{status or ''}:{kind or ''}"
+
+    def _get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def _set(self, key: str, value: Any) -> None:
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+
+_entry_cache: Optional[EntryCache] = None
+
+
+def get_entry_cache() -> EntryCache:
+    global _entry_cache
+    if _entry_cache is None:
+        _entry_cache = EntryCache.from_url(secrets_manager.get("REDIS_URL"))
+    return _entry_cache
@@ -0,0 +1,52 @@
+import logging
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Сессии приложения создаются с info={PUBLISH_KEY: True} (см. app.core.database):
+# только их изменения доходят до подписчиков, сессии на других базах (тесты,
+# бенчмарки, утилиты) ничего не публикуют.
+PUBLISH_KEY = "publish_entry_changes"
+PENDING_KEY = "pending_entry_changes"
+
+logger = logging.getLogger(__name__)
+
+
+class EntryChange(NamedTuple):
+    entry_id: int
+    owner_id: int
+    title: Optional[str]  # None — запись удалена
+
+
+EntryChangeListener = Callable[[List[EntryChange]], None]
+
+_listeners: List[EntryChangeListener] = []
+
+
+def subscribe(listener: EntryChangeListener) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def publish(session: Session, changes: Iterable[EntryChange]) -> None:
+    # Изменения копятся до COMMIT: откат транзакции их просто выбрасывает.
+    if session.info.get(PUBLISH_KEY):
+        session.info.setdefault(PENDING_KEY, []).extend(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver(session: Session) -> None:
+    changes = session.info.pop(PENDING_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        try:
+            listener(changes)
+        except Exception:
+            logger.exception("Entry change listener failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,33 @@
+"""Контрольная точка WAL для профиля SQLITE_PROFILE=production.
+
+Автоматическая контрольная точка (wal_autocheckpoint) не ждёт читателей и при
+постоянной нагрузке может не успевать: WAL растёт, чтение замедляется.
+Задача переносит WAL в файл базы и усекает его; её можно запускать по
+расписанию в часы низкой нагрузки.
+
+Запуск: python -m app.core.checkpoint [--mode TRUNCATE]
+"""
+
+import argparse
+
+from app.core.database import CHECKPOINT_MODES, checkpoint, shard_router
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=CHECKPOINT_MODES, default="TRUNCATE")
+    args = parser.parse_args()
+
+    # При SHARD_MAP контрольная точка делается в каждом шарде.
+    shards = shard_router.shards if shard_router is not None else {"": None}
+    for name in shards:
+        bind = shard_router.engines(name).writer if name else None
+        busy, log_pages, checkpointed = checkpoint(args.mode, bind)
+        print(
+            f"{name + ': ' if name else ''}wal_checkpoint({args.mode}): "
+            f"busy={busy} wal={log_pages} moved={checkpointed}"
+        )
+
+
+if __name__ == "__main__":
+    main()
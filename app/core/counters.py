@@ -0,0 +1,40 @@
+"""Сверка entry_counters с таблицей entries.
+
+Счётчики меняются транзакционно вместе с записями, но массовые операции
+в параллельных транзакциях или ручные правки базы могут их рассинхронизировать.
+Задача пересчитывает их одним GROUP BY; её можно запускать по расписанию.
+
+Запуск: python -m app.core.counters [--owner-id 1]
+"""
+
+import argparse
+from typing import Optional
+
+from app.core.database import SessionLocal, engine, owner_session, shard_router
+from app.core.repository import EntryRepository
+
+
+def reconcile(owner_id: Optional[int] = None) -> int:
+    if owner_id is not None:
+        with owner_session(owner_id) as db:
+            return EntryRepository(db).reconcile_counters(owner_id)
+    # Без владельца пересчитываются все шарды.
+    binds = shard_router.writers() if shard_router is not None else [engine]
+    rows = 0
+    for bind in binds:
+        with SessionLocal(bind=bind) as db:
+            rows += EntryRepository(db).reconcile_counters()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--owner-id", type=int, default=None)
+    args = parser.parse_args()
+
+    rows = reconcile(args.owner_id)
+    print(f"entry_counters: {rows} rows recomputed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,261 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import bisect
+import hashlib
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.changes import PUBLISH_KEY
 from app.core.secrets import secrets_manager
 
 database_url = secrets_manager.get("DATABASE_URL", "sqlite:///./reading_list.db")
 
-engine = create_engine(
-    database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
-    echo=True,
+# default — прежнее поведение: один пул, журнал отката SQLite.
+# production — WAL, настроенные PRAGMA, отдельные пулы читателей и писателя.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "default")
+
+# Применяются к каждому соединению при открытии. journal_mode=WAL хранится в
+# самом файле базы, остальные действуют только на соединение.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 2**20,
+    # Отрицательное значение — в КиБ: 64 МиБ страничного кэша на соединение.
+    "cache_size": -64 * 2**10,
+    "temp_store": "MEMORY",
+    # Контрольная точка: автоматически каждые 1000 страниц WAL, после неё файл
+    # WAL усекается до 64 МиБ. Полная — checkpoint(), см. app.core.checkpoint.
+    "wal_autocheckpoint": 1000,
+    "journal_size_limit": 64 * 2**20,
+}
+CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+READER_POOL_SIZE = 8
+# SQLite допускает одного писателя: остальные ждут соединение в пуле, а не
+# крутятся в busy_timeout.
+WRITER_POOL_SIZE = 1
+
+# SHARD_MAP=shards.json: записи владельцев разнесены по нескольким файлам
+# SQLite (см. ShardRouter). Без карты — одна база database_url, как раньше.
+SHARD_MAP_PATH = os.getenv("SHARD_MAP")
+# Точек на кольце у каждого шарда: больше — ровнее распределение владельцев.
+SHARD_REPLICAS = 64
+# API пока обслуживает одного владельца — того же, что по умолчанию у
+# EntryRepository; его шард и отдают get_async_db/get_async_read_db.
+API_OWNER_ID = 1
+
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def apply_sqlite_pragmas(engine: Engine, read_only: bool = False) -> None:
+    # Для async-движка передаётся engine.sync_engine: событие connect получает
+    # DBAPI-адаптер aiosqlite с тем же синхронным cursor().
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+def create_engines(
+    url: str, profile: str = SQLITE_PROFILE, async_: bool = False, echo: bool = True
+):
+    # Возвращает (писатель, читатель). Вне профиля production это один движок.
+    factory = create_async_engine if async_ else create_engine
+    options = {"echo": echo}
+    if is_sqlite(url) and not async_:
+        options["connect_args"] = {"check_same_thread": False}
+    if profile != "production" or not is_sqlite(url) or ":memory:" in url:
+        engine = factory(url, **options)
+        return engine, engine
+
+    writer = factory(url, pool_size=WRITER_POOL_SIZE, max_overflow=0, **options)
+    reader = factory(url, pool_size=READER_POOL_SIZE, max_overflow=0, **options)
+    apply_sqlite_pragmas(writer.sync_engine if async_ else writer)
+    apply_sqlite_pragmas(reader.sync_engine if async_ else reader, read_only=True)
+    return writer, reader
+
+
+engine, read_engine = create_engines(database_url)
+
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, info={PUBLISH_KEY: True}
 )
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    driver = ASYNC_DRIVERS.get(scheme.split("+")[0])
+    return f"{driver}://{rest}" if driver else url
+
+
+async_engine, async_read_engine = create_engines(
+    async_database_url(database_url), async_=True
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    info={PUBLISH_KEY: True},
+)
+# Сессии только для чтения: GET-эндпоинты и выгрузки. В профиле production
+# соединения открыты с query_only, запись через них завершится ошибкой.
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def _ring_hash(key: str) -> int:
+    # Стабильный между процессами хеш (hash() для str солится при запуске).
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class ShardEngines(NamedTuple):
+    writer: Engine
+    reader: Engine
+    async_writer: AsyncEngine
+    async_reader: AsyncEngine
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class ShardRouter:
+    # Владелец -> шард: сначала явное закрепление из карты (его пишет
+    # app.core.rebalance), иначе консистентное хеширование. При добавлении
+    # шарда на новое место переезжает лишь ~1/N владельцев. Движки и пулы
+    # каждого шарда создаются при первом обращении, с тем же профилем SQLite.
+    def __init__(
+        self,
+        shards: Dict[str, str],
+        owners: Optional[Dict[int, str]] = None,
+        replicas: int = SHARD_REPLICAS,
+        profile: str = SQLITE_PROFILE,
+        echo: bool = True,
+    ):
+        if not shards:
+            raise ValueError("Shard map has no shards")
+        self.shards = dict(shards)
+        self.owners = {int(owner_id): name for owner_id, name in (owners or {}).items()}
+        unknown = set(self.owners.values()) - self.shards.keys()
+        if unknown:
+            raise ValueError(f"Owners pinned to unknown shards: {sorted(unknown)}")
+        self.replicas = replicas
+        self.profile = profile
+        self.echo = echo
+        ring = sorted(
+            (_ring_hash(f"{name}#{i}"), name)
+            for name in self.shards
+            for i in range(replicas)
+        )
+        self._points = [point for point, _ in ring]
+        self._names = [name for _, name in ring]
+        self._engines: Dict[str, ShardEngines] = {}
+
+    @classmethod
+    def load(cls, path: str, **options) -> "ShardRouter":
+        # {"shards": {"a": "sqlite:///./a.db", ...}, "owners": {"42": "a"}}
+        with open(path) as f:
+            shard_map = json.load(f)
+        return cls(shard_map["shards"], shard_map.get("owners"), **options)
+
+    def save(self, path: str) -> None:
+        shard_map = {
+            "shards": self.shards,
+            "owners": {str(k): v for k, v in sorted(self.owners.items())},
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(shard_map, f, indent=2)
+        os.replace(tmp, path)
+
+    def hashed_shard(self, owner_id: int) -> str:
+        # Первая точка кольца по часовой стрелке от хеша владельца.
+        i = bisect.bisect(self._points, _ring_hash(str(owner_id)))
+        return self._names[i % len(self._names)]
+
+    def shard_for(self, owner_id: int) -> str:
+        return self.owners.get(owner_id) or self.hashed_shard(owner_id)
+
+    def pin(self, owner_id: int, name: str) -> None:
+        if name not in self.shards:
+            raise ValueError(f"Unknown shard: {name}")
+        if name == self.hashed_shard(owner_id):
+            self.owners.pop(owner_id, None)
+        else:
+            self.owners[owner_id] = name
+
+    def engines(self, name: str) -> ShardEngines:
+        if name not in self._engines:
+            url = self.shards[name]
+            writer, reader = create_engines(url, self.profile, echo=self.echo)
+            async_writer, async_reader = create_engines(
+                async_database_url(url), self.profile, async_=True, echo=self.echo
+            )
+            self._engines[name] = ShardEngines(
+                writer, reader, async_writer, async_reader
+            )
+        return self._engines[name]
+
+    def session(self, owner_id: int, read_only: bool = False) -> Session:
+        engines = self.engines(self.shard_for(owner_id))
+        if read_only:
+            return ReadSessionLocal(bind=engines.reader)
+        return SessionLocal(bind=engines.writer)
+
+    def async_session(self, owner_id: int, read_only: bool = False) -> AsyncSession:
+        engines = self.engines(self.shard_for(owner_id))
+        if read_only:
+            return AsyncReadSessionLocal(bind=engines.async_reader)
+        return AsyncSessionLocal(bind=engines.async_writer)
+
+    def writers(self) -> List[Engine]:
+        return [self.engines(name).writer for name in self.shards]
+
+    def dispose(self) -> None:
+        # Синхронно закрывает пулы; async-движки закрываются через sync_engine.
+        for engines in self._engines.values():
+            for engine_ in (engines.writer, engines.reader):
+                engine_.dispose()
+            for engine_ in (engines.async_writer, engines.async_reader):
+                engine_.sync_engine.dispose()
+        self._engines.clear()
+
+
+shard_router: Optional[ShardRouter] = (
+    ShardRouter.load(SHARD_MAP_PATH) if SHARD_MAP_PATH else None
+)
+
+
+def owner_session(owner_id: int, read_only: bool = False) -> Session:
+    # Сессия базы, где живут записи владельца: его шард или единственная база.
+    if shard_router is not None:
+        return shard_router.session(owner_id, read_only)
+    return (ReadSessionLocal if read_only else SessionLocal)()
+
+
+def async_owner_session(owner_id: int, read_only: bool = False) -> AsyncSession:
+    if shard_router is not None:
+        return shard_router.async_session(owner_id, read_only)
+    return (AsyncReadSessionLocal if read_only else AsyncSessionLocal)()
 
 
 def get_db():
@@ -22,7 +266,31 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    async with async_owner_session(API_OWNER_ID) as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with async_owner_session(API_OWNER_ID, read_only=True) as db:
+        yield db
+
+
+def checkpoint(mode: str = "TRUNCATE", bind: Optional[Engine] = None) -> tuple:
+    # Переносит WAL в файл базы. TRUNCATE ждёт читателей и обнуляет WAL,
+    # PASSIVE не ждёт. Возвращает (busy, страниц в WAL, перенесено).
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+    with (bind or engine).connect() as connection:
+        row = connection.exec_driver_sql(f"PRAGMA wal_checkpoint({mode})").one()
+    return tuple(row)
+
+
 def create_tables():
-    from app.domain.database_models import Base
+    from app.core.migrate import migrate
 
-    Base.metadata.create_all(bind=engine)
+    # Схему ведут миграции Alembic, а не create_all: иначе база, запущенная
+    # до миграций, не проходит alembic upgrade. Схема доводится до head в
+    # каждом шарде: владельцы могут переехать в любой.
+    for bind in shard_router.writers() if shard_router is not None else [engine]:
+        migrate(bind)
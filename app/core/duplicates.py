@@ -0,0 +1,106 @@
+import hashlib
+import re
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+from urllib.parse import urlsplit
+
+from app.core.suggest import normalize_title
+from app.domain.models import EntryRecord
+
+# Порог похожести названий (доля общих триграмм, как similarity() в pg_trgm).
+TITLE_SIMILARITY = 0.8
+# Сколько похожих названий попадает в ответ (в Postgres — сколько ближайших
+# по pg_trgm названий проверяется точно).
+MAX_TITLE_CANDIDATES = 20
+# Сколько строк, прошедших триграммный фильтр SQLite, проверяется точно.
+# До этого же предела считается частота триграммы: чтобы выбрать редкие,
+# точное число не нужно, а список документов частой триграммы читать дорого.
+MAX_TRIGRAM_CANDIDATES = 500
+MAX_QUERY_TRIGRAMS = 64
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def canonical_link(link: str) -> str:
+    # Ссылка уже прошла validate_and_normalize_link (схема, домен, без фрагмента).
+    # Для сравнения дополнительно не важны схема, регистр домена, www. и
+    # завершающий слэш: http://www.Example.com/a/ == https://example.com/a
+    parts = urlsplit(link)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def link_hash(link: Optional[str]) -> Optional[str]:
+    if not link:
+        return None
+    return hashlib.blake2b(canonical_link(link).encode(), digest_size=8).hexdigest()
+
+
+def title_words(title: str) -> List[str]:
+    return _WORD_RE.findall(normalize_title(title))
+
+
+def title_trigrams(title: str) -> Set[str]:
+    # Как в pg_trgm: каждое слово дополняется "  " слева и " " справа.
+    trigrams = set()
+    for word in title_words(title):
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def title_similarity(left: str, right: str) -> float:
+    return trigram_similarity(title_trigrams(left), title_trigrams(right))
+
+
+def trigram_similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def query_trigrams(title: str) -> List[str]:
+    # Триграммы для FTS5 trigram: только внутри слов. Токенизатор индекса не
+    # знает про дополнение пробелами pg_trgm и не снимает диакритику, поэтому
+    # слова берутся только в нижнем регистре.
+    words = _WORD_RE.findall(title.casefold())
+    trigrams = {word[i : i + 3] for word in words for i in range(len(word) - 2)}
+    return sorted(trigrams)[:MAX_QUERY_TRIGRAMS]
+
+
+def required_trigrams(title: str, counts: Dict[str, int]) -> List[str]:
+    # Префиксный фильтр. При похожести не ниже TITLE_SIMILARITY у названия
+    # недостаёт не больше (1 - TITLE_SIMILARITY) * |title_trigrams(title)|
+    # триграмм запроса, значит, хотя бы одна из любых missing + 1 у него есть.
+    # Берутся самые редкие по counts: OR по ним читает короткие списки
+    # документов. Ещё одна триграмма — запас на округление.
+    missing = int((1 - TITLE_SIMILARITY) * len(title_trigrams(title)))
+    rarest = sorted(counts, key=lambda trigram: (counts[trigram], trigram))
+    return rarest[: missing + 2]
+
+
+def trigram_query(trigrams: List[str]) -> str:
+    return " OR ".join(f'"{trigram}"' for trigram in trigrams)
+
+
+class DuplicatePolicy(str, Enum):
+    # warn — запись создаётся, совпадения перечисляются в заголовке ответа;
+    # reject — при совпадениях 409 со списком найденных записей.
+    WARN = "warn"
+    REJECT = "reject"
+
+
+class DuplicateMatch(NamedTuple):
+    record: EntryRecord
+    reason: str  # "link" | "title"
+    similarity: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.record.to_dict(),
+            "reason": self.reason,
+            "similarity": self.similarity,
+        }
@@ -46,6 +46,28 @@ class ValidationError(ApiError):
         )
 
 
+class ConflictError(ApiError):
+    def __init__(self, message: str = "Conflict", details: Any = None):
+        super().__init__(
+            code="conflict",
+            message=message,
+            status=409,
+            details=details,
+            error_type="/errors/conflict",
+        )
+
+
+class PreconditionFailedError(ApiError):
+    def __init__(self, message: str = "Precondition failed", details: Any = None):
+        super().__init__(
+            code="precondition_failed",
+            message=message,
+            status=412,
+            details=details,
+            error_type="/errors/precondition-failed",
+        )
+
+
 def create_problem_detail(
     status: int,
     title: str,
@@ -0,0 +1,52 @@
+import hashlib
+import re
+from typing import Optional, Set
+
+from fastapi import Response
+
+
+def _digest(params) -> str:
+    return hashlib.blake2b(repr(params).encode(), digest_size=8).hexdigest()
+
+
+def collection_etag(version: int, *params) -> str:
+    # Один и тот же список с разными фильтрами, курсорами и полями — разные
+    # представления, поэтому кроме версии коллекции в ETag входят параметры.
+    return f'W/"entries-{version}-{_digest(params)}"'
+
+
+# ETag записи сильный: он строится из версии строки (entries.version), и только
+# сильные ETag годятся для If-Match (RFC 9110, 13.1.1).
+_ENTRY_ETAG_RE = re.compile(r'"entry-(\d+)-(\d+)-[0-9a-f]+"')
+
+
+def entry_etag(entry_id: int, version: int, *params) -> str:
+    return f'"entry-{entry_id}-{version}-{_digest(params)}"'
+
+
+def if_match_versions(if_match: Optional[str], entry_id: int) -> Optional[Set[int]]:
+    # None — условия нет (заголовка нет или "*"). Иначе версии строки из ETag
+    # этой записи; поля выборки (?fields=) на версию не влияют. Пустое
+    # множество — ни один ETag не подходит, запись завершится 412.
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = set()
+    for tag in if_match.split(","):
+        match = _ENTRY_ETAG_RE.fullmatch(tag.strip())
+        if match and int(match[1]) == entry_id:
+            versions.add(int(match[2]))
+    return versions
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match сравнивается слабо (RFC 9110, 13.1.2): префикс W/ не учитывается.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
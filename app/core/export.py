@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import threading
+import zlib
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.errors import ApiError
+
+MAX_CONCURRENT_EXPORTS = 2
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def _rows(items: List[Any]) -> List[Dict[str, Any]]:
+    return [item if isinstance(item, dict) else item.to_dict() for item in items]
+
+
+def ndjson_chunk(items: List[Any]) -> str:
+    return "".join(
+        json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in _rows(items)
+    )
+
+
+def csv_chunk(items: List[Any], fields: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, lineterminator="\n")
+    writer.writerows(_rows(items))
+    return buffer.getvalue()
+
+
+async def encode_export(
+    batches: AsyncIterator[List[Any]],
+    export_format: ExportFormat,
+    fields: Sequence[str],
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    # Каждая пачка строк кодируется и отправляется сразу. При сжатии после
+    # пачки делается Z_SYNC_FLUSH: всё полученное до обрыва распаковывается,
+    # и по id последней целой строки экспорт продолжается с after_id.
+    gzip = zlib.compressobj(wbits=31) if compress else None
+
+    def encoded(text: str) -> bytes:
+        data = text.encode("utf-8")
+        if gzip is None:
+            return data
+        return gzip.compress(data) + gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    if export_format == ExportFormat.CSV:
+        yield encoded(",".join(fields) + "\n")
+    async for items in batches:
+        if not items:
+            continue
+        if export_format == ExportFormat.CSV:
+            yield encoded(csv_chunk(items, fields))
+        else:
+            yield encoded(ndjson_chunk(items))
+    if gzip is not None:
+        yield gzip.flush()
+
+
+class ExportSlots:
+    # Экспорт длится минуты, поэтому ограничивается не частотой запросов, а
+    # числом одновременных выгрузок; слот освобождается с концом потока.
+    def __init__(self, limit: int = MAX_CONCURRENT_EXPORTS):
+        self.limit = limit
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self.active >= self.limit:
+                raise ApiError(
+                    code="too_many_exports",
+                    message="Too many exports in progress, retry later",
+                    status=429,
+                    error_type="/errors/too-many-exports",
+                )
+            self.active += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+
+class ExportResponse(StreamingResponse):
+    # Слот занимается acquire() до ответа (чтобы отдать 429), а освобождается
+    # здесь, после отправки: и при обрыве соединения или ошибке отправки до
+    # первой пачки, когда генератор тела ещё не запускался.
+    def __init__(self, content: AsyncIterator[bytes], slots: ExportSlots, **kwargs):
+        super().__init__(content, **kwargs)
+        self.slots = slots
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.slots.release()
+
+
+export_slots = ExportSlots()
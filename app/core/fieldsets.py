@@ -0,0 +1,26 @@
+from typing import Optional, Tuple
+
+from app.core.errors import ValidationError
+
+ENTRY_FIELDS = ("id", "owner_id", "title", "kind", "link", "status")
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    # "title,status" -> ("id", "title", "status"). id входит всегда: без него
+    # клиент не сможет сослаться на запись. Порядок полей — как в ENTRY_FIELDS.
+    if raw is None:
+        return None
+
+    requested = {field.strip() for field in raw.split(",") if field.strip()}
+    if not requested:
+        raise ValidationError("fields must list at least one field")
+
+    unknown = requested.difference(ENTRY_FIELDS)
+    if unknown:
+        raise ValidationError(
+            f"Unknown fields: {', '.join(sorted(unknown))}",
+            details={"allowed": list(ENTRY_FIELDS)},
+        )
+
+    requested.add("id")
+    return tuple(field for field in ENTRY_FIELDS if field in requested)
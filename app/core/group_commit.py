@@ -0,0 +1,180 @@
+import asyncio
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import EntryCache, get_entry_cache
+from app.core.database import AsyncSessionLocal, async_owner_session
+from app.core.repository import AsyncEntryRepository
+from app.domain.models import (
+    EntryBatchCreate,
+    EntryBatchDelete,
+    EntryBatchUpdate,
+    EntryCreate,
+    EntryRecord,
+    EntryUpdate,
+)
+
+# GROUP_COMMIT=on: одиночные create/update/delete эндпоинтов идут через общий
+# писатель и фиксируются группами — один COMMIT (и один fsync) на группу.
+GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT", "off") == "on"
+# Собрав первый запрос и увидев конкурентов, писатель ждёт ещё не дольше окна
+# (секунды) и берёт в транзакцию не больше GROUP_COMMIT_MAX_BATCH операций.
+GROUP_COMMIT_WINDOW = 0.002
+GROUP_COMMIT_MAX_BATCH = 256
+
+
+class _WriteRequest(NamedTuple):
+    operation: Any  # EntryBatchOperation
+    owner_id: int
+    future: asyncio.Future
+
+
+class GroupCommitWriter:
+    # Единственная задача, которая пишет entries: запросы из очереди
+    # выполняются через apply_batch одной транзакцией на владельца. Вызывающий
+    # получает результат только после COMMIT, так что долговечность та же, что
+    # у поштучной записи. Если группа падает, её операции повторяются по одной:
+    # ошибка достаётся только своему вызывающему.
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        cache: Optional[EntryCache] = None,
+        window: float = GROUP_COMMIT_WINDOW,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+    ):
+        # Без engine сессия берётся в шарде владельца (async_owner_session).
+        self.engine = engine
+        self.cache = cache
+        self.window = window
+        self.max_batch = max_batch
+        self.commits = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def create(self, entry_data: EntryCreate, owner_id: int = 1) -> EntryRecord:
+        operation = EntryBatchCreate.construct(op="create", data=entry_data)
+        return await self._submit(operation, owner_id)
+
+    async def update(
+        self, entry_id: int, update_data: EntryUpdate, owner_id: int = 1
+    ) -> Optional[EntryRecord]:
+        operation = EntryBatchUpdate.construct(
+            op="update", id=entry_id, data=update_data
+        )
+        return await self._submit(operation, owner_id)
+
+    async def delete(self, entry_id: int, owner_id: int = 1) -> bool:
+        operation = EntryBatchDelete.construct(op="delete", id=entry_id)
+        return await self._submit(operation, owner_id) is not None
+
+    async def stop(self) -> None:
+        # Дописывает уже принятые запросы и завершает задачу писателя.
+        if self._task is not None and not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+
+    async def _submit(self, operation, owner_id: int):
+        # Задача писателя запускается в цикле событий первого вызывающего.
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put(_WriteRequest(operation, owner_id, future))
+        return await future
+
+    async def _run(self) -> None:
+        stopped = False
+        try:
+            while not stopped:
+                batch, stopped = await self._collect()
+                if batch:
+                    await self._commit(batch)
+        finally:
+            while not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request is not None and not request.future.done():
+                    request.future.set_exception(RuntimeError("Writer stopped"))
+
+    async def _collect(self) -> Tuple[List[_WriteRequest], bool]:
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        # Один проход цикла событий: уже готовые корутины успевают встать в
+        # очередь. Окно ждётся, только если попутчики есть, иначе одиночный
+        # клиент платил бы задержкой окна за каждую запись.
+        await asyncio.sleep(0)
+        stopped = self._drain(batch)
+        if not stopped and 1 < len(batch) < self.max_batch and self.window > 0:
+            await asyncio.sleep(self.window)
+            stopped = self._drain(batch)
+        return batch, stopped
+
+    def _drain(self, batch: List[_WriteRequest]) -> bool:
+        while len(batch) < self.max_batch:
+            try:
+                request = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if request is None:
+                return True
+            batch.append(request)
+        return False
+
+    async def _commit(self, batch: List[_WriteRequest]) -> None:
+        by_owner: Dict[int, List[_WriteRequest]] = {}
+        for request in batch:
+            by_owner.setdefault(request.owner_id, []).append(request)
+
+        for owner_id, requests in by_owner.items():
+            try:
+                results = await self._apply([r.operation for r in requests], owner_id)
+            except Exception:
+                for request in requests:
+                    try:
+                        (result,) = await self._apply([request.operation], owner_id)
+                    except Exception as e:
+                        _resolve(request.future, error=e)
+                    else:
+                        _resolve(request.future, result)
+                continue
+            for request, result in zip(requests, results):
+                _resolve(request.future, result)
+
+    async def _apply(self, operations, owner_id: int) -> List[Optional[EntryRecord]]:
+        if self.engine is not None:
+            session = AsyncSessionLocal(bind=self.engine)
+        else:
+            session = async_owner_session(owner_id)
+        async with session:
+            repository = AsyncEntryRepository(session, self.cache)
+            results = await repository.apply_batch(operations, owner_id)
+        self.commits += 1
+        return results
+
+
+def _resolve(future: asyncio.Future, result=None, error=None) -> None:
+    # Вызывающий мог отменить ожидание; запись при этом уже зафиксирована.
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+_entry_writer: Optional[GroupCommitWriter] = None
+
+
+def get_entry_writer() -> Optional[GroupCommitWriter]:
+    # None — групповая фиксация выключена, эндпоинты пишут сами.
+    global _entry_writer
+    if not GROUP_COMMIT_ENABLED:
+        return None
+    if _entry_writer is None:
+        _entry_writer = GroupCommitWriter(cache=get_entry_cache())
+    return _entry_writer
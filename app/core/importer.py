@@ -0,0 +1,205 @@
+import argparse
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.database import owner_session
+from app.core.export import ExportFormat
+from app.core.repository import EntryRepository
+from app.domain.models import EntryCreate, EntryStatus, validate_entry_batch
+
+IMPORT_BATCH_SIZE = 500
+# Ошибок в отчёте не больше этого числа, остальные только считаются.
+MAX_IMPORT_ERRORS = 1000
+# Колонки экспорта, которые при импорте назначаются заново.
+IGNORED_FIELDS = ("id", "owner_id")
+# Записи только с этими полями проверяются пачкой по колонкам.
+COLUMN_FIELDS = frozenset(("title", "kind", "link", "status"))
+
+FILE_SUFFIXES = {
+    "ndjson": ExportFormat.NDJSON,
+    "jsonl": ExportFormat.NDJSON,
+    "csv": ExportFormat.CSV,
+}
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, line: int, detail: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append({"line": line, "detail": detail})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def format_from_filename(filename: Optional[str]) -> Optional[ExportFormat]:
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    return FILE_SUFFIXES.get(suffix)
+
+
+def _decoded_lines(binary: BinaryIO, invalid: Set[int]) -> Iterator[str]:
+    # Файл читается построчно, целиком в память не попадает. Строку с
+    # неверным UTF-8 декодер не роняет: её номер попадает в invalid.
+    for number, raw in enumerate(binary, 1):
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            invalid.add(number)
+            line = raw.decode("utf-8", errors="replace")
+        yield line.removeprefix("\ufeff") if number == 1 else line
+
+
+def read_records(
+    binary: BinaryIO, file_format: ExportFormat
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    # (номер строки, запись, ошибка разбора); для CSV номер — последняя
+    # строка записи (значение в кавычках может занимать несколько строк).
+    invalid: Set[int] = set()
+    lines = _decoded_lines(binary, invalid)
+    if file_format == ExportFormat.CSV:
+        reader = csv.DictReader(lines)
+        first = 2
+        for row in reader:
+            number = reader.line_num
+            if invalid.intersection(range(first, number + 1)):
+                yield number, None, "Line is not valid UTF-8"
+            elif None in row:
+                yield number, None, "Row has more values than header"
+            else:
+                yield number, {k: v for k, v in row.items() if v != ""}, None
+            first = number + 1
+        return
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if number in invalid:
+            yield number, None, "Line is not valid UTF-8"
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Line must be a JSON object"
+            continue
+        yield number, record, None
+
+
+def _validation_detail(errors: List[Dict[str, Any]]) -> str:
+    # Те же сообщения, что отдаёт POST /api/v1/entries в validation_details.
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in item['loc'])}: {item['msg']}" for item in errors
+    )
+
+
+def validate_records(
+    records: List[Dict[str, Any]],
+) -> List[Tuple[Optional[EntryCreate], Optional[str]]]:
+    # Обычные записи идут через validate_entry_batch, остальные (лишние или
+    # пропущенные поля) — поштучно через EntryCreate ради тех же сообщений.
+    results: List[Tuple[Optional[EntryCreate], Optional[str]]] = [(None, None)] * len(
+        records
+    )
+    columnar = []
+    for i, record in enumerate(records):
+        if record.keys() <= COLUMN_FIELDS and "title" in record and "kind" in record:
+            columnar.append(i)
+            continue
+        try:
+            results[i] = EntryCreate(**record), None
+        except PydanticValidationError as e:
+            results[i] = None, _validation_detail(e.errors())
+
+    rows = [records[i] for i in columnar]
+    checked = validate_entry_batch(
+        [row["title"] for row in rows],
+        [row.get("link") for row in rows],
+        [row["kind"] for row in rows],
+        [row.get("status", EntryStatus.PLANNED) for row in rows],
+    )
+    for i, entry, errors in zip(columnar, checked.entries, checked.errors):
+        results[i] = entry, _validation_detail(errors) if errors else None
+    return results
+
+
+def import_entries(
+    repository: EntryRepository,
+    binary: BinaryIO,
+    file_format: ExportFormat,
+    owner_id: int = 1,
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    # Записи проверяются правилами EntryCreate (пачкой, validate_records) и
+    # вставляются пачками по batch_size: одна пачка — один INSERT и одна
+    # транзакция. Ошибочные строки попадают в отчёт и не прерывают импорт.
+    report = ImportReport()
+    pending: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]] = []
+
+    def flush() -> None:
+        records = [record for _, record, error in pending if error is None]
+        checked = iter(validate_records(records))
+        batch: List[EntryCreate] = []
+        for line, _, error in pending:
+            if error is None:
+                entry, error = next(checked)
+                if entry is not None:
+                    batch.append(entry)
+            if error is not None:
+                report.add_error(line, error)
+        if batch:
+            report.imported += len(repository.create_many(batch, owner_id))
+        pending.clear()
+
+    for line, record, error in read_records(binary, file_format):
+        if error is None:
+            for name in IGNORED_FIELDS:
+                record.pop(name, None)
+        pending.append((line, record, error))
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+    return report
+
+
+# Импорт файла в обход HTTP и лимитов:
+# python -m app.core.importer entries.csv [--format csv] [--owner-id 1]
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[f.value for f in ExportFormat])
+    parser.add_argument("--owner-id", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    file_format = ExportFormat(args.format) if args.format else None
+    file_format = file_format or format_from_filename(args.path)
+    if file_format is None:
+        parser.error("cannot infer --format from the file name")
+
+    with open(args.path, "rb") as binary, owner_session(args.owner_id) as db:
+        report = import_entries(
+            EntryRepository(db), binary, file_format, args.owner_id, args.batch_size
+        )
+    for error in report.errors:
+        print(f"line {error['line']}: {error['detail']}")
+    print(f"imported={report.imported} failed={report.failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Приведение схемы базы к последней ревизии Alembic.
+
+Схему ведут миграции: при старте приложения (create_tables) и этой командой
+каждая база доводится до head. Раньше старт создавал таблицы через
+create_all, не трогая alembic_version, и последующий alembic upgrade падал на
+уже существующих таблицах. Такая база, если её схема уже совпадает с
+моделями, только помечается head, без повторного создания таблиц.
+
+Запуск: python -m app.core.migrate
+"""
+
+import os
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+from app.domain.database_models import Base, EntryDB, is_search_object
+
+MIGRATIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "migrations",
+)
+
+
+def alembic_config(connection: Connection) -> Config:
+    # Соединение передаётся в env.py через attributes: миграции идут в нём.
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.attributes["connection"] = connection
+    return config
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    return not is_search_object(name, type_, parent_names)
+
+
+def migrate(bind: Engine) -> str:
+    # Возвращает выполненное действие: "upgrade" или "stamp".
+    with bind.begin() as connection:
+        config = alembic_config(connection)
+        head = ScriptDirectory.from_config(config).get_current_head()
+        context = MigrationContext.configure(
+            connection, opts={"include_name": _include_name}
+        )
+        current = context.get_current_revision()
+        if (
+            current != head
+            and inspect(connection).has_table(EntryDB.__tablename__)
+            and not compare_metadata(context, Base.metadata)
+        ):
+            # Схема создана create_all по текущим моделям: миграции упали бы
+            # на существующих таблицах.
+            command.stamp(config, "head")
+            return "stamp"
+        command.upgrade(config, "head")
+        return "upgrade"
+
+
+def main() -> None:
+    from app.core.database import engine, shard_router
+
+    binds = shard_router.writers() if shard_router is not None else [engine]
+    for bind in binds:
+        print(f"{bind.url.database}: {migrate(bind)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import base64
+import binascii
+import json
+from enum import Enum
+from typing import Any, Tuple
+
+from app.core.errors import ValidationError
+
+
+class EntrySort(str, Enum):
+    ID = "id"
+    TITLE = "title"
+
+
+# rank — позиция в ранжированном поиске (bm25 / -ts_rank, меньше — лучше),
+# link_hash — группа в отчёте о дублях.
+SORT_KEY_TYPES = {
+    EntrySort.ID.value: int,
+    EntrySort.TITLE.value: str,
+    "rank": float,
+    "link_hash": str,
+}
+
+
+def encode_cursor(sort: str, key: Any, entry_id: int) -> str:
+    payload = json.dumps([sort, key, entry_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+        cursor_sort, key, entry_id = json.loads(raw)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise ValidationError("Invalid pagination cursor")
+
+    if cursor_sort != sort:
+        raise ValidationError("Cursor does not match the requested sort order")
+
+    key_type = SORT_KEY_TYPES[sort]
+    if not isinstance(key, key_type) or not isinstance(entry_id, int):
+        raise ValidationError("Invalid pagination cursor")
+
+    return key, entry_id
@@ -0,0 +1,215 @@
+"""Перенос владельцев между шардами SQLite (SHARD_MAP, см. ShardRouter).
+
+Записи владельца (и горячие, и архивные) копируются в целевой шард вместе с
+id, там пересчитываются
+счётчики и поднимается версия коллекции (старые ETag списка не совпадут).
+Затем владелец закрепляется в карте шардов, и его строки удаляются из
+исходного шарда. На время переноса запись для владельца нужно остановить;
+процессы API читают карту при запуске, их надо перезапустить.
+
+Если id записей уже заняты в целевом шарде, перенос прерывается до любых
+изменений; с --renumber таким записям выдаются новые id.
+
+После добавления шарда в карту --all переносит владельцев, которых кольцо
+теперь отдаёт другому шарду (без --apply — только список).
+
+Запуск: python -m app.core.rebalance --owner-id 42 --to b [--renumber]
+        python -m app.core.rebalance --all [--apply]
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, union
+from sqlalchemy.orm import Session
+
+from app.core.database import SHARD_MAP_PATH, ShardRouter, shard_router
+from app.core.repository import ENTRIES_COLLECTION, NEXT_ENTRY_ID, EntryRepository
+from app.domain.database_models import (
+    CollectionVersionDB,
+    EntryArchiveDB,
+    EntryCounterDB,
+    EntryDB,
+)
+
+MOVE_BATCH_SIZE = 500
+
+# id у entries и entries_archive общие: коллизии проверяются по обеим.
+TIERS = (EntryDB.__table__, EntryArchiveDB.__table__)
+
+
+class ShardMoveError(Exception):
+    pass
+
+
+@dataclass
+class MoveReport:
+    owner_id: int
+    source: str
+    target: str
+    moved: int = 0
+    # Старый id -> новый для записей, перенумерованных из-за коллизий.
+    renumbered: Dict[int, int] = field(default_factory=dict)
+
+
+def _chunks(items: List[int], size: int):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _collection_version(db: Session, owner_id: int) -> int:
+    return EntryRepository(db).get_collection_version(owner_id)
+
+
+def move_owner(
+    router: ShardRouter,
+    owner_id: int,
+    target: str,
+    source: Optional[str] = None,
+    renumber: bool = False,
+    path: Optional[str] = SHARD_MAP_PATH,
+    batch_size: int = MOVE_BATCH_SIZE,
+) -> MoveReport:
+    # source по умолчанию — текущий шард владельца по карте; явный source
+    # нужен, когда кольцо уже указывает на новый шард, а данные ещё в старом.
+    source = source or router.shard_for(owner_id)
+    for name in (source, target):
+        if name not in router.shards:
+            raise ShardMoveError(f"Unknown shard: {name}")
+    report = MoveReport(owner_id, source, target)
+    if source != target:
+        with Session(router.engines(source).writer) as src, Session(
+            router.engines(target).writer
+        ) as dst:
+            _copy(src, dst, owner_id, renumber, batch_size, report)
+            EntryRepository(dst).reconcile_counters(owner_id)
+            # Данные уже в целевом шарде: сначала карта, потом очистка источника.
+            router.pin(owner_id, target)
+            if path:
+                router.save(path)
+            for model in (EntryDB, EntryArchiveDB, EntryCounterDB, CollectionVersionDB):
+                src.execute(delete(model).where(model.owner_id == owner_id))
+            src.commit()
+    else:
+        router.pin(owner_id, target)
+        if path:
+            router.save(path)
+    return report
+
+
+def _copy(
+    src: Session,
+    dst: Session,
+    owner_id: int,
+    renumber: bool,
+    batch_size: int,
+    report: MoveReport,
+) -> None:
+    ids = {
+        tier: list(
+            src.scalars(
+                select(tier.c.id).where(tier.c.owner_id == owner_id).order_by(tier.c.id)
+            )
+        )
+        for tier in TIERS
+    }
+    taken = set()
+    for tier in TIERS:
+        for chunk in _chunks(ids[tier], batch_size):
+            for target in TIERS:
+                taken.update(
+                    dst.scalars(select(target.c.id).where(target.c.id.in_(chunk)))
+                )
+    if taken and not renumber:
+        raise ShardMoveError(
+            f"{len(taken)} entry ids of owner {owner_id} already exist in shard "
+            f"{report.target}; pass renumber to assign new ids"
+        )
+
+    # Новые id — выше всех id целевого шарда (и выше переносимых).
+    moving = max((max(tier_ids, default=0) for tier_ids in ids.values()), default=0)
+    next_id = max(dst.execute(select(NEXT_ENTRY_ID)).scalar(), moving + 1)
+    for tier in TIERS:
+        for chunk in _chunks(ids[tier], batch_size):
+            rows = [
+                dict(row)
+                for row in src.execute(
+                    select(tier).where(tier.c.id.in_(chunk))
+                ).mappings()
+            ]
+            for row in rows:
+                if row["id"] in taken:
+                    report.renumbered[row["id"]] = next_id
+                    row["id"] = next_id
+                    next_id += 1
+            dst.execute(insert(tier), rows)
+            report.moved += len(rows)
+
+    # Версия выше обеих прежних: ETag, выданный любым шардом, не совпадёт.
+    version = max(
+        _collection_version(src, owner_id), _collection_version(dst, owner_id)
+    )
+    dst.execute(
+        delete(CollectionVersionDB).where(CollectionVersionDB.owner_id == owner_id)
+    )
+    dst.execute(
+        insert(CollectionVersionDB).values(
+            owner_id=owner_id, collection=ENTRIES_COLLECTION, version=version + 1
+        )
+    )
+    dst.commit()
+
+
+def misplaced(router: ShardRouter) -> List[Tuple[int, str, str]]:
+    # (владелец, где лежат записи, куда его отдаёт карта) по всем шардам.
+    # Владелец, у которого остались только архивные записи, тоже в списке.
+    result = []
+    owners_stmt = union(*(select(tier.c.owner_id) for tier in TIERS))
+    for name in router.shards:
+        with Session(router.engines(name).reader) as db:
+            owners = db.scalars(owners_stmt)
+            for owner_id in owners:
+                target = router.shard_for(owner_id)
+                if target != name:
+                    result.append((owner_id, name, target))
+    return sorted(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--owner-id", type=int)
+    parser.add_argument("--to", dest="target")
+    parser.add_argument("--renumber", action="store_true")
+    parser.add_argument("--all", action="store_true")
+    parser.add_argument("--apply", action="store_true")
+    args = parser.parse_args()
+
+    if shard_router is None:
+        parser.error("SHARD_MAP is not set")
+    if args.all:
+        for owner_id, source, target in misplaced(shard_router):
+            if not args.apply:
+                print(f"owner {owner_id}: {source} -> {target}")
+                continue
+            report = move_owner(
+                shard_router, owner_id, target, source=source, renumber=args.renumber
+            )
+            print(f"owner {owner_id}: {source} -> {target}, moved={report.moved}")
+        return
+    if args.owner_id is None or args.target is None:
+        parser.error("pass --owner-id and --to, or --all")
+
+    report = move_owner(
+        shard_router, args.owner_id, args.target, renumber=args.renumber
+    )
+    for old_id, new_id in report.renumbered.items():
+        print(f"entry {old_id} -> {new_id}")
+    print(
+        f"owner {report.owner_id}: {report.source} -> {report.target}, "
+        f"moved={report.moved} renumbered={len(report.renumbered)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
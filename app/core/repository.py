@@ -1,77 +1,1397 @@
-from typing import List, Optional
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime
+from itertools import groupby
+from typing import (
+    Any,
+    AsyncIterator,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Row,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    table,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from app.domain.database_models import EntryDB
-from app.domain.models import Entry, EntryCreate, EntryUpdate
+from app.core.cache import EntryCache
+from app.core.changes import EntryChange, publish
+from app.core.duplicates import (
+    MAX_TITLE_CANDIDATES,
+    MAX_TRIGRAM_CANDIDATES,
+    TITLE_SIMILARITY,
+    DuplicateMatch,
+    canonical_link,
+    link_hash,
+    query_trigrams,
+    required_trigrams,
+    title_trigrams,
+    trigram_query,
+    trigram_similarity,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.search import search_terms
+from app.domain.database_models import (
+    CollectionVersionDB,
+    EntryArchiveDB,
+    EntryCounterDB,
+    EntryDB,
+    utcnow,
+)
+from app.domain.models import (
+    EntryBatchOperation,
+    EntryCreate,
+    EntryKind,
+    EntryRecord,
+    EntryStatus,
+    EntryUpdate,
+)
+
+ENTRY_COLUMNS = (
+    EntryDB.id,
+    EntryDB.owner_id,
+    EntryDB.title,
+    EntryDB.kind,
+    EntryDB.link,
+    EntryDB.status,
+    EntryDB.version,
+)
+
+ENTRIES_COLLECTION = "entries"
+
+# Колонки, которые переезжают между entries и entries_archive.
+TIERED_COLUMNS = tuple(
+    c.key for c in EntryArchiveDB.__table__.columns if c.key != "archived_at"
+)
+
+# Ключ счётчика entry_counters: (owner_id, status, kind).
+COUNTER_COLUMNS = (EntryDB.owner_id, EntryDB.status, EntryDB.kind)
+
+ENTRIES_FTS = table("entries_fts", column("rowid"))
+ENTRIES_TRIGRAMS = table("entries_trigrams", column("rowid"))
+TS_CONFIG = literal_column("'simple'")
+
+# Строк на одну выборку курсора при потоковом чтении (yield_per).
+STREAM_BATCH_SIZE = 1000
+# Любая запись строки увеличивает entries.version на единицу.
+NEXT_VERSION = EntryDB.version + 1
+# SQLite выдаёт новый rowid как max(id) + 1 по одной entries и мог бы повторить
+# id архивной записи; id задаётся явно — выше обоих слоёв. В Postgres id берутся
+# из последовательности и не повторяются.
+NEXT_ENTRY_ID = select(
+    func.max(
+        func.coalesce(select(func.max(EntryDB.id)).scalar_subquery(), 0),
+        func.coalesce(select(func.max(EntryArchiveDB.id)).scalar_subquery(), 0),
+    )
+    + 1
+).scalar_subquery()
+
+
+class VersionMismatchError(Exception):
+    # Условная запись (If-Match) не прошла: строка есть, но её версия другая.
+    def __init__(self, entry_id: int, version: int):
+        super().__init__(f"Entry {entry_id} is at version {version}")
+        self.entry_id = entry_id
+        self.version = version
+
+
+UPSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
 
 
 class EntryRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, entry_data: EntryCreate, owner_id: int = 1) -> Entry:
-        db_entry = EntryDB(
-            owner_id=owner_id,
-            title=entry_data.title,
-            kind=entry_data.kind,
-            link=entry_data.link,
-            status=entry_data.status,
+    def create(self, entry_data: EntryCreate, owner_id: int = 1) -> EntryRecord:
+        values = self._new_row(entry_data, owner_id)
+        stored = _stored(values)
+        if self._dialect() == "sqlite":
+            stored["id"] = NEXT_ENTRY_ID
+        stmt = insert(EntryDB).values(**stored)
+        if self._returning("insert"):
+            record = EntryRecord(*self.db.execute(stmt.returning(*ENTRY_COLUMNS)).one())
+        else:
+            result = self.db.execute(stmt)
+            record = EntryRecord(id=result.inserted_primary_key[0], version=1, **values)
+
+        self._bump_version(owner_id)
+        self._count(Counter({_counter_key(record): 1}))
+        publish(self.db, [EntryChange(record.id, owner_id, record.title)])
+        self.db.commit()
+        return record
+
+    # fields=None -> EntryRecord со всеми колонками; иначе SELECT только этих
+    # колонок и dict с ними же (см. app.core.fieldsets.parse_fields).
+    def get_by_id(
+        self, entry_id: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Union[EntryRecord, Dict[str, Any]]]:
+        # Промах в entries дочитывается из архива: по id запись видна всегда.
+        for model in (EntryDB, EntryArchiveDB):
+            stmt = select(*_projection(fields, model)).where(model.id == entry_id)
+            row = self.db.execute(stmt).one_or_none()
+            if row is not None:
+                return _record(row, fields)
+        return None
+
+    def get_all(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> List[Union[EntryRecord, Dict[str, Any]]]:
+        stmt = self.select_all(
+            status, kind, owner_id, fields, include_archived=include_archived
+        )
+        return [_record(row, fields) for row in self.db.execute(stmt)]
+
+    def iter_all(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        sort: str = "id",
+        cursor: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        include_archived: bool = False,
+    ) -> Iterator[List[Union[EntryRecord, Dict[str, Any]]]]:
+        # Те же строки, что и get_all, но пачками: курсор БД читается по
+        # batch_size строк, и в памяти не бывает больше одной пачки.
+        stmt = self.select_all(
+            status, kind, owner_id, fields, sort, cursor, include_archived
+        )
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield [_record(row, fields) for row in rows]
+
+    def select_all(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        sort: str = "id",
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> Select:
+        return self._listed(
+            owner_id, status, kind, fields, sort, cursor, include_archived
+        )
+
+    def get_page(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+    ) -> Tuple[List[Union[EntryRecord, Dict[str, Any]]], Optional[str]]:
+        # Ключ курсора выбирается всегда, даже если клиент его не запросил.
+        # Один лишний ряд показывает, есть ли следующая страница, без COUNT(*).
+        stmt = self._listed(
+            owner_id,
+            status,
+            kind,
+            fields and (*fields, sort),
+            sort,
+            cursor,
+            include_archived,
+        )
+        rows = self.db.execute(stmt.limit(limit + 1)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(sort, getattr(last, sort), last.id)
+
+        return [_record(row, fields) for row in rows], next_cursor
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Union[EntryRecord, Dict[str, Any]]], Optional[str]]:
+        # Совпадения берутся из полнотекстового индекса (FTS5 или GIN по
+        # tsvector), а не сканом entries; страницы — keyset по (rank, id).
+        terms = search_terms(query)
+        columns = _projection(fields)
+        if self.db.get_bind().dialect.name == "postgresql":
+            vector = func.to_tsvector(TS_CONFIG, EntryDB.title)
+            tsquery = func.to_tsquery(TS_CONFIG, " & ".join(f"{t}:*" for t in terms))
+            rank = -func.ts_rank(vector, tsquery)
+            matched = select(*columns, rank.label("rank")).where(
+                vector.op("@@")(tsquery)
+            )
+        else:
+            fts = literal_column(ENTRIES_FTS.name)
+            match = " ".join(f'"{term}"*' for term in terms)
+            matched = (
+                select(*columns, func.bm25(fts).label("rank"))
+                .select_from(ENTRIES_FTS)
+                .join(EntryDB, EntryDB.id == ENTRIES_FTS.c.rowid)
+                .where(fts.op("MATCH")(match))
+            )
+        matched = matched.where(*self._conditions(owner_id, None, None)).subquery()
+
+        stmt = select(matched)
+        if cursor:
+            key, last_id = decode_cursor(cursor, "rank")
+            stmt = stmt.where(
+                tuple_(matched.c.rank, matched.c.id) > tuple_(key, last_id)
+            )
+        stmt = stmt.order_by(matched.c.rank, matched.c.id).limit(limit + 1)
+        rows = self.db.execute(stmt).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("rank", rows[-1].rank, rows[-1].id)
+
+        if fields:
+            return [{f: row._mapping[f] for f in fields} for row in rows], next_cursor
+        return [EntryRecord(*row[:-1]) for row in rows], next_cursor
+
+    def update(
+        self,
+        entry_id: int,
+        update_data: EntryUpdate,
+        expected_versions: Optional[Collection[int]] = None,
+    ) -> Optional[EntryRecord]:
+        # Архивная запись сначала возвращается в entries, в той же транзакции:
+        # откат (в том числе из-за версии) оставляет её в архиве.
+        record = self._update(entry_id, update_data, expected_versions)
+        if record is None and self._restore(EntryArchiveDB.id == entry_id):
+            record = self._update(entry_id, update_data, expected_versions)
+        return record
+
+    def _update(
+        self,
+        entry_id: int,
+        update_data: EntryUpdate,
+        expected_versions: Optional[Collection[int]],
+    ) -> Optional[EntryRecord]:
+        # expected_versions (из If-Match) превращает запись в условную: один
+        # UPDATE ... WHERE id = ? AND version IN (...) без блокировки строки.
+        values = update_data.dict(exclude_unset=True)
+        # Счётчикам нужна прежняя пара (status, kind): RETURNING отдаёт новую.
+        before = None
+        if "status" in values or "kind" in values:
+            stmt = select(*COUNTER_COLUMNS).where(EntryDB.id == entry_id)
+            before = self.db.execute(stmt).one_or_none()
+            if before is None:
+                self.db.rollback()
+                return None
+
+        stmt = (
+            update(EntryDB)
+            .where(self._versioned(entry_id, expected_versions))
+            .values(**_stored(values), version=NEXT_VERSION)
+            .execution_options(synchronize_session=False)
+        )
+        if self._returning("update"):
+            row = self.db.execute(stmt.returning(*ENTRY_COLUMNS)).one_or_none()
+            if row is None:
+                return self._missed(entry_id, expected_versions)
+            record = EntryRecord(*row)
+        else:
+            if self.db.execute(stmt).rowcount == 0:
+                return self._missed(entry_id, expected_versions)
+            # Мимо кэша наследника: нужна строка уже после UPDATE.
+            record = EntryRepository.get_by_id(self, entry_id)
+
+        self._bump_version(record.owner_id)
+        if before is not None:
+            deltas = Counter({tuple(before): -1})
+            deltas[_counter_key(record)] += 1
+            self._count(deltas)
+        publish(self.db, [EntryChange(record.id, record.owner_id, record.title)])
+        self.db.commit()
+        return record
+
+    def delete(
+        self, entry_id: int, expected_versions: Optional[Collection[int]] = None
+    ) -> bool:
+        return self._deleted(entry_id, expected_versions) is not None
+
+    def _deleted(
+        self, entry_id: int, expected_versions: Optional[Collection[int]]
+    ) -> Optional[Row]:
+        # Удалённая строка (owner_id, status, kind) или None, если записи нет.
+        row = self._delete(entry_id, expected_versions)
+        if row is None and self._restore(EntryArchiveDB.id == entry_id):
+            row = self._delete(entry_id, expected_versions)
+        return row
+
+    def _delete(
+        self, entry_id: int, expected_versions: Optional[Collection[int]]
+    ) -> Optional[Row]:
+        condition = self._versioned(entry_id, expected_versions)
+        stmt = (
+            delete(EntryDB)
+            .where(condition)
+            .execution_options(synchronize_session=False)
+        )
+        if self._returning("delete"):
+            row = self.db.execute(stmt.returning(*COUNTER_COLUMNS)).one_or_none()
+        else:
+            row_stmt = select(*COUNTER_COLUMNS).where(condition)
+            row = self.db.execute(row_stmt).one_or_none()
+            if row is not None:
+                self.db.execute(stmt)
+
+        if row is None:
+            return self._missed(entry_id, expected_versions)
+        owner_id = row.owner_id
+        self._bump_version(owner_id)
+        self._count(Counter({tuple(row): -1}))
+        publish(self.db, [EntryChange(entry_id, owner_id, None)])
+        self.db.commit()
+        return row
+
+    def get_entry_version(self, entry_id: int) -> Optional[int]:
+        # Версия строки для ETag записи (горячей или архивной); None — записи нет.
+        for model in (EntryDB, EntryArchiveDB):
+            version = self.db.execute(
+                select(model.version).where(model.id == entry_id)
+            ).scalar()
+            if version is not None:
+                return version
+        return None
+
+    def _versioned(self, entry_id: int, expected_versions: Optional[Collection[int]]):
+        condition = EntryDB.id == entry_id
+        if expected_versions is not None:
+            condition &= EntryDB.version.in_(expected_versions)
+        return condition
+
+    def _missed(
+        self, entry_id: int, expected_versions: Optional[Collection[int]]
+    ) -> None:
+        # Условная запись не нашла строку: если запись есть, не совпала версия.
+        # Лишний SELECT только на этом пути, успешная запись его не делает.
+        version = None
+        if expected_versions is not None:
+            stmt = select(EntryDB.version).where(EntryDB.id == entry_id)
+            version = self.db.execute(stmt).scalar()
+        self.db.rollback()
+        if version is not None:
+            raise VersionMismatchError(entry_id, version)
+        return None
+
+    def apply_batch(
+        self, operations: List[EntryBatchOperation], owner_id: int = 1
+    ) -> List[Optional[EntryRecord]]:
+        # Для каждой операции возвращает итоговую запись (для delete — удалённую)
+        # или None, если запись не найдена. Всё выполняется в одной транзакции:
+        # подряд идущие операции одного типа превращаются в один bulk-запрос.
+        target_ids = {op.id for op in operations if op.op != "create"}
+        counted: Dict[int, Tuple[int, str, str]] = {}
+        if target_ids:
+            stmt = select(EntryDB.id, *COUNTER_COLUMNS).where(
+                EntryDB.id.in_(target_ids)
+            )
+            counted = {row.id: tuple(row[1:]) for row in self.db.execute(stmt)}
+            missing = target_ids - counted.keys()
+            if missing and self._restore(EntryArchiveDB.id.in_(missing)):
+                counted = {row.id: tuple(row[1:]) for row in self.db.execute(stmt)}
+        existing: Set[int] = set(counted)
+
+        results: List[Optional[EntryRecord]] = [None] * len(operations)
+        try:
+            for op_name, run in groupby(enumerate(operations), lambda item: item[1].op):
+                handler = {
+                    "create": self._batch_create,
+                    "update": self._batch_update,
+                    "delete": self._batch_delete,
+                }[op_name]
+                handler(list(run), existing, results, owner_id)
+            if any(record is not None for record in results):
+                self._bump_version(owner_id)
+            self._count(_batch_deltas(operations, results, counted))
+            publish(
+                self.db,
+                [
+                    EntryChange(
+                        record.id, owner_id, None if op.op == "delete" else record.title
+                    )
+                    for op, record in zip(operations, results)
+                    if record is not None
+                ],
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return results
+
+    def _batch_create(self, run, existing, results, owner_id) -> None:
+        records = self._insert_rows([self._new_row(op.data, owner_id) for _, op in run])
+        for (index, _), record in zip(run, records):
+            results[index] = record
+            existing.add(record.id)
+
+    def _insert_rows(self, params: List[Dict[str, Any]]) -> List[EntryRecord]:
+        # Записи в порядке params. Без RETURNING — по INSERT на строку.
+        rows = [_stored(values) for values in params]
+        floor = self._id_floor()
+        if floor is not None:
+            for i, row in enumerate(rows, floor + 1):
+                row["id"] = i
+        if not self._returning("insert"):
+            records = []
+            for values, row in zip(params, rows):
+                result = self.db.execute(insert(EntryDB).values(**row))
+                entry_id = result.inserted_primary_key[0]
+                records.append(EntryRecord(id=entry_id, version=1, **values))
+            return records
+
+        # Один INSERT ... VALUES (...), (...) RETURNING на всю серию. Порядок строк
+        # в RETURNING не гарантирован, но rowid выдаются по возрастанию в порядке
+        # VALUES, поэтому сортировка по id восстанавливает соответствие.
+        rows = self.db.execute(insert(EntryDB).returning(*ENTRY_COLUMNS), rows)
+        return [EntryRecord(*row) for row in sorted(rows, key=lambda row: row.id)]
+
+    def create_many(
+        self, entries: Sequence[EntryCreate], owner_id: int = 1
+    ) -> List[EntryRecord]:
+        # Вся пачка — один INSERT и одна транзакция (импорт).
+        records = self._insert_rows([self._new_row(e, owner_id) for e in entries])
+        if records:
+            self._bump_version(owner_id)
+            self._count(Counter(_counter_key(record) for record in records))
+            publish(
+                self.db,
+                [EntryChange(record.id, owner_id, record.title) for record in records],
+            )
+        self.db.commit()
+        return records
+
+    def _batch_update(self, run, existing, results, owner_id) -> None:
+        params, touched = [], []
+        for index, op in run:
+            if op.id in existing:
+                params.append(
+                    {"id": op.id, **_stored(op.data.dict(exclude_unset=True))}
+                )
+                touched.append((index, op.id))
+        if not params:
+            return
+
+        self.db.execute(update(EntryDB), params)
+        # Bulk UPDATE по первичному ключу не принимает выражений в значениях,
+        # поэтому версия затронутых строк растёт отдельным запросом.
+        ids = {entry_id for _, entry_id in touched}
+        self.db.execute(
+            update(EntryDB)
+            .where(EntryDB.id.in_(ids))
+            .values(version=NEXT_VERSION)
+            .execution_options(synchronize_session=False)
+        )
+        records = self._records_by_id(ids)
+        for index, entry_id in touched:
+            results[index] = records[entry_id]
+
+    def _batch_delete(self, run, existing, results, owner_id) -> None:
+        touched = []
+        for index, op in run:
+            if op.id in existing:
+                existing.discard(op.id)
+                touched.append((index, op.id))
+        if not touched:
+            return
+
+        ids = [entry_id for _, entry_id in touched]
+        stmt = delete(EntryDB).where(EntryDB.id.in_(ids))
+        if self._returning("delete"):
+            rows = self.db.execute(stmt.returning(*ENTRY_COLUMNS))
+            records = {row.id: EntryRecord(*row) for row in rows}
+        else:
+            records = self._records_by_id(ids)
+            self.db.execute(stmt)
+        for index, entry_id in touched:
+            results[index] = records[entry_id]
+
+    def _records_by_id(self, ids: Iterable[int]) -> Dict[int, EntryRecord]:
+        stmt = select(*ENTRY_COLUMNS).where(EntryDB.id.in_(set(ids)))
+        return {row.id: EntryRecord(*row) for row in self.db.execute(stmt)}
+
+    def update_where(
+        self,
+        update_data: EntryUpdate,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+    ) -> List[int]:
+        # Архивные строки меняются на месте. Исключение — смена статуса на
+        # незавершённый: такие записи возвращаются в entries, иначе списки по
+        # статусу (архив читается только для completed) их бы не видели.
+        values = update_data.dict(exclude_unset=True)
+        tiers = self._tiers(status)
+        if update_data.status not in (None, EntryStatus.COMPLETED):
+            if EntryArchiveDB in tiers:
+                self._restore(*self._conditions(owner_id, status, kind, EntryArchiveDB))
+            tiers = (EntryDB,)
+        groups = []
+        ids: Dict[Any, List[int]] = {}
+        for model in tiers:
+            if "status" in values or "kind" in values:
+                groups += self._counted_where(owner_id, status, kind, model)
+            stmt = update(model).values(**_stored(values), version=model.version + 1)
+            if model is EntryArchiveDB:
+                # onupdate объявлен только у entries.
+                stmt = stmt.values(updated_at=utcnow())
+            ids[model] = self._execute_where(
+                "update", stmt, owner_id, status, kind, model
+            )
+        affected = sorted(entry_id for tier in ids.values() for entry_id in tier)
+        if affected:
+            self._bump_version(owner_id)
+        new_status = update_data.status.value if update_data.status else None
+        new_kind = update_data.kind.value if update_data.kind else None
+        deltas = Counter()
+        for (group_owner, group_status, group_kind), count in groups:
+            deltas[(group_owner, group_status, group_kind)] -= count
+            deltas[
+                (group_owner, new_status or group_status, new_kind or group_kind)
+            ] += count
+        self._count(deltas)
+        if "title" in values:
+            # Архивных записей нет в подсказках: публикуются только горячие.
+            publish(
+                self.db,
+                [
+                    EntryChange(entry_id, owner_id, values["title"])
+                    for entry_id in ids[EntryDB]
+                ],
+            )
+        self.db.commit()
+        return affected
+
+    def delete_where(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+    ) -> List[int]:
+        # Архивные строки удаляются прямо из entries_archive, без переноса.
+        groups = []
+        ids: List[int] = []
+        for model in self._tiers(status):
+            groups += self._counted_where(owner_id, status, kind, model)
+            ids += self._execute_where(
+                "delete", delete(model), owner_id, status, kind, model
+            )
+        ids.sort()
+        if ids:
+            self._bump_version(owner_id)
+        self._count(Counter({key: -count for key, count in groups}))
+        publish(self.db, [EntryChange(entry_id, owner_id, None) for entry_id in ids])
+        self.db.commit()
+        return ids
+
+    def find_duplicates(
+        self, title: str, link: Optional[str] = None, owner_id: int = 1
+    ) -> List[DuplicateMatch]:
+        # Совпадение ссылки ищется по индексу (owner_id, link_hash), похожие
+        # названия — по триграммному индексу. Точная похожесть считается для
+        # кандидатов из индекса, в ответ идут MAX_TITLE_CANDIDATES лучших.
+        matches: Dict[int, DuplicateMatch] = {}
+        hashed = link_hash(link)
+        if hashed:
+            stmt = (
+                select(*ENTRY_COLUMNS)
+                .where(EntryDB.owner_id == owner_id, EntryDB.link_hash == hashed)
+                .order_by(EntryDB.id)
+                .limit(MAX_TITLE_CANDIDATES)
+            )
+            canonical = canonical_link(link)
+            for row in self.db.execute(stmt):
+                if canonical_link(row.link) == canonical:
+                    matches[row.id] = DuplicateMatch(EntryRecord(*row), "link", 1.0)
+
+        trigrams = title_trigrams(title)
+        for row in self.db.execute(self._title_candidates(title, owner_id)):
+            if row.id in matches:
+                continue
+            similarity = trigram_similarity(trigrams, title_trigrams(row.title))
+            if similarity >= TITLE_SIMILARITY:
+                matches[row.id] = DuplicateMatch(
+                    EntryRecord(*row), "title", round(similarity, 3)
+                )
+
+        return sorted(
+            matches.values(), key=lambda match: (-match.similarity, match.record.id)
+        )[:MAX_TITLE_CANDIDATES]
+
+    def duplicate_groups(
+        self, limit: int = 20, cursor: Optional[str] = None, owner_id: int = 1
+    ) -> Tuple[List[List[EntryRecord]], Optional[str]]:
+        # Группы записей с одной канонической ссылкой: GROUP BY идёт по индексу
+        # (owner_id, link_hash), страницы — keyset по link_hash.
+        stmt = (
+            select(EntryDB.link_hash)
+            .where(EntryDB.owner_id == owner_id, EntryDB.link_hash.isnot(None))
+            .group_by(EntryDB.link_hash)
+            .having(func.count() > 1)
+        )
+        if cursor:
+            key, _ = decode_cursor(cursor, "link_hash")
+            stmt = stmt.where(EntryDB.link_hash > key)
+        stmt = stmt.order_by(EntryDB.link_hash).limit(limit + 1)
+        hashes = list(self.db.execute(stmt).scalars())
+
+        next_cursor = None
+        if len(hashes) > limit:
+            hashes = hashes[:limit]
+            next_cursor = encode_cursor("link_hash", hashes[-1], 0)
+        if not hashes:
+            return [], next_cursor
+
+        stmt = (
+            select(*ENTRY_COLUMNS, EntryDB.link_hash)
+            .where(EntryDB.owner_id == owner_id, EntryDB.link_hash.in_(hashes))
+            .order_by(EntryDB.link_hash, EntryDB.id)
+        )
+        groups = [
+            [EntryRecord(*row[:-1]) for row in rows]
+            for _, rows in groupby(self.db.execute(stmt), lambda row: row.link_hash)
+        ]
+        return groups, next_cursor
+
+    def _title_candidates(self, title: str, owner_id: int) -> Select:
+        candidates = select(*ENTRY_COLUMNS)
+        owned = EntryDB.owner_id == owner_id
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Оператор % из pg_trgm идёт по GIN-индексу на lower(title).
+            lowered = func.lower(EntryDB.title)
+            target = func.lower(title)
+            return (
+                candidates.where(owned, lowered.op("%")(target))
+                .order_by(func.similarity(lowered, target).desc())
+                .limit(MAX_TITLE_CANDIDATES)
+            )
+
+        trigrams = query_trigrams(title)
+        if not trigrams:
+            # Слова короче трёх символов в триграммный индекс не попадают:
+            # остаётся точное совпадение по ix_entries_owner_title_id.
+            return candidates.where(owned, EntryDB.title == title).limit(
+                MAX_TITLE_CANDIDATES
+            )
+        # OR по всем триграммам с сортировкой по bm25 читал списки документов
+        # частых триграмм целиком (сотни мс на 200k строк). Вместо этого —
+        # префиксный фильтр по редким триграммам: похожесть всё равно
+        # считается точно в find_duplicates. owner_id + 0 не даёт планировщику
+        # начать с индекса владельца и проверять MATCH для каждой его строки:
+        # внешним циклом остаётся FTS.
+        counts = self._trigram_counts(trigrams)
+        required = required_trigrams(title, counts)
+        stmt = (
+            candidates.select_from(ENTRIES_TRIGRAMS)
+            .join(EntryDB, EntryDB.id == ENTRIES_TRIGRAMS.c.rowid)
+            .where(EntryDB.owner_id + 0 == owner_id, _trigram_match(required))
+            .limit(MAX_TRIGRAM_CANDIDATES)
+        )
+        if sum(counts[trigram] for trigram in required) < MAX_TRIGRAM_CANDIDATES:
+            # Все строки фильтра проверяются точно: сортировка не нужна.
+            return stmt
+        # Название из частых слов: строк больше предела, и первыми идут те,
+        # где редких триграмм больше.
+        return stmt.order_by(func.bm25(literal_column(ENTRIES_TRIGRAMS.name)))
+
+    def _trigram_counts(self, trigrams: List[str]) -> Dict[str, int]:
+        # Одним запросом: по подзапросу с LIMIT на триграмму.
+        counts = [
+            select(
+                literal(trigram),
+                select(func.count())
+                .select_from(
+                    select(ENTRIES_TRIGRAMS.c.rowid)
+                    .where(_trigram_match([trigram]))
+                    .limit(MAX_TRIGRAM_CANDIDATES)
+                    .subquery()
+                )
+                .scalar_subquery(),
+            )
+            for trigram in trigrams
+        ]
+        return dict(self.db.execute(union_all(*counts)).all())
+
+    def get_collection_version(self, owner_id: int = 1) -> int:
+        stmt = select(CollectionVersionDB.version).where(
+            CollectionVersionDB.owner_id == owner_id,
+            CollectionVersionDB.collection == ENTRIES_COLLECTION,
+        )
+        return self.db.execute(stmt).scalar() or 0
+
+    def _bump_version(self, owner_id: int) -> None:
+        # Версия коллекции растёт в той же транзакции, что и сама запись, поэтому
+        # ETag списка не может отстать от данных.
+        upsert = UPSERTS[self.db.get_bind().dialect.name]
+        stmt = upsert(CollectionVersionDB).values(
+            owner_id=owner_id, collection=ENTRIES_COLLECTION, version=1
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                CollectionVersionDB.owner_id,
+                CollectionVersionDB.collection,
+            ],
+            set_={"version": CollectionVersionDB.version + 1},
+        )
+        self.db.execute(stmt)
+
+    def get_stats(self, owner_id: int = 1) -> Dict[str, Any]:
+        # Читается не больше |status| x |kind| строк entry_counters, сколько бы
+        # записей ни было у владельца.
+        stmt = select(
+            EntryCounterDB.status, EntryCounterDB.kind, EntryCounterDB.count
+        ).where(EntryCounterDB.owner_id == owner_id)
+        by_status = dict.fromkeys((status.value for status in EntryStatus), 0)
+        by_kind = dict.fromkeys((kind.value for kind in EntryKind), 0)
+        for status, kind, count in self.db.execute(stmt):
+            by_status[status] = by_status.get(status, 0) + count
+            by_kind[kind] = by_kind.get(kind, 0) + count
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_kind": by_kind,
+        }
+
+    def reconcile_counters(self, owner_id: Optional[int] = None) -> int:
+        # Пересчитывает entry_counters из entries одним GROUP BY (для владельца
+        # или для всех) и возвращает число записанных строк. Нужен после
+        # гонок параллельных массовых операций и ручных правок базы.
+        # Счётчики считают оба слоя: архивация их не меняет.
+        tiers = []
+        stale = delete(EntryCounterDB)
+        for model in (EntryDB, EntryArchiveDB):
+            tier = select(model.owner_id, model.status, model.kind)
+            if owner_id is not None:
+                tier = tier.where(model.owner_id == owner_id)
+            tiers.append(tier)
+        if owner_id is not None:
+            stale = stale.where(EntryCounterDB.owner_id == owner_id)
+        rows = union_all(*tiers).subquery()
+        keys = (rows.c.owner_id, rows.c.status, rows.c.kind)
+        counted = select(*keys, func.count()).group_by(*keys)
+
+        self.db.execute(stale)
+        result = self.db.execute(
+            insert(EntryCounterDB).from_select(
+                ["owner_id", "status", "kind", "count"], counted
+            )
         )
-        self.db.add(db_entry)
         self.db.commit()
-        self.db.refresh(db_entry)
-        return self._to_domain(db_entry)
+        return result.rowcount
+
+    def _count(self, deltas: Counter) -> None:
+        # Счётчики меняются в транзакции самой записи: откат откатывает и их.
+        params = [
+            {"owner_id": owner_id, "status": status, "kind": kind, "count": delta}
+            for (owner_id, status, kind), delta in deltas.items()
+            if delta
+        ]
+        if not params:
+            return
+        upsert = UPSERTS[self.db.get_bind().dialect.name]
+        stmt = upsert(EntryCounterDB).values(params)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                EntryCounterDB.owner_id,
+                EntryCounterDB.status,
+                EntryCounterDB.kind,
+            ],
+            set_={"count": EntryCounterDB.count + stmt.excluded.count},
+        )
+        self.db.execute(stmt)
+
+    def _counted_where(
+        self, owner_id: int, status: Optional[str], kind: Optional[str], model=EntryDB
+    ) -> List[Tuple[Tuple[int, str, str], int]]:
+        # Сколько строк массовой операции приходится на каждую пару
+        # (status, kind) до её выполнения.
+        columns = [getattr(model, column.key) for column in COUNTER_COLUMNS]
+        stmt = (
+            select(*columns, func.count())
+            .where(*self._conditions(owner_id, status, kind, model))
+            .group_by(*columns)
+        )
+        return [(tuple(row[:-1]), row[-1]) for row in self.db.execute(stmt)]
 
-    def get_by_id(self, entry_id: int) -> Optional[Entry]:
-        stmt = select(EntryDB).where(EntryDB.id == entry_id)
-        result = self.db.execute(stmt)
-        db_entry = result.scalar_one_or_none()
-        return self._to_domain(db_entry) if db_entry else None
+    def _execute_where(
+        self, operation, stmt, owner_id, status, kind, model=EntryDB
+    ) -> List[int]:
+        conditions = self._conditions(owner_id, status, kind, model)
+        stmt = stmt.execution_options(synchronize_session=False)
+        if self._returning(operation):
+            stmt = stmt.where(*conditions).returning(model.id)
+            return list(self.db.execute(stmt).scalars())
 
-    def get_all(self, status: Optional[str] = None) -> List[Entry]:
-        stmt = select(EntryDB)
+        ids = list(self.db.execute(select(model.id).where(*conditions)).scalars())
+        if ids:
+            self.db.execute(stmt.where(model.id.in_(ids)))
+        return ids
+
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def _returning(self, operation: str) -> bool:
+        # RETURNING есть в SQLite >= 3.35 и Postgres; флаги выставляет диалект.
+        dialect = self.db.get_bind().dialect
+        return getattr(dialect, f"{operation}_returning", False)
+
+    def _new_row(self, entry_data: EntryCreate, owner_id: int) -> Dict[str, object]:
+        return {
+            "owner_id": owner_id,
+            "title": entry_data.title,
+            "kind": entry_data.kind.value,
+            "link": entry_data.link,
+            "status": entry_data.status.value,
+        }
+
+    def _conditions(
+        self, owner_id: int, status: Optional[str], kind: Optional[str], model=EntryDB
+    ):
+        conditions = [model.owner_id == owner_id]
         if status:
-            stmt = stmt.where(EntryDB.status == status)
-        result = self.db.execute(stmt)
-        db_entries = result.scalars().all()
-        return [self._to_domain(entry) for entry in db_entries]
+            conditions.append(model.status == status)
+        if kind:
+            conditions.append(model.kind == kind)
+        return conditions
+
+    def _ordered(
+        self, stmt: Select, sort: str, cursor: Optional[str], model=EntryDB
+    ) -> Select:
+        # Keyset: строки после курсора в порядке (sort, id).
+        sort_column = getattr(model, sort)
+        if cursor:
+            key, last_id = decode_cursor(cursor, sort)
+            if sort == "id":
+                stmt = stmt.where(model.id > last_id)
+            else:
+                stmt = stmt.where(tuple_(sort_column, model.id) > tuple_(key, last_id))
 
-    def update(self, entry_id: int, update_data: EntryUpdate) -> Optional[Entry]:
-        stmt = select(EntryDB).where(EntryDB.id == entry_id)
-        result = self.db.execute(stmt)
-        db_entry = result.scalar_one_or_none()
+        if sort == "id":
+            return stmt.order_by(model.id)
+        return stmt.order_by(sort_column, model.id)
 
-        if not db_entry:
+    def _filtered(
+        self,
+        owner_id: int,
+        status: Optional[str],
+        kind: Optional[str],
+        columns=ENTRY_COLUMNS,
+        model=EntryDB,
+    ) -> Select:
+        return select(*columns).where(*self._conditions(owner_id, status, kind, model))
+
+    def _listed(
+        self,
+        owner_id: int,
+        status: Optional[str],
+        kind: Optional[str],
+        fields: Optional[Sequence[str]],
+        sort: str,
+        cursor: Optional[str],
+        include_archived: bool = False,
+    ) -> Select:
+        def tier(model) -> Select:
+            columns = _projection(fields, model)
+            stmt = self._filtered(owner_id, status, kind, columns, model)
+            return self._ordered(stmt, sort, cursor, model)
+
+        # В архиве только завершённые записи: другой статус его не читает.
+        if not include_archived or status not in (None, EntryStatus.COMPLETED.value):
+            return tier(EntryDB)
+        # Оба слоя читаются по своим индексам уже в порядке курсора и сливаются
+        # (MERGE в SQLite, Merge Append в Postgres): LIMIT внешнего запроса
+        # останавливает слияние, ничего не сортируется целиком.
+        rows = union_all(
+            select(tier(EntryDB).subquery()), select(tier(EntryArchiveDB).subquery())
+        ).subquery()
+        if sort == "id":
+            return select(rows).order_by(rows.c.id)
+        return select(rows).order_by(rows.c[sort], rows.c.id)
+
+    def _id_floor(self) -> Optional[int]:
+        # Для многострочного INSERT (NEXT_ENTRY_ID там не годится: подзапросы
+        # VALUES вычисляются до вставки). Если строки с самыми большими id в
+        # архиве, возвращает наибольший из них: id серии задаются явно выше.
+        if self._dialect() != "sqlite":
             return None
+        hot = select(func.max(EntryDB.id)).scalar_subquery()
+        stmt = select(func.max(EntryArchiveDB.id)).where(
+            EntryArchiveDB.id > func.coalesce(hot, 0)
+        )
+        return self.db.execute(stmt).scalar()
 
-        update_dict = update_data.dict(exclude_unset=True)
-        for field, value in update_dict.items():
-            setattr(db_entry, field, value)
+    @staticmethod
+    def _tiers(status: Optional[str]) -> Tuple[Any, ...]:
+        # В архиве только завершённые записи: фильтр по другому статусу его
+        # не читает.
+        if status in (None, EntryStatus.COMPLETED.value):
+            return (EntryDB, EntryArchiveDB)
+        return (EntryDB,)
 
-        self.db.commit()
-        self.db.refresh(db_entry)
-        return self._to_domain(db_entry)
+    def _restore(self, *conditions) -> int:
+        # Возвращает подходящие строки архива в entries, не фиксируя транзакцию:
+        # запись в архивную строку идёт через горячую таблицу.
+        columns = [getattr(EntryArchiveDB, key) for key in TIERED_COLUMNS]
+        restored = self.db.execute(
+            insert(EntryDB).from_select(
+                TIERED_COLUMNS, select(*columns).where(*conditions)
+            )
+        ).rowcount
+        if restored:
+            self.db.execute(delete(EntryArchiveDB).where(*conditions))
+        return restored
 
-    def delete(self, entry_id: int) -> bool:
-        stmt = select(EntryDB).where(EntryDB.id == entry_id)
-        result = self.db.execute(stmt)
-        db_entry = result.scalar_one_or_none()
+    def archive_completed(
+        self, before: datetime, limit: int, owner_id: Optional[int] = None
+    ) -> Dict[int, List[int]]:
+        # Одна пачка архивации: до limit завершённых записей, не менявшихся с
+        # before, переезжают в entries_archive одной транзакцией. Счётчики не
+        # меняются, версии коллекций растут: записи уходят из списка по умолчанию.
+        # Возвращает id перенесённых записей по владельцам. Строка без
+        # updated_at (миграция их заполнила) старой не считается.
+        unchanged = EntryDB.updated_at < before
+        # Порядок совпадает с индексом фильтра: (status, updated_at) или
+        # (owner_id, status, id), иначе каждая пачка сортирует все завершённые.
+        # Для владельца updated_at обёрнут в coalesce: иначе планировщик берёт
+        # диапазон по (status, updated_at) всех владельцев и сортирует его.
+        if owner_id is not None:
+            conditions = [
+                EntryDB.owner_id == owner_id,
+                func.coalesce(EntryDB.updated_at, before) < before,
+            ]
+            order = (EntryDB.id,)
+        else:
+            conditions = [unchanged]
+            order = (EntryDB.updated_at, EntryDB.id)
+        conditions.append(EntryDB.status == EntryStatus.COMPLETED.value)
+        stmt = select(EntryDB.id).where(*conditions)
+        ids = list(self.db.execute(stmt.order_by(*order).limit(limit)).scalars())
+        if not ids:
+            self.db.rollback()
+            return {}
 
-        if not db_entry:
-            return False
+        # Перенос — по первичному ключу. Повторная проверка updated_at отсекает
+        # строки, изменённые после выборки: любая запись сдвигает updated_at.
+        # Условие на status здесь не нужно и увело бы план на индекс статуса.
+        # В архив попадают ровно удалённые строки (DELETE ... RETURNING), и
+        # дальше учитываются только они.
+        conditions = [EntryDB.id.in_(ids), unchanged]
+        columns = [getattr(EntryDB, key) for key in TIERED_COLUMNS]
+        archived_at = utcnow()
+        if self._returning("delete"):
+            stmt = delete(EntryDB).where(*conditions).returning(*columns)
+            rows = self.db.execute(stmt).all()
+            if rows:
+                self.db.execute(
+                    insert(EntryArchiveDB),
+                    [{**row._mapping, "archived_at": archived_at} for row in rows],
+                )
+        else:
+            rows = self.db.execute(select(*columns).where(*conditions)).all()
+            self.db.execute(
+                insert(EntryArchiveDB).from_select(
+                    [*TIERED_COLUMNS, "archived_at"],
+                    select(*columns, literal(archived_at, DateTime)).where(
+                        EntryDB.id.in_([row.id for row in rows])
+                    ),
+                )
+            )
+            self.db.execute(
+                delete(EntryDB).where(EntryDB.id.in_([row.id for row in rows]))
+            )
 
-        self.db.delete(db_entry)
+        archived: Dict[int, List[int]] = {}
+        for row in sorted(rows, key=lambda row: row.id):
+            archived.setdefault(row.owner_id, []).append(row.id)
+        for owner in archived:
+            self._bump_version(owner)
+        publish(self.db, [EntryChange(row.id, row.owner_id, None) for row in rows])
         self.db.commit()
-        return True
+        return archived
+
+
+def _counter_key(record: EntryRecord) -> Tuple[int, str, str]:
+    return record.owner_id, record.status, record.kind
+
+
+def _batch_deltas(operations, results, counted) -> Counter:
+    # counted — (owner_id, status, kind) целевых записей до пакета. Операции
+    # проходятся по порядку, и каждая переносит запись из прежней группы в
+    # новую, поэтому повторные изменения одной записи сокращаются.
+    deltas = Counter()
+    for op, record in zip(operations, results):
+        if record is None:
+            continue
+        if op.op != "create":
+            deltas[counted[record.id]] -= 1
+        if op.op == "delete":
+            del counted[record.id]
+        else:
+            counted[record.id] = _counter_key(record)
+            deltas[counted[record.id]] += 1
+    return deltas
+
+
+def _stored(values: Dict[str, Any]) -> Dict[str, Any]:
+    # link_hash — производная от link колонка: пишется вместе с ней.
+    if "link" in values:
+        return {**values, "link_hash": link_hash(values["link"])}
+    return values
+
+
+def _projection(fields: Optional[Sequence[str]], model=EntryDB):
+    columns = ENTRY_COLUMNS
+    if fields:
+        needed = {"id", *fields}
+        columns = [column for column in ENTRY_COLUMNS if column.key in needed]
+    if model is not EntryDB:
+        columns = [getattr(model, column.key) for column in columns]
+    return columns
+
+
+def _trigram_match(trigrams: List[str]):
+    return literal_column(ENTRIES_TRIGRAMS.name).op("MATCH")(trigram_query(trigrams))
+
+
+def _record(row, fields: Optional[Sequence[str]]) -> Union[EntryRecord, Dict[str, Any]]:
+    if not fields:
+        return EntryRecord(*row)
+    return {field: getattr(row, field) for field in fields}
+
+
+def _affected(field, changes, before, after) -> Optional[Set[str]]:
+    # Значения поля до и после записи. None — прежнее значение неизвестно,
+    # и сбрасывать придётся группы списков с любым значением этого поля.
+    if field not in changes:
+        return {after}
+    if before is None:
+        return None
+    return {before[field], after}
+
+
+def _union(acc: Optional[Set[str]], values: Optional[Set[str]]) -> Optional[Set[str]]:
+    return None if acc is None or values is None else acc | values
+
 
-    def _to_domain(self, db_entry: EntryDB) -> Entry:
-        return Entry(
-            id=db_entry.id,
-            owner_id=db_entry.owner_id,
-            title=db_entry.title,
-            kind=db_entry.kind,
-            link=db_entry.link,
-            status=db_entry.status,
+class CachedEntryRepository(EntryRepository):
+    # Чтения по id и страницы списков идут через EntryCache. Записи после
+    # коммита сбрасывают ключи затронутых записей и группы списков, в которые
+    # эти записи попадали до или после изменения.
+    def __init__(self, db: Session, cache: EntryCache):
+        super().__init__(db)
+        self.cache = cache
+
+    def get_by_id(
+        self, entry_id: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Union[EntryRecord, Dict[str, Any]]]:
+        # В кэше лежат только полные записи вместе с версией: проекция строится
+        # из них, а при промахе с fields читается из БД узкий SELECT без
+        # заполнения кэша.
+        key = self.cache.entry_key(entry_id)
+        cached = self.cache.get_entry(key) if key else None
+        if cached is not None:
+            if fields:
+                return {field: cached[field] for field in fields}
+            return EntryRecord(**cached)
+        if fields:
+            return super().get_by_id(entry_id, fields)
+
+        record = super().get_by_id(entry_id)
+        if record is not None and key:
+            self.cache.set_entry(key, asdict(record))
+        return record
+
+    def get_page(
+        self,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        include_archived: bool = False,
+        version: Optional[int] = None,
+    ) -> Tuple[List[Union[EntryRecord, Dict[str, Any]]], Optional[str]]:
+        # version — версия коллекции, из которой посчитан ETag ответа. Она
+        # входит в ключ: поколения групп локальны для процесса, и без неё
+        # запись из другого процесса (импорт, архивация) дала бы новый ETag
+        # на старую страницу из кэша.
+        # Страницы с архивом не кэшируются: их читают редко.
+        if include_archived:
+            return super().get_page(
+                status, limit, cursor, sort, kind, owner_id, fields, True
+            )
+        projection = ",".join(fields) if fields else None
+        key = self.cache.list_key(
+            owner_id, status, kind, sort, limit, cursor, projection, version
+        )
+        cached = self.cache.get_list(key) if key else None
+        if cached is not None:
+            items, next_cursor = cached
+            if fields:
+                return items, next_cursor
+            return [EntryRecord(**item) for item in items], next_cursor
+
+        records, next_cursor = super().get_page(
+            status, limit, cursor, sort, kind, owner_id, fields
+        )
+        if key:
+            items = records if fields else [asdict(record) for record in records]
+            self.cache.set_list(key, [items, next_cursor])
+        return records, next_cursor
+
+    def create(self, entry_data: EntryCreate, owner_id: int = 1) -> EntryRecord:
+        record = super().create(entry_data, owner_id)
+        self.cache.invalidate(owner_id, (), {record.status}, {record.kind})
+        return record
+
+    def create_many(
+        self, entries: Sequence[EntryCreate], owner_id: int = 1
+    ) -> List[EntryRecord]:
+        records = super().create_many(entries, owner_id)
+        if records:
+            self.cache.invalidate(
+                owner_id,
+                (),
+                {record.status for record in records},
+                {record.kind for record in records},
+            )
+        return records
+
+    def update(
+        self,
+        entry_id: int,
+        update_data: EntryUpdate,
+        expected_versions: Optional[Collection[int]] = None,
+    ) -> Optional[EntryRecord]:
+        before = self.cache.peek_entry(entry_id)
+        record = super().update(entry_id, update_data, expected_versions)
+        if record is not None:
+            changes = update_data.dict(exclude_unset=True)
+            self.cache.invalidate(
+                record.owner_id,
+                [entry_id],
+                _affected("status", changes, before, record.status),
+                _affected("kind", changes, before, record.kind),
+            )
+        return record
+
+    def delete(
+        self, entry_id: int, expected_versions: Optional[Collection[int]] = None
+    ) -> bool:
+        # Владелец и группы списков берутся из удалённой строки (RETURNING),
+        # а не из кэша: запись могла в него не попасть.
+        row = self._deleted(entry_id, expected_versions)
+        if row is not None:
+            self.cache.invalidate(row.owner_id, [entry_id], {row.status}, {row.kind})
+        return row is not None
+
+    def apply_batch(
+        self, operations: List[EntryBatchOperation], owner_id: int = 1
+    ) -> List[Optional[EntryRecord]]:
+        before = {
+            op.id: self.cache.peek_entry(op.id)
+            for op in operations
+            if op.op == "update"
+        }
+        results = super().apply_batch(operations, owner_id)
+
+        ids: Set[int] = set()
+        statuses: Optional[Set[str]] = set()
+        kinds: Optional[Set[str]] = set()
+        for op, record in zip(operations, results):
+            if record is None:
+                continue
+            ids.add(record.id)
+            changes = op.data.dict(exclude_unset=True) if op.op == "update" else {}
+            old = before.get(record.id)
+            statuses = _union(
+                statuses, _affected("status", changes, old, record.status)
+            )
+            kinds = _union(kinds, _affected("kind", changes, old, record.kind))
+        if ids:
+            self.cache.invalidate(owner_id, ids, statuses, kinds)
+        return results
+
+    def update_where(
+        self,
+        update_data: EntryUpdate,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+    ) -> List[int]:
+        ids = super().update_where(update_data, status, kind, owner_id)
+        if ids:
+            new_status = update_data.status.value if update_data.status else status
+            new_kind = update_data.kind.value if update_data.kind else kind
+            self.cache.invalidate(
+                owner_id,
+                ids,
+                _union({status} if status else None, {new_status}),
+                _union({kind} if kind else None, {new_kind}),
+            )
+        return ids
+
+    def delete_where(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+    ) -> List[int]:
+        ids = super().delete_where(status, kind, owner_id)
+        if ids:
+            self.cache.invalidate(
+                owner_id, ids, {status} if status else None, {kind} if kind else None
+            )
+        return ids
+
+    def archive_completed(
+        self, before: datetime, limit: int, owner_id: Optional[int] = None
+    ) -> Dict[int, List[int]]:
+        archived = super().archive_completed(before, limit, owner_id)
+        for owner, ids in archived.items():
+            self.cache.invalidate(owner, ids, {EntryStatus.COMPLETED.value}, None)
+        return archived
+
+
+class AsyncEntryRepository:
+    # Те же запросы, что и в EntryRepository, но через AsyncSession.run_sync:
+    # ввод-вывод идёт через async-драйвер (aiosqlite) и не блокирует цикл событий.
+    def __init__(self, db: AsyncSession, cache: Optional[EntryCache] = None):
+        self.db = db
+        self.cache = cache
+
+    async def _run(self, method: str, *args, **kwargs):
+        def call(session: Session):
+            if self.cache is not None:
+                repository = CachedEntryRepository(session, self.cache)
+            else:
+                repository = EntryRepository(session)
+            return getattr(repository, method)(*args, **kwargs)
+
+        return await self.db.run_sync(call)
+
+    async def create(self, entry_data: EntryCreate, owner_id: int = 1) -> EntryRecord:
+        return await self._run("create", entry_data, owner_id=owner_id)
+
+    async def get_by_id(
+        self, entry_id: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Union[EntryRecord, Dict[str, Any]]]:
+        return await self._run("get_by_id", entry_id, fields)
+
+    async def get_all(
+        self, *args, **kwargs
+    ) -> List[Union[EntryRecord, Dict[str, Any]]]:
+        return await self._run("get_all", *args, **kwargs)
+
+    async def stream_all(
+        self,
+        status: Optional[str] = None,
+        kind: Optional[str] = None,
+        owner_id: int = 1,
+        fields: Optional[Sequence[str]] = None,
+        sort: str = "id",
+        cursor: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        include_archived: bool = False,
+    ) -> AsyncIterator[List[Union[EntryRecord, Dict[str, Any]]]]:
+        # Асинхронный аналог iter_all: серверный курсор через AsyncSession.stream,
+        # пачки отдаются по мере чтения. Кэш не используется.
+        stmt = EntryRepository(self.db.sync_session).select_all(
+            status, kind, owner_id, fields, sort, cursor, include_archived
         )
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield [_record(row, fields) for row in rows]
+
+    async def get_page(
+        self, *args, **kwargs
+    ) -> Tuple[List[Union[EntryRecord, Dict[str, Any]]], Optional[str]]:
+        return await self._run("get_page", *args, **kwargs)
+
+    async def search(
+        self, *args, **kwargs
+    ) -> Tuple[List[Union[EntryRecord, Dict[str, Any]]], Optional[str]]:
+        return await self._run("search", *args, **kwargs)
+
+    async def update(
+        self,
+        entry_id: int,
+        update_data: EntryUpdate,
+        expected_versions: Optional[Collection[int]] = None,
+    ) -> Optional[EntryRecord]:
+        return await self._run("update", entry_id, update_data, expected_versions)
+
+    async def delete(
+        self, entry_id: int, expected_versions: Optional[Collection[int]] = None
+    ) -> bool:
+        return await self._run("delete", entry_id, expected_versions)
+
+    async def get_entry_version(self, entry_id: int) -> Optional[int]:
+        return await self._run("get_entry_version", entry_id)
+
+    async def find_duplicates(self, *args, **kwargs) -> List[DuplicateMatch]:
+        return await self._run("find_duplicates", *args, **kwargs)
+
+    async def duplicate_groups(
+        self, *args, **kwargs
+    ) -> Tuple[List[List[EntryRecord]], Optional[str]]:
+        return await self._run("duplicate_groups", *args, **kwargs)
+
+    async def get_stats(self, owner_id: int = 1) -> Dict[str, Any]:
+        return await self._run("get_stats", owner_id)
+
+    async def get_collection_version(self, owner_id: int = 1) -> int:
+        return await self._run("get_collection_version", owner_id)
+
+    async def apply_batch(
+        self, operations: List[EntryBatchOperation], owner_id: int = 1
+    ) -> List[Optional[EntryRecord]]:
+        return await self._run("apply_batch", operations, owner_id=owner_id)
+
+    async def update_where(self, *args, **kwargs) -> List[int]:
+        return await self._run("update_where", *args, **kwargs)
+
+    async def delete_where(self, *args, **kwargs) -> List[int]:
+        return await self._run("delete_where", *args, **kwargs)
@@ -0,0 +1,17 @@
+import re
+from typing import List
+
+from app.core.errors import ValidationError
+
+MAX_SEARCH_TERMS = 10
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> List[str]:
+    # Из строки пользователя берутся только слова: синтаксис FTS5/tsquery
+    # (кавычки, NEAR, OR, скобки) в запрос не попадает.
+    terms = _TERM_RE.findall(query)[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValidationError("Search query must contain at least one word")
+    return terms
@@ -109,6 +109,7 @@ def setup_secrets() -> bool:
 
     secrets_manager.register_secret("VAULT_ADDR", required=False)
     secrets_manager.register_secret("VAULT_TOKEN", required=False)
+    secrets_manager.register_secret("REDIS_URL", required=False)
 
     if not secrets_manager.validate():
         return False
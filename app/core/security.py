@@ -16,7 +16,20 @@ ENDPOINT_LIMITS = {
     "create_entry": "3 per minute" if not IS_TEST_ENV else None,
     "get_entries": "5 per minute" if not IS_TEST_ENV else None,
     "get_entry": "5 per minute" if not IS_TEST_ENV else None,
+    "search_entries": "5 per minute" if not IS_TEST_ENV else None,
+    "suggest_entries": "60 per minute" if not IS_TEST_ENV else None,
+    "duplicate_entries": "5 per minute" if not IS_TEST_ENV else None,
+    "entry_stats": "30 per minute" if not IS_TEST_ENV else None,
+    "import_entries": "2 per minute" if not IS_TEST_ENV else None,
     "update_entry": "3 per minute" if not IS_TEST_ENV else None,
     "delete_entry": "2 per minute" if not IS_TEST_ENV else None,
+    "batch_entries": "3 per minute" if not IS_TEST_ENV else None,
+    "bulk_update_entries": "3 per minute" if not IS_TEST_ENV else None,
+    "bulk_delete_entries": "2 per minute" if not IS_TEST_ENV else None,
     "health_check": "10 per minute" if not IS_TEST_ENV else None,
 }
+
+# Экспорт ограничивается отдельно от ENDPOINT_LIMITS: поминутные лимиты
+# рассчитаны на короткие запросы, а выгрузка идёт минутами. Кроме частоты
+# ограничено число одновременных выгрузок (app.core.export.ExportSlots).
+EXPORT_LIMIT = "20 per hour" if not IS_TEST_ENV else None
@@ -0,0 +1,26 @@
+import json
+from typing import Any, AsyncIterator, List
+
+
+def _dumps(items: List[Any]) -> str:
+    # Те же настройки, что у starlette JSONResponse.
+    return json.dumps(
+        [item if isinstance(item, dict) else item.to_dict() for item in items],
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    )
+
+
+async def entry_list_json(batches: AsyncIterator[List[Any]]) -> AsyncIterator[bytes]:
+    # Тело EntryList по частям: {"items":[...],"total":N,"next_cursor":null}.
+    # Каждая пачка кодируется одним json.dumps, total пишется в конце.
+    yield b'{"items":['
+    total = 0
+    async for items in batches:
+        if not items:
+            continue
+        chunk = _dumps(items)[1:-1]
+        yield (f",{chunk}" if total else chunk).encode("utf-8")
+        total += len(items)
+    yield f'],"total":{total},"next_cursor":null}}'.encode("utf-8")
@@ -0,0 +1,195 @@
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.changes import EntryChange, subscribe
+
+SUGGEST_MAX_KEYS = 200_000
+SUGGEST_MAX_WORDS = 8
+SUGGEST_MAX_KEY_LENGTH = 64
+# Изменения из других процессов сюда не доходят: индекс владельца живёт не
+# дольше TTL и затем перестраивается из БД.
+SUGGEST_INDEX_TTL = 300
+
+
+def normalize_title(title: str) -> str:
+    # "Чистая  Архитектура" -> "чистая архитектура", "Café" -> "cafe".
+    decomposed = unicodedata.normalize("NFKD", title)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def _title_keys(title: str) -> List[str]:
+    # Ключ на каждое начало слова: "clean code" -> ["clean code", "code"],
+    # чтобы префикс находил и слова из середины названия.
+    normalized = normalize_title(title)
+    keys, start = [], 0
+    for _ in range(SUGGEST_MAX_WORDS):
+        keys.append(normalized[start : start + SUGGEST_MAX_KEY_LENGTH])
+        start = normalized.find(" ", start) + 1
+        if start == 0:
+            break
+    return [key for key in keys if key]
+
+
+class OwnerIndex:
+    # Отсортированный массив (ключ, id): поиск по префиксу — bisect и проход
+    # вперёд, пока ключи начинаются с префикса.
+    def __init__(self, built_at: float):
+        self.built_at = built_at
+        self.keys: List[Tuple[str, int]] = []
+        self.titles: Dict[int, str] = {}
+
+    def put(self, entry_id: int, title: str) -> None:
+        self.remove(entry_id)
+        self.titles[entry_id] = title
+        for key in _title_keys(title):
+            insort(self.keys, (key, entry_id))
+
+    def remove(self, entry_id: int) -> None:
+        title = self.titles.pop(entry_id, None)
+        if title is None:
+            return
+        for key in _title_keys(title):
+            position = bisect_left(self.keys, (key, entry_id))
+            if position < len(self.keys) and self.keys[position] == (key, entry_id):
+                del self.keys[position]
+
+    def lookup(self, prefix: str, limit: int) -> List[Dict[str, Any]]:
+        items, seen = [], set()
+        position = bisect_left(self.keys, (prefix, -1))
+        while position < len(self.keys) and len(items) < limit:
+            key, entry_id = self.keys[position]
+            if not key.startswith(prefix):
+                break
+            if entry_id not in seen:
+                seen.add(entry_id)
+                items.append({"id": entry_id, "title": self.titles[entry_id]})
+            position += 1
+        return items
+
+
+class SuggestIndex:
+    # Индексы владельцев строятся лениво и вытесняются по LRU, когда суммарное
+    # число ключей превышает max_keys. Пока индекс владельца строится,
+    # изменения копятся и применяются поверх прочитанных из БД строк.
+    def __init__(
+        self,
+        max_keys: int = SUGGEST_MAX_KEYS,
+        ttl: float = SUGGEST_INDEX_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.clock = clock
+        self._owners: "OrderedDict[int, OwnerIndex]" = OrderedDict()
+        self._building: Dict[int, List[EntryChange]] = {}
+        # Владельцы, чей индекс не помещается в бюджет: их запросы идут в БД.
+        self._oversized: Set[int] = set()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.builds = 0
+        self.evictions = 0
+
+    def lookup(
+        self, owner_id: int, prefix: str, limit: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        # None — индекса нет: его нужно построить или ответить из БД.
+        with self._lock:
+            index = self._owners.get(owner_id)
+            if index is None:
+                return None
+            if index.built_at + self.ttl <= self.clock():
+                self._drop(owner_id)
+                return None
+            self._owners.move_to_end(owner_id)
+            return index.lookup(normalize_title(prefix), limit)
+
+    def begin_build(self, owner_id: int) -> bool:
+        # False — индекс уже строится другим запросом или слишком велик.
+        with self._lock:
+            if owner_id in self._building or owner_id in self._oversized:
+                return False
+            self._building[owner_id] = []
+            return True
+
+    def finish_build(self, owner_id: int, rows: Iterable[Dict[str, Any]]) -> None:
+        index = OwnerIndex(self.clock())
+        for row in rows:
+            index.put(row["id"], row["title"])
+
+        with self._lock:
+            for change in self._building.pop(owner_id, []):
+                self._apply_one(index, change)
+            self.builds += 1
+            if len(index.keys) > self.max_keys:
+                self._oversized.add(owner_id)
+                return
+            self._drop(owner_id)
+            self._owners[owner_id] = index
+            self.size += len(index.keys)
+            self._evict()
+
+    def abort_build(self, owner_id: int) -> None:
+        with self._lock:
+            self._building.pop(owner_id, None)
+
+    def apply(self, changes: List[EntryChange]) -> None:
+        with self._lock:
+            for change in changes:
+                pending = self._building.get(change.owner_id)
+                if pending is not None:
+                    pending.append(change)
+                    continue
+                index = self._owners.get(change.owner_id)
+                if index is not None:
+                    before = len(index.keys)
+                    self._apply_one(index, change)
+                    self.size += len(index.keys) - before
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._owners.clear()
+            self._building.clear()
+            self._oversized.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "owners": len(self._owners),
+            "keys": self.size,
+            "builds": self.builds,
+            "evictions": self.evictions,
+        }
+
+    def _apply_one(self, index: OwnerIndex, change: EntryChange) -> None:
+        if change.title is None:
+            index.remove(change.entry_id)
+        else:
+            index.put(change.entry_id, change.title)
+
+    def _drop(self, owner_id: int) -> None:
+        index = self._owners.pop(owner_id, None)
+        if index is not None:
+            self.size -= len(index.keys)
+
+    def _evict(self) -> None:
+        while self.size > self.max_keys and self._owners:
+            owner_id = next(iter(self._owners))
+            self._drop(owner_id)
+            self.evictions += 1
+
+
+_suggest_index: Optional[SuggestIndex] = None
+
+
+def get_suggest_index() -> SuggestIndex:
+    global _suggest_index
+    if _suggest_index is None:
+        _suggest_index = SuggestIndex()
+        subscribe(_suggest_index.apply)
+    return _suggest_index
@@ -1,9 +1,27 @@
-from sqlalchemy import Column, Integer, String, Text
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    inspect,
+    text,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    # Наивное UTC-время: так DateTime хранится и в SQLite, и в Postgres.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class EntryDB(Base):
     __tablename__ = "entries"
 
@@ -12,7 +30,189 @@ class EntryDB(Base):
     title = Column(String(200), nullable=False)
     kind = Column(String(10), nullable=False)
     link = Column(Text, nullable=True)
+    # Хэш канонического URL (app.core.duplicates.link_hash) для поиска дублей.
+    link_hash = Column(String(16), nullable=True)
     status = Column(String(15), nullable=False, default="planned")
+    # Версия строки для If-Match: растёт на единицу при каждом изменении.
+    version = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    # Время последней записи строки; строкам, созданным до колонки, его
+    # проставила миграция 6e2a9d4b8c15.
+    updated_at = Column(DateTime, nullable=True, default=utcnow, onupdate=utcnow)
+
+    # Индексы повторяют пути доступа EntryRepository: владелец, фильтр, ключ курсора.
+    __table_args__ = (
+        Index("ix_entries_owner_id_id", "owner_id", "id"),
+        Index("ix_entries_owner_status_id", "owner_id", "status", "id"),
+        Index("ix_entries_owner_kind_id", "owner_id", "kind", "id"),
+        Index("ix_entries_owner_title_id", "owner_id", "title", "id"),
+        Index("ix_entries_owner_link_hash", "owner_id", "link_hash"),
+        # Выборка кандидатов в архив (app.core.archive).
+        Index("ix_entries_status_updated_at", "status", "updated_at"),
+    )
 
     def __repr__(self):
         return f"<EntryDB(id={self.id}, title='{self.title}', kind='{self.kind}')>"
+
+
+class EntryArchiveDB(Base):
+    # Холодный слой: завершённые записи, давно не менявшиеся, переносятся сюда
+    # с теми же id (app.core.archive), чтобы entries и её индексы не росли.
+    # Поиск и дубли смотрят только в entries, чтение по id — в обе таблицы.
+    __tablename__ = "entries_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    owner_id = Column(Integer, nullable=False)
+    title = Column(String(200), nullable=False)
+    kind = Column(String(10), nullable=False)
+    link = Column(Text, nullable=True)
+    link_hash = Column(String(16), nullable=True)
+    status = Column(String(15), nullable=False)
+    version = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+    # Те же пути доступа, что у entries: список с include_archived читает оба
+    # слоя с одним фильтром, сортировкой и курсором.
+    __table_args__ = (
+        Index("ix_entries_archive_owner_id_id", "owner_id", "id"),
+        Index("ix_entries_archive_owner_status_id", "owner_id", "status", "id"),
+        Index("ix_entries_archive_owner_kind_id", "owner_id", "kind", "id"),
+        Index("ix_entries_archive_owner_title_id", "owner_id", "title", "id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<EntryArchiveDB(id={self.id}, title='{self.title}', kind='{self.kind}')>"
+        )
+
+
+# Полнотекстовый индекс по title живёт вне ORM-метаданных. В SQLite это FTS5 с
+# внешним содержимым (entries), триггеры держат его в синхроне с таблицей; в
+# Postgres хватает GIN-индекса по выражению to_tsvector.
+ENTRY_SEARCH_TABLE = "entries_fts"
+ENTRY_SEARCH_INDEX = "ix_entries_title_search"
+
+ENTRY_SEARCH_DDL = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE entries_fts USING fts5(title, content='entries', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER entries_fts_ai AFTER INSERT ON entries BEGIN "
+        "INSERT INTO entries_fts(rowid, title) VALUES (new.id, new.title); END",
+        "CREATE TRIGGER entries_fts_ad AFTER DELETE ON entries BEGIN "
+        "INSERT INTO entries_fts(entries_fts, rowid, title) "
+        "VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER entries_fts_au AFTER UPDATE OF title ON entries BEGIN "
+        "INSERT INTO entries_fts(entries_fts, rowid, title) "
+        "VALUES ('delete', old.id, old.title); "
+        "INSERT INTO entries_fts(rowid, title) VALUES (new.id, new.title); END",
+    ),
+    "postgresql": (
+        "CREATE INDEX ix_entries_title_search ON entries "
+        "USING gin (to_tsvector('simple', title))",
+    ),
+}
+
+
+# Триграммный индекс по title для поиска похожих названий (app.core.duplicates):
+# FTS5 с токенизатором trigram в SQLite, pg_trgm в Postgres.
+ENTRY_TRIGRAM_TABLE = "entries_trigrams"
+ENTRY_TRIGRAM_INDEX = "ix_entries_title_trgm"
+
+ENTRY_TRIGRAM_DDL = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE entries_trigrams USING fts5(title, "
+        "content='entries', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER entries_trigrams_ai AFTER INSERT ON entries BEGIN "
+        "INSERT INTO entries_trigrams(rowid, title) VALUES (new.id, new.title); END",
+        "CREATE TRIGGER entries_trigrams_ad AFTER DELETE ON entries BEGIN "
+        "INSERT INTO entries_trigrams(entries_trigrams, rowid, title) "
+        "VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER entries_trigrams_au AFTER UPDATE OF title ON entries BEGIN "
+        "INSERT INTO entries_trigrams(entries_trigrams, rowid, title) "
+        "VALUES ('delete', old.id, old.title); "
+        "INSERT INTO entries_trigrams(rowid, title) VALUES (new.id, new.title); END",
+    ),
+    "postgresql": (
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_entries_title_trgm ON entries "
+        "USING gin (lower(title) gin_trgm_ops)",
+    ),
+}
+
+TITLE_INDEXES = (
+    (ENTRY_SEARCH_TABLE, ENTRY_SEARCH_INDEX, ENTRY_SEARCH_DDL),
+    (ENTRY_TRIGRAM_TABLE, ENTRY_TRIGRAM_INDEX, ENTRY_TRIGRAM_DDL),
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    # create_all не трогает уже существующую entries, поэтому индексы создаются
+    # на уровне метаданных: и для новой базы, и для базы, созданной до них.
+    inspector = inspect(connection)
+    if not inspector.has_table(EntryDB.__tablename__):
+        return
+    existing = {index["name"] for index in inspector.get_indexes("entries")}
+
+    for table_name, index_name, ddl in TITLE_INDEXES:
+        statements = ddl.get(connection.dialect.name)
+        if not statements:
+            continue
+        if inspector.has_table(table_name) or index_name in existing:
+            continue
+        for statement in statements:
+            connection.exec_driver_sql(statement)
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql(
+                f"INSERT INTO {table_name}({table_name}) VALUES ('rebuild')"
+            )
+
+
+for _table_name in (ENTRY_SEARCH_TABLE, ENTRY_TRIGRAM_TABLE):
+    event.listen(
+        EntryDB.__table__,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {_table_name}").execute_if(dialect="sqlite"),
+    )
+
+
+def is_search_object(name, type_, parent_names) -> bool:
+    # Для alembic autogenerate: FTS5 и её теневые таблицы не описаны в Base.
+    if type_ == "table":
+        return any(
+            name == table_name or name.startswith(f"{table_name}_")
+            for table_name, _, _ in TITLE_INDEXES
+        )
+    return type_ == "index" and name in {index for _, index, _ in TITLE_INDEXES}
+
+
+class CollectionVersionDB(Base):
+    __tablename__ = "collection_versions"
+
+    owner_id = Column(Integer, primary_key=True)
+    collection = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    def __repr__(self):
+        return (
+            f"<CollectionVersionDB(owner_id={self.owner_id}, "
+            f"collection='{self.collection}', version={self.version})>"
+        )
+
+
+class EntryCounterDB(Base):
+    # Число записей владельца в каждой паре (status, kind). Меняется в той же
+    # транзакции, что и entries (EntryRepository), сверяется GROUP BY-ем
+    # (EntryRepository.reconcile_counters).
+    __tablename__ = "entry_counters"
+
+    owner_id = Column(Integer, primary_key=True)
+    status = Column(String(15), primary_key=True)
+    kind = Column(String(10), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    def __repr__(self):
+        return (
+            f"<EntryCounterDB(owner_id={self.owner_id}, status='{self.status}', "
+            f"kind='{self.kind}', count={self.count})>"
+        )
@@ -1,9 +1,30 @@
 import re
+from bisect import bisect_right
+from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from itertools import accumulate
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlparse, urlunparse
 
-from pydantic import BaseModel, Field, root_validator, validator
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationError,
+    conlist,
+    root_validator,
+    validator,
+)
 
 
 class EntryKind(str, Enum):
@@ -17,6 +38,163 @@ class EntryStatus(str, Enum):
     COMPLETED = "completed"
 
 
+def _literal_alternation(tokens) -> str:
+    # Собирает из литералов регулярку в форме префиксного дерева: движок re
+    # проверяет общий префикс один раз вместо перебора всех альтернатив подряд.
+    tree: Dict[str, dict] = {}
+    for token in tokens:
+        node = tree
+        for char in token:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + build(child) for char, child in node.items() if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(tree)
+
+
+# Правила проверки title и link компилируются один раз при импорте: одна
+# альтернация на семейство правил вместо цикла re.search по списку строк.
+_SQL_KEYWORDS = (
+    "SELECT",
+    "INSERT",
+    "UPDATE",
+    "DELETE",
+    "DROP",
+    "CREATE",
+    "ALTER",
+    "EXEC",
+    "UNION",
+)
+_SQL_COMMENT_TOKENS = ("--", ";", "/*", "*/")
+_UNSAFE_TITLE_TOKENS = (
+    "<script",
+    "</script>",
+    "javascript:",
+    "onload=",
+    "onerror=",
+    "onclick=",
+    "vbscript:",
+    "data:",
+    "<iframe",
+    "</iframe>",
+    "<object",
+    "</object>",
+    "<embed",
+    "</embed>",
+    "<form",
+    "</form>",
+    "alert(",
+    "confirm(",
+    "prompt(",
+    "eval(",
+    "expression(",
+)
+
+_TITLE_FORBIDDEN_CHARS_RE = re.compile(r'[<>{}`"\\]')
+_TITLE_MEANINGFUL_RE = re.compile(r"[a-zA-Zа-яА-Я0-9]")
+_TITLE_SQL_RE = re.compile(
+    rf"\b{_literal_alternation(_SQL_KEYWORDS)}\b"
+    rf"|{_literal_alternation(_SQL_COMMENT_TOKENS)}",
+    re.IGNORECASE,
+)
+# WHERE/OR ... 1=1 в пределах строки. Атомарная группа фиксирует первое WHERE/OR
+# строки, поэтому проверка линейна даже для "or or or ...".
+_TITLE_SQL_TAUTOLOGY_RE = re.compile(
+    r"^(?>[^\n]*?\b(?:WHERE|OR)\b).*\b1\s*=\s*1\b", re.IGNORECASE | re.MULTILINE
+)
+_TITLE_UNSAFE_RE = re.compile(_literal_alternation(_UNSAFE_TITLE_TOKENS), re.IGNORECASE)
+_TITLE_PUNCTUATION_ONLY_RE = re.compile(r'^[!@#$%^&*()_+\-=\[\]{}|\\:;"<>,.?/~`]+$')
+
+_LINK_DANGEROUS_SCHEMES = ("javascript:", "data:", "vbscript:", "file:", "ftp:")
+_LINK_DOMAIN_RE = re.compile(r"^[a-z0-9]+([\-\.]{1}[a-z0-9]+)*\.[a-z]{2,}$")
+_LINK_DANGEROUS_PATH_RE = re.compile(r"\.\.|\./|//|\\")
+_LINK_UNSAFE_QUERY_RE = re.compile("script|onload|onerror")
+
+
+def _clean_title(v):
+    if isinstance(v, str):
+        v = v.strip()
+        v = _TITLE_FORBIDDEN_CHARS_RE.sub("", v)
+    return v
+
+
+def _check_title_content(v: str) -> str:
+    if not v or not v.strip():
+        raise ValueError("Title cannot be empty or whitespace only")
+
+    if not _TITLE_MEANINGFUL_RE.search(v):
+        raise ValueError("Title must contain at least one letter or digit")
+
+    if _TITLE_SQL_RE.search(v) or ("=" in v and _TITLE_SQL_TAUTOLOGY_RE.search(v)):
+        raise ValueError("Title contains prohibited SQL patterns")
+
+    if _TITLE_UNSAFE_RE.search(v):
+        raise ValueError("Title contains unsafe content")
+
+    if _TITLE_PUNCTUATION_ONLY_RE.match(v):
+        raise ValueError("Title must contain meaningful text")
+
+    return v
+
+
+def _clean_link(v):
+    if isinstance(v, str):
+        v = v.strip()
+        if not v:
+            return None
+    return v
+
+
+def _normalize_link(v: Optional[str]) -> Optional[str]:
+    if not v:
+        return None
+
+    if v.lower().startswith(_LINK_DANGEROUS_SCHEMES):
+        raise ValueError("Dangerous URL scheme is not allowed")
+
+    if not v.startswith(("http://", "https://")):
+        raise ValueError("Link must start with http:// or https://")
+
+    try:
+        parsed = urlparse(v)
+        if not parsed.netloc:
+            raise ValueError("Link must contain a valid domain")
+
+        domain = parsed.netloc.lower()
+        if not _LINK_DOMAIN_RE.match(domain):
+            raise ValueError("Invalid domain format")
+
+        if _LINK_DANGEROUS_PATH_RE.search(parsed.path):
+            raise ValueError("URL path contains dangerous sequences")
+
+        if parsed.query and _LINK_UNSAFE_QUERY_RE.search(parsed.query.lower()):
+            raise ValueError("URL contains unsafe query parameters")
+
+        return urlunparse(
+            (
+                parsed.scheme,
+                parsed.netloc,
+                parsed.path,
+                parsed.params,
+                parsed.query,
+                "",
+            )
+        )
+
+    except ValueError as e:
+        raise e
+    except Exception as e:
+        raise ValueError(f"Invalid URL format: {str(e)}")
+
+
 class EntryBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     kind: EntryKind
@@ -30,123 +208,19 @@ class EntryBase(BaseModel):
 
     @validator("title", pre=True)
     def pre_validate_title(cls, v):
-        if isinstance(v, str):
-            v = v.strip()
-            v = re.sub(r'[<>{}`"\\]', "", v)
-        return v
+        return _clean_title(v)
 
     @validator("title")
     def validate_title_content(cls, v):
-        if not v or not v.strip():
-            raise ValueError("Title cannot be empty or whitespace only")
-
-        if not re.search(r"[a-zA-Zа-яА-Я0-9]", v):
-            raise ValueError("Title must contain at least one letter or digit")
-
-        sql_patterns = [
-            r"\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION)\b",
-            r"(\-\-|\;|\/\*|\*\/)",
-            r"\bWHERE\b.*\b1\s*=\s*1\b",
-            r"\bOR\b.*\b1\s*=\s*1\b",
-        ]
-
-        v_upper = v.upper()
-        for pattern in sql_patterns:
-            if re.search(pattern, v_upper, re.IGNORECASE):
-                raise ValueError("Title contains prohibited SQL patterns")
-
-        dangerous_patterns = [
-            r"<script",
-            r"</script>",
-            r"javascript:",
-            r"onload=",
-            r"onerror=",
-            r"onclick=",
-            r"vbscript:",
-            r"data:",
-            r"<iframe",
-            r"</iframe>",
-            r"<object",
-            r"</object>",
-            r"<embed",
-            r"</embed>",
-            r"<form",
-            r"</form>",
-            r"alert\(",
-            r"confirm\(",
-            r"prompt\(",
-            r"eval\(",
-            r"expression\(",
-        ]
-
-        for pattern in dangerous_patterns:
-            if re.search(pattern, v, re.IGNORECASE):
-                raise ValueError("Title contains unsafe content")
-
-        if re.match(r'^[!@#$%^&*()_+\-=\[\]{}|\\:;"<>,.?/~`]+$', v):
-            raise ValueError("Title must contain meaningful text")
-
-        return v
+        return _check_title_content(v)
 
     @validator("link", pre=True)
     def pre_validate_link(cls, v):
-        if isinstance(v, str):
-            v = v.strip()
-            if not v:
-                return None
-        return v
+        return _clean_link(v)
 
     @validator("link")
     def validate_and_normalize_link(cls, v):
-        if not v:
-            return None
-
-        dangerous_schemes = ["javascript:", "data:", "vbscript:", "file:", "ftp:"]
-        if any(v.lower().startswith(scheme) for scheme in dangerous_schemes):
-            raise ValueError("Dangerous URL scheme is not allowed")
-
-        if not v.startswith(("http://", "https://")):
-            raise ValueError("Link must start with http:// or https://")
-
-        try:
-            parsed = urlparse(v)
-            if not parsed.netloc:
-                raise ValueError("Link must contain a valid domain")
-
-            domain = parsed.netloc.lower()
-            if not re.match(r"^[a-z0-9]+([\-\.]{1}[a-z0-9]+)*\.[a-z]{2,}$", domain):
-                raise ValueError("Invalid domain format")
-
-            path = parsed.path
-            dangerous_path_patterns = [r"\.\.", r"\./", r"//", r"\\"]
-            for pattern in dangerous_path_patterns:
-                if re.search(pattern, path):
-                    raise ValueError("URL path contains dangerous sequences")
-
-            if parsed.query:
-                query_lower = parsed.query.lower()
-                dangerous_query_patterns = ["script", "javascript", "onload", "onerror"]
-                for pattern in dangerous_query_patterns:
-                    if pattern in query_lower:
-                        raise ValueError("URL contains unsafe query parameters")
-
-            normalized_url = urlunparse(
-                (
-                    parsed.scheme,
-                    parsed.netloc,
-                    parsed.path,
-                    parsed.params,
-                    parsed.query,
-                    "",
-                )
-            )
-
-            return normalized_url
-
-        except ValueError as e:
-            raise e
-        except Exception as e:
-            raise ValueError(f"Invalid URL format: {str(e)}")
+        return _normalize_link(v)
 
     @validator("kind", "status")
     def validate_enum_values(cls, v, field):
@@ -187,29 +261,22 @@ class EntryUpdate(BaseModel):
 
     @validator("title", pre=True)
     def pre_validate_title_update(cls, v):
-        if v is not None and isinstance(v, str):
-            v = v.strip()
-            v = re.sub(r'[<>{}`"\\]', "", v)
-        return v
+        return _clean_title(v)
 
     @validator("title")
     def validate_title_if_provided(cls, v):
         if v is not None:
-            return EntryBase.validate_title_content(v)
+            return _check_title_content(v)
         return v
 
     @validator("link", pre=True)
     def pre_validate_link_update(cls, v):
-        if v is not None and isinstance(v, str):
-            v = v.strip()
-            if not v:
-                return None
-        return v
+        return _clean_link(v)
 
     @validator("link")
     def validate_link_if_provided(cls, v):
         if v is not None:
-            return EntryBase.validate_and_normalize_link(v)
+            return _normalize_link(v)
         return v
 
     @root_validator
@@ -241,6 +308,207 @@ class EntryUpdate(BaseModel):
         return values
 
 
+# Пакетная проверка: каждое правило применяется ко всей колонке за один проход,
+# а по заголовкам, склеенным через разделитель, регулярки SQL/XSS проходят один
+# раз на пачку. Быстрый путь только отсеивает заведомо корректные значения;
+# всё подозрительное проверяется обычным EntryCreate, поэтому маска и тексты
+# ошибок совпадают с поштучной проверкой.
+_BATCH_SEPARATOR = "\x00"
+_TITLE_MAX_LENGTH = EntryBase.__fields__["title"].field_info.max_length
+_LINK_MAX_LENGTH = EntryBase.__fields__["link"].field_info.max_length
+# Ссылка, которую urlparse/urlunparse оставляют как есть, если не считать
+# фрагмента и пустого "?": домен по _LINK_DOMAIN_RE, без ";" параметров в пути.
+_LINK_PLAIN_RE = re.compile(
+    r"(?P<base>https?://(?i:[a-z0-9]+(?:[\-.][a-z0-9]+)*\.[a-z]{2,}))"
+    r"(?P<path>/[^?#; \\]*)?(?:\?(?P<query>[^# ]*))?(?:#[^ ]*)?",
+    re.ASCII,
+)
+_TITLE_SQL_UPPER_RE = re.compile(
+    _literal_alternation(_SQL_KEYWORDS + _SQL_COMMENT_TOKENS)
+)
+_TITLE_UNSAFE_UPPER_RE = re.compile(
+    _literal_alternation(token.upper() for token in _UNSAFE_TITLE_TOKENS)
+)
+# Члены str-enum хэшируются как их значения: словарь находит и "book", и
+# EntryKind.BOOK.
+_KINDS = {kind.value: kind for kind in EntryKind}
+_STATUSES = {status.value: status for status in EntryStatus}
+
+
+@dataclass
+class EntryBatchValidation:
+    accepted: List[bool]
+    # Ошибки в формате pydantic ValidationError.errors(), пустой список у принятых.
+    errors: List[List[Dict[str, Any]]]
+    titles: List[Optional[str]]
+    links: List[Optional[str]]
+    # Заполняется, если переданы kinds: готовые модели для принятых записей.
+    entries: List[Optional[EntryCreate]]
+
+    @property
+    def rejected(self) -> List[bool]:
+        return [not accepted for accepted in self.accepted]
+
+
+def _scan(texts: List[str], patterns) -> Set[int]:
+    # Один finditer на склеенную колонку; позиции переводятся в номера строк.
+    joined = _BATCH_SEPARATOR.join(texts)
+    starts = list(accumulate((len(v) + 1 for v in texts), initial=0))
+    return {
+        bisect_right(starts, match.start()) - 1
+        for pattern in patterns
+        for match in pattern.finditer(joined)
+    }
+
+
+def _plain_titles(titles: Sequence[Any]) -> Tuple[List[Optional[str]], Set[int]]:
+    if not titles:
+        return [], set()
+    suspects = {
+        i for i, v in enumerate(titles) if type(v) is not str or _BATCH_SEPARATOR in v
+    }
+    stripped = ("" if i in suspects else v.strip() for i, v in enumerate(titles))
+    joined = _TITLE_FORBIDDEN_CHARS_RE.sub("", _BATCH_SEPARATOR.join(stripped))
+    cleaned: List[Optional[str]] = joined.split(_BATCH_SEPARATOR)
+
+    meaningful = _TITLE_MEANINGFUL_RE.search
+    ascii_ids, other_ids = [], []
+    for i, v in enumerate(cleaned):
+        if not 0 < len(v) <= _TITLE_MAX_LENGTH or "=" in v or not meaningful(v):
+            suspects.add(i)
+        (ascii_ids if v.isascii() else other_ids).append(i)
+
+    # ASCII-заголовки сверяются в верхнем регистре литеральными деревьями без
+    # IGNORECASE: так re ищет по первому символу. Дерево SQL не знает границ
+    # слов, поэтому его находки ("UPDATED") перепроверяются _TITLE_SQL_RE.
+    upper = [cleaned[i].upper() for i in ascii_ids]
+    for hit in _scan(upper, [_TITLE_SQL_UPPER_RE]):
+        if _TITLE_SQL_RE.search(cleaned[ascii_ids[hit]]):
+            suspects.add(ascii_ids[hit])
+    suspects.update(ascii_ids[hit] for hit in _scan(upper, [_TITLE_UNSAFE_UPPER_RE]))
+    other = [cleaned[i] for i in other_ids]
+    suspects.update(
+        other_ids[hit] for hit in _scan(other, [_TITLE_SQL_RE, _TITLE_UNSAFE_RE])
+    )
+    return cleaned, suspects
+
+
+def _plain_links(links: Sequence[Any]) -> Tuple[List[Optional[str]], Set[int]]:
+    normalized: List[Optional[str]] = []
+    suspects = set()
+    plain = _LINK_PLAIN_RE.fullmatch
+    for i, v in enumerate(links):
+        if v is None:
+            normalized.append(None)
+            continue
+        if type(v) is str:
+            v = v.strip()
+            if not v:
+                normalized.append(None)
+                continue
+            match = None
+            if len(v) <= _LINK_MAX_LENGTH and v.isascii() and v.isprintable():
+                match = plain(v)
+            if match:
+                path, query = match["path"] or "", match["query"]
+                if not _LINK_DANGEROUS_PATH_RE.search(path) and not (
+                    query and _LINK_UNSAFE_QUERY_RE.search(query.lower())
+                ):
+                    normalized.append(
+                        match["base"] + path + ("?" + query if query else "")
+                    )
+                    continue
+        normalized.append(None)
+        suspects.add(i)
+    return normalized, suspects
+
+
+def _validate_entry(
+    fields: Dict[str, Any], full: bool
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    # Поштучный путь: весь EntryCreate или только переданные поля.
+    if full:
+        try:
+            return EntryCreate(**fields).dict(), []
+        except ValidationError as e:
+            return {}, e.errors()
+    values, errors = {}, []
+    for name, value in fields.items():
+        values[name], error = EntryCreate.__fields__[name].validate(
+            value, values, loc=name, cls=EntryCreate
+        )
+        if error:
+            errors.append(error)
+    return values, ValidationError(errors, EntryCreate).errors() if errors else []
+
+
+def validate_entry_batch(
+    titles: Sequence[Any],
+    links: Optional[Sequence[Any]] = None,
+    kinds: Optional[Sequence[Any]] = None,
+    statuses: Optional[Sequence[Any]] = None,
+) -> EntryBatchValidation:
+    # Колонки одной длины. Без kinds проверяются только title и link (правило
+    # "статья со ссылкой" требует kind); statuses по умолчанию planned.
+    size = len(titles)
+    links = [None] * size if links is None else links
+    full = kinds is not None
+    if full:
+        statuses = [EntryStatus.PLANNED] * size if statuses is None else statuses
+    columns = (links, kinds, statuses) if full else (links,)
+    if any(len(column) != size for column in columns):
+        raise ValueError("Batch columns must have the same length")
+
+    clean_titles, suspects = _plain_titles(titles)
+    clean_links, link_suspects = _plain_links(links)
+    suspects |= link_suspects
+    entry_kinds: List[Any] = [None] * size
+    entry_statuses: List[Any] = [None] * size
+    if full:
+        entry_kinds = [_KINDS.get(v) if isinstance(v, str) else None for v in kinds]
+        entry_statuses = [
+            _STATUSES.get(v) if isinstance(v, str) else None for v in statuses
+        ]
+        for i, (kind, status) in enumerate(zip(entry_kinds, entry_statuses)):
+            if kind is None or status is None:
+                suspects.add(i)
+            elif kind == EntryKind.ARTICLE and clean_links[i] is None:
+                suspects.add(i)
+
+    accepted = [True] * size
+    errors: List[List[Dict[str, Any]]] = [[] for _ in range(size)]
+    for i in sorted(suspects):
+        fields = {"title": titles[i], "link": links[i]}
+        if full:
+            fields.update(kind=kinds[i], status=statuses[i])
+        values, errors[i] = _validate_entry(fields, full)
+        accepted[i] = not errors[i]
+        clean_titles[i] = values.get("title")
+        clean_links[i] = values.get("link")
+        entry_kinds[i] = values.get("kind")
+        entry_statuses[i] = values.get("status")
+
+    entries: List[Optional[EntryCreate]] = [None] * size
+    if full:
+        entries = [
+            (
+                EntryCreate.construct(title=title, kind=kind, link=link, status=status)
+                if ok
+                else None
+            )
+            for ok, title, kind, link, status in zip(
+                accepted, clean_titles, entry_kinds, clean_links, entry_statuses
+            )
+        ]
+    return EntryBatchValidation(
+        accepted=accepted,
+        errors=errors,
+        titles=[v if ok else None for ok, v in zip(accepted, clean_titles)],
+        links=[v if ok else None for ok, v in zip(accepted, clean_links)],
+        entries=entries,
+    )
+
+
 class Entry(EntryBase):
     id: int
     owner_id: int
@@ -250,6 +518,126 @@ class Entry(EntryBase):
         use_enum_values = True
 
 
+@dataclass(frozen=True, slots=True)
+class EntryRecord:
+    # Строка entries, уже прошедшая валидацию при записи: читается без pydantic.
+    # version нужен для ETag и в тело ответа (to_dict) не входит.
+    id: int
+    owner_id: int
+    title: str
+    kind: str
+    link: Optional[str]
+    status: str
+    version: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "owner_id": self.owner_id,
+            "title": self.title,
+            "kind": self.kind,
+            "link": self.link,
+            "status": self.status,
+        }
+
+
 class EntryList(BaseModel):
     items: List[Entry]
     total: int
+    next_cursor: Optional[str] = None
+
+
+class EntrySuggestion(BaseModel):
+    id: int
+    title: str
+
+
+class EntrySuggestionList(BaseModel):
+    items: List[EntrySuggestion]
+
+
+class EntryStats(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    by_kind: Dict[str, int]
+
+
+class EntryImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class EntryImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: List[EntryImportError]
+    errors_truncated: bool
+
+
+class EntryDuplicateGroup(BaseModel):
+    items: List[Entry]
+
+
+class EntryDuplicateReport(BaseModel):
+    groups: List[EntryDuplicateGroup]
+    next_cursor: Optional[str] = None
+
+
+class EntryBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: EntryCreate
+
+    class Config:
+        extra = "forbid"
+
+
+class EntryBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: EntryUpdate
+
+    class Config:
+        extra = "forbid"
+
+
+class EntryBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+    class Config:
+        extra = "forbid"
+
+
+EntryBatchOperation = Annotated[
+    Union[EntryBatchCreate, EntryBatchUpdate, EntryBatchDelete],
+    Field(discriminator="op"),
+]
+
+MAX_BATCH_OPERATIONS = 5000
+
+
+class EntryBatchRequest(BaseModel):
+    operations: conlist(
+        EntryBatchOperation, min_items=1, max_items=MAX_BATCH_OPERATIONS
+    )
+
+    class Config:
+        extra = "forbid"
+
+
+class EntryBatchResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: Optional[int] = None
+    entry: Optional[Entry] = None
+    detail: Optional[str] = None
+
+
+class EntryBatchResponse(BaseModel):
+    results: List[EntryBatchResult]
+
+
+class EntryBulkResult(BaseModel):
+    affected: int
+    ids: List[int]
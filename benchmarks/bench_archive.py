@@ -0,0 +1,99 @@
+"""Списки до и после архивации завершённых записей.
+
+База, где большая часть строк — status=completed: до архивации они лежат в
+entries и попадают в каждый скан и фильтр get_all, после (archive_completed)
+в entries остаются только незавершённые. Замеряются фильтр по kind (скан по
+индексу владельца), страница с сортировкой по title и чтение по id архивной
+записи (read-through: после архивации id=1 лежит в архиве).
+
+Запуск: python -m benchmarks.bench_archive [--rows 100000] [--completed 0.9]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.repository import EntryRepository
+from app.domain.database_models import Base, EntryArchiveDB, EntryDB, utcnow
+
+
+def _seed(session, rows: int, completed: float) -> None:
+    cutoff = int(rows * completed)
+    session.execute(
+        insert(EntryDB),
+        [
+            {
+                "owner_id": 1,
+                "title": f"Designing Data-Intensive Applications, vol. {i}",
+                "kind": "article" if i % 2 else "book",
+                "link": f"https://example.com/articles/{i}",
+                "status": "completed" if i < cutoff else "planned",
+            }
+            for i in range(rows)
+        ],
+    )
+    session.commit()
+
+
+def _timed(call, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _measure(repository: EntryRepository) -> tuple:
+    return (
+        _timed(lambda: repository.get_all(kind="article")),
+        _timed(lambda: repository.get_page(limit=50, sort="title")),
+        _timed(lambda: repository.get_by_id(1), repeat=50),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--completed", type=float, default=0.9)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'archive.db'}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            repository = EntryRepository(session)
+            _seed(session, args.rows, args.completed)
+            before = _measure(repository)
+
+            started = time.perf_counter()
+            moved = 0
+            while True:
+                batch = repository.archive_completed(
+                    utcnow() + timedelta(days=1), limit=500
+                )
+                moved += sum(len(ids) for ids in batch.values())
+                if not batch:
+                    break
+            archived_in = time.perf_counter() - started
+            after = _measure(repository)
+            hot = session.execute(select(func.count()).select_from(EntryDB)).scalar()
+            cold = session.execute(
+                select(func.count()).select_from(EntryArchiveDB)
+            ).scalar()
+        engine.dispose()
+
+    print(f"archived {moved} rows in {archived_in:.1f} s: entries={hot} archive={cold}")
+    print(f"{'query':>22}{'before, ms':>12}{'after, ms':>11}")
+    labels = ("get_all(kind=article)", "get_page(sort=title)", "get_by_id(1)")
+    for label, was, now in zip(labels, before, after):
+        print(f"{label:>22}{was:>12.2f}{now:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
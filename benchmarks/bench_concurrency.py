@@ -0,0 +1,177 @@
+"""Задержка под конкурентной нагрузкой: синхронный Session против AsyncSession.
+
+Клиенты запрашивают страницу записей, проба раз в 5 мс дёргает /health, а
+отдельный клиент всё это время гоняет медленный отчёт (полный скан таблицы).
+Прежний путь (async def + синхронный Session) выполняет скан прямо в цикле
+событий, и его время добавляется ко всем запросам в полёте, включая /health.
+Через AsyncSession ввод-вывод уходит в поток aiosqlite. На десятках клиентов
+оба варианта упираются в CPU: клиент и сервер делят один процесс.
+
+Запуск: python -m benchmarks.bench_concurrency [--rows 200000] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.repository import AsyncEntryRepository, EntryRepository
+from app.domain.database_models import Base, EntryDB
+
+CLIENTS = (1, 4, 16, 64)
+THINK_TIME = 0.01
+HEALTH_INTERVAL = 0.005
+
+# Поиск подстроки с ведущим % не использует индекс: SQLite сканирует всю таблицу.
+SLOW_REPORT = select(func.count()).where(EntryDB.title.like("%vol. 9%"))
+
+
+def _seed(engine, rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.execute(
+            insert(EntryDB),
+            [
+                {
+                    "owner_id": 1,
+                    "title": f"Designing Data-Intensive Applications, vol. {i}",
+                    "kind": "article" if i % 2 else "book",
+                    "link": f"https://example.com/articles/{i}?ref=list",
+                    "status": ("planned", "reading", "completed")[i % 3],
+                }
+                for i in range(rows)
+            ],
+        )
+        session.commit()
+
+
+def _build_app(db_path: Path) -> FastAPI:
+    # Пул не меньше числа клиентов, чтобы сравнивать ожидание цикла событий,
+    # а не ожидание свободного соединения.
+    pool = {"pool_size": max(CLIENTS) + 1, "max_overflow": 0}
+    sync_engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}, **pool
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", **pool)
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSession = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    def get_sync_db():
+        with SyncSession() as db:
+            yield db
+
+    async def get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/entries")
+    async def sync_entries(db=Depends(get_sync_db)):
+        records, _ = EntryRepository(db).get_page(status="reading", limit=50)
+        return JSONResponse([record.to_dict() for record in records])
+
+    @app.get("/sync/report")
+    async def sync_report(db=Depends(get_sync_db)):
+        return {"matches": db.execute(SLOW_REPORT).scalar_one()}
+
+    @app.get("/async/entries")
+    async def async_entries(db=Depends(get_async_db)):
+        records, _ = await AsyncEntryRepository(db).get_page(status="reading", limit=50)
+        return JSONResponse([record.to_dict() for record in records])
+
+    @app.get("/async/report")
+    async def async_report(db=Depends(get_async_db)):
+        return {"matches": (await db.execute(SLOW_REPORT)).scalar_one()}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.state.engines = (sync_engine, async_engine)
+    return app
+
+
+async def _paced(http, path: str, interval: float, samples, done) -> None:
+    # Задержка считается от момента, когда запрос должен был уйти: время, пока
+    # цикл событий занят чужим запросом, входит в замер.
+    while not done.is_set():
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        response = await http.get(path)
+        samples.append(time.perf_counter() - scheduled)
+        assert response.status_code == 200
+
+
+async def _client(http, label: str, requests: int, entries) -> None:
+    for _ in range(requests):
+        scheduled = time.perf_counter() + THINK_TIME
+        await asyncio.sleep(THINK_TIME)
+        response = await http.get(f"/{label}/entries")
+        entries.append(time.perf_counter() - scheduled)
+        assert response.status_code == 200
+
+
+async def _reporter(http, label: str, done: asyncio.Event) -> None:
+    while not done.is_set():
+        response = await http.get(f"/{label}/report")
+        assert response.status_code == 200
+
+
+async def _run(app: FastAPI, label: str, clients: int, requests: int):
+    entries, health = [], []
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        background = [
+            asyncio.create_task(_reporter(http, label, done)),
+            asyncio.create_task(_paced(http, "/health", HEALTH_INTERVAL, health, done)),
+        ]
+        await asyncio.gather(
+            *(_client(http, label, requests, entries) for _ in range(clients))
+        )
+        done.set()
+        await asyncio.gather(*background)
+    return entries, health
+
+
+def _p95(samples) -> float:
+    return statistics.quantiles(samples, n=20)[-1] * 1000
+
+
+async def _report(app: FastAPI, requests: int) -> None:
+    print(f"{'path':<8}{'clients':>8}{'list p95, ms':>15}{'health p95, ms':>17}")
+    for label in ("sync", "async"):
+        for clients in CLIENTS:
+            entries, health = await _run(app, label, clients, requests)
+            print(f"{label:<8}{clients:>8}{_p95(entries):>15.1f}{_p95(health):>17.1f}")
+    await app.state.engines[1].dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        _seed(create_engine(f"sqlite:///{db_path}"), args.rows)
+        app = _build_app(db_path)
+
+        print(f"rows={args.rows} requests/client={args.requests}")
+        asyncio.run(_report(app, args.requests))
+        app.state.engines[0].dispose()
+
+
+if __name__ == "__main__":
+    main()
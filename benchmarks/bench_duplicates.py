@@ -0,0 +1,122 @@
+"""Поиск похожих названий: OR по всем триграммам с bm25 против префиксного фильтра.
+
+Названия собираются из словаря с распределением Ципфа: частые слова дают
+триграммы, которые есть в заметной доле строк. Старый запрос (OR по всем
+триграммам названия, сортировка по bm25) читает их списки документов целиком;
+новый (find_duplicates) берёт OR по нескольким самым редким триграммам и
+проверяет кандидатов точно. Для каждого названия печатается время обоих и
+нашлась ли заранее вставленная почти-копия.
+
+Запуск: python -m benchmarks.bench_duplicates [--rows 200000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from itertools import accumulate
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert, literal_column, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.duplicates import (
+    MAX_TITLE_CANDIDATES,
+    TITLE_SIMILARITY,
+    query_trigrams,
+    title_similarity,
+    trigram_query,
+)
+from app.core.repository import ENTRIES_TRIGRAMS, EntryRepository
+from app.domain.database_models import Base, EntryDB
+
+# Искомое название и его почти-копия, заранее вставленная в базу.
+QUERIES = (
+    ("Designing Data-Intensive Applications", "designing data intensive application"),
+    ("The Art of Computer Programming", "The Art of Computer Programing"),
+    ("Introduction to the Theory of Computation", "Intro to the Theory of Computation"),
+    ("Python Data Guide", "python data guide"),
+)
+
+
+def _vocabulary(rng: random.Random, size: int = 20_000) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        for _ in range(size)
+    ]
+
+
+def _seed(session, rows: int) -> None:
+    rng = random.Random(42)
+    common = "the of and to in a for on with data python introduction guide".split()
+    words = common + _vocabulary(rng)
+    weights = list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    titles = [
+        " ".join(rng.choices(words, cum_weights=weights, k=rng.randint(2, 7))).title()
+        for _ in range(rows)
+    ]
+    titles.extend(copy for _, copy in QUERIES)
+    session.execute(
+        insert(EntryDB),
+        [
+            {"owner_id": 1, "title": title, "kind": "book", "status": "planned"}
+            for title in titles
+        ],
+    )
+    session.commit()
+
+
+def _bm25(session, title: str) -> list:
+    trigrams = literal_column(ENTRIES_TRIGRAMS.name)
+    stmt = (
+        select(EntryDB.id, EntryDB.title)
+        .select_from(ENTRIES_TRIGRAMS)
+        .join(EntryDB, EntryDB.id == ENTRIES_TRIGRAMS.c.rowid)
+        .where(
+            EntryDB.owner_id == 1,
+            trigrams.op("MATCH")(trigram_query(query_trigrams(title))),
+        )
+        .order_by(func.bm25(trigrams))
+        .limit(MAX_TITLE_CANDIDATES)
+    )
+    return [
+        row.title
+        for row in session.execute(stmt)
+        if title_similarity(title, row.title) >= TITLE_SIMILARITY
+    ]
+
+
+def _timed(call, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'duplicates.db'}")
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            _seed(session, args.rows)
+            repository = EntryRepository(session)
+
+            print(f"{'title':>42}{'bm25, ms':>10}{'prefix, ms':>12}{'found':>8}")
+            for title, copy in QUERIES:
+                old, old_found = _timed(lambda: _bm25(session, title))
+                new, matches = _timed(lambda: repository.find_duplicates(title))
+                found = copy in {match.record.title for match in matches}
+                marks = f"{copy in old_found:d}/{found:d}"
+                print(f"{title:>42}{old:>10.2f}{new:>12.2f}{marks:>8}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Пропускная способность записи: COMMIT на запрос против групповой фиксации.
+
+Клиенты — конкурентные корутины, каждая создаёт записи по одной и ждёт
+ответа, как POST /api/v1/entries. Поштучный путь — прежний: своя сессия и
+свой COMMIT на каждую запись. Групповой — GroupCommitWriter: запросы за окно
+собираются в одну транзакцию. Замер для обоих профилей SQLite.
+
+Запуск: python -m benchmarks.bench_group_commit [--clients 1 16 64] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import create_engines
+from app.core.group_commit import GroupCommitWriter
+from app.core.repository import AsyncEntryRepository
+from app.domain.database_models import Base
+from app.domain.models import EntryCreate
+
+
+def _entries(requests: int) -> list:
+    return [
+        EntryCreate(
+            title=f"Designing Data-Intensive Applications, vol. {i}", kind="book"
+        )
+        for i in range(requests)
+    ]
+
+
+async def _drive(clients: int, entries: list, create) -> float:
+    queue = iter(entries)
+
+    async def client() -> None:
+        for entry in queue:
+            await create(entry)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return time.perf_counter() - started
+
+
+async def _measure(url: str, profile: str, clients: int, entries: list) -> tuple:
+    engine, _ = create_engines(url, profile, async_=True, echo=False)
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def per_request(entry):
+        async with sessions() as session:
+            return await AsyncEntryRepository(session).create(entry)
+
+    writer = GroupCommitWriter(engine=engine)
+    half = len(entries) // 2
+    single = await _drive(clients, entries[:half], per_request)
+    grouped = await _drive(clients, entries[half:], writer.create)
+    await writer.stop()
+    await engine.dispose()
+    return half / single, (len(entries) - half) / grouped, writer.commits
+
+
+def _prepare(path: Path, profile: str) -> str:
+    url = f"sqlite:///{path}"
+    engine, _ = create_engines(url, profile, echo=False)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return url.replace("sqlite://", "sqlite+aiosqlite://")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<12}{'clients':>8}{'per-request/s':>15}{'grouped/s':>11}"
+        f"{'speedup':>9}{'commits':>9}"
+    )
+    for profile in ("default", "production"):
+        for clients in args.clients:
+            with tempfile.TemporaryDirectory() as tmp:
+                url = _prepare(Path(tmp) / "bench.db", profile)
+                single, grouped, commits = asyncio.run(
+                    _measure(url, profile, clients, _entries(args.requests * 2))
+                )
+            print(
+                f"{profile:<12}{clients:>8}{single:>15.0f}{grouped:>11.0f}"
+                f"{grouped / single:>8.1f}x{commits:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Сравнение пути чтения списка: pydantic Entry + response_model против EntryRecord.
+
+Запуск: python -m benchmarks.bench_read_path [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.repository import EntryRepository
+from app.domain.database_models import Base, EntryDB
+from app.domain.models import Entry
+
+
+def _seed(session, rows: int) -> None:
+    session.execute(
+        insert(EntryDB),
+        [
+            {
+                "owner_id": 1,
+                "title": f"Designing Data-Intensive Applications, vol. {i}",
+                "kind": "article" if i % 2 else "book",
+                "link": f"https://example.com/articles/{i}?ref=list",
+                "status": "planned",
+            }
+            for i in range(rows)
+        ],
+    )
+    session.commit()
+
+
+def legacy_path(session) -> bytes:
+    # Прежний путь: ORM-объекты -> Entry(EntryBase) -> повторная валидация
+    # response_model=List[Entry] -> jsonable_encoder -> json.
+    db_entries = session.execute(select(EntryDB)).scalars().all()
+    entries = [
+        Entry(
+            id=e.id,
+            owner_id=e.owner_id,
+            title=e.title,
+            kind=e.kind,
+            link=e.link,
+            status=e.status,
+        )
+        for e in db_entries
+    ]
+    validated = [Entry.validate(entry.dict()) for entry in entries]
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def trusted_path(session) -> bytes:
+    records = EntryRepository(session).get_all()
+    return json.dumps([record.to_dict() for record in records]).encode()
+
+
+def _best_of(fn, session, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        session.expire_all()
+        started = time.perf_counter()
+        fn(session)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        _seed(session, args.rows)
+
+        assert json.loads(legacy_path(session)) == json.loads(trusted_path(session))
+
+        legacy = _best_of(legacy_path, session, args.repeat)
+        trusted = _best_of(trusted_path, session, args.repeat)
+
+        print(f"rows={args.rows}")
+        print(f"legacy  (Entry + response_model): {legacy * 1000:8.1f} ms")
+        print(f"trusted (EntryRecord -> JSON):    {trusted * 1000:8.1f} ms")
+        print(f"speedup: x{legacy / trusted:.1f}")
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Пропускная способность записи в зависимости от числа шардов.
+
+Каждый писатель — отдельный процесс (как рабочие процессы API) и отдельный
+владелец; он пишет записи по одной (create, одна транзакция на запись) через
+сессии ShardRouter. Владельцы подобраны так, чтобы поровну лечь на шарды.
+В одном файле SQLite писатель один, поэтому с ростом числа шардов COMMIT-ы
+(и fsync) разных владельцев идут параллельно, а не в очередь за блокировкой.
+
+Запуск: python -m benchmarks.bench_sharding [--shards 1 2 4] [--writers 8]
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.database import ShardRouter
+from app.core.repository import EntryRepository
+from app.domain.database_models import Base
+from app.domain.models import EntryCreate, EntryKind
+
+
+def _owners(router: ShardRouter, count: int) -> list:
+    # Первые владельцы каждого шарда по кругу: нагрузка делится поровну.
+    by_shard = {name: [] for name in router.shards}
+    owner_id = 0
+    while sum(len(owners) for owners in by_shard.values()) < count:
+        owner_id += 1
+        owners = by_shard[router.shard_for(owner_id)]
+        if len(owners) < -(-count // len(by_shard)):
+            owners.append(owner_id)
+    return [owner for owners in zip(*by_shard.values()) for owner in owners][:count]
+
+
+def _router(shards: dict, profile: str) -> ShardRouter:
+    return ShardRouter(shards, profile=profile, echo=False)
+
+
+def _writer(shards: dict, profile: str, owner_id: int, writes: int) -> None:
+    router = _router(shards, profile)
+    entry = EntryCreate(
+        title="Designing Data-Intensive Applications", kind=EntryKind.BOOK
+    )
+    for _ in range(writes):
+        with router.session(owner_id) as db:
+            EntryRepository(db).create(entry, owner_id)
+    router.dispose()
+
+
+def measure(tmp: Path, shards: int, writers: int, writes: int, profile: str) -> float:
+    shard_map = {
+        f"s{i}": f"sqlite:///{tmp / f'{shards}-s{i}.db'}" for i in range(shards)
+    }
+    router = _router(shard_map, profile)
+    for bind in router.writers():
+        Base.metadata.create_all(bind=bind)
+    owners = _owners(router, writers)
+    router.dispose()
+
+    with ProcessPoolExecutor(writers) as pool:
+        # Прогрев: процессы пула запускаются и импортируют приложение до замера.
+        list(pool.map(time.sleep, [0.1] * writers))
+        started = time.perf_counter()
+        jobs = [pool.submit(_writer, shard_map, profile, o, writes) for o in owners]
+        for job in jobs:
+            job.result()
+        elapsed = time.perf_counter() - started
+    return writers * writes / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument(
+        "--profile", choices=["default", "production"], default="default"
+    )
+    args = parser.parse_args()
+
+    print(f"{'shards':>7}{'writes/s':>11}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        base = None
+        for shards in args.shards:
+            rate = measure(Path(tmp), shards, args.writers, args.writes, args.profile)
+            base = base or rate
+            print(f"{shards:>7}{rate:>11.0f}{rate / base:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Смешанная нагрузка чтение/запись: профиль default против production.
+
+default — один пул и журнал отката SQLite, как раньше: писатель на время
+фиксации блокирует всех читателей. production — WAL, synchronous=NORMAL,
+mmap/cache_size, отдельные пулы читателей (query_only) и писателя.
+
+Потоки-читатели листают страницу списка и читают запись по id, потоки-
+писатели создают записи по одной (транзакция на запись). Считаются операции
+в секунду и ошибки "database is locked".
+
+Запуск: python -m benchmarks.bench_sqlite_concurrency [--readers 8] [--writers 2]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import create_engines
+from app.core.repository import EntryRepository
+from app.domain.database_models import Base, EntryDB
+from app.domain.models import EntryCreate
+
+SEED_ROWS = 10_000
+
+
+def _seed(url: str) -> None:
+    writer, _ = create_engines(url, "default", echo=False)
+    Base.metadata.create_all(bind=writer)
+    with sessionmaker(bind=writer)() as session:
+        session.execute(
+            insert(EntryDB),
+            [
+                {
+                    "owner_id": 1,
+                    "title": f"Designing Data-Intensive Applications, vol. {i}",
+                    "kind": "book",
+                    "status": "planned",
+                }
+                for i in range(SEED_ROWS)
+            ],
+        )
+        session.commit()
+    writer.dispose()
+
+
+def _run(url: str, profile: str, readers: int, writers: int, seconds: float) -> dict:
+    writer, reader = create_engines(url, profile, echo=False)
+    write_session = sessionmaker(bind=writer)
+    read_session = sessionmaker(bind=reader)
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def count(key: str) -> None:
+        with lock:
+            counts[key] += 1
+
+    def read_loop(worker: int) -> None:
+        entry_id = worker
+        while time.perf_counter() < stop:
+            try:
+                with read_session() as session:
+                    repository = EntryRepository(session)
+                    repository.get_page(limit=20, status="planned")
+                    repository.get_by_id(entry_id % SEED_ROWS + 1)
+                count("reads")
+            except OperationalError:
+                count("locked")
+            entry_id += 97
+
+    def write_loop(worker: int) -> None:
+        number = 0
+        while time.perf_counter() < stop:
+            entry = EntryCreate(title=f"Writer {worker} entry {number}", kind="book")
+            try:
+                with write_session() as session:
+                    EntryRepository(session).create(entry)
+                count("writes")
+            except OperationalError:
+                count("locked")
+            number += 1
+
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=write_loop, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.dispose()
+    reader.dispose()
+    return {key: value / seconds for key, value in counts.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'reads/s':>10}{'writes/s':>10}{'locked/s':>10}")
+    for profile in ("default", "production"):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+            _seed(url)
+            rates = _run(url, profile, args.readers, args.writers, args.seconds)
+        print(
+            f"{profile:<12}{rates['reads']:>10.0f}{rates['writes']:>10.0f}"
+            f"{rates['locked']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
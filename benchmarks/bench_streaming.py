@@ -0,0 +1,100 @@
+"""Память и первый байт списка: буферизованный JSONResponse против потока.
+
+Буферизованный путь повторяет прежний ответ: get_all -> список dict ->
+JSONResponse собирает всё тело. Потоковый — stream_all (yield_per) и
+entry_list_json, как GET /api/v1/entries?stream=true. Пик памяти меряется
+tracemalloc, время первого байта — от начала запроса до первой части тела.
+
+Запуск: python -m benchmarks.bench_streaming [--rows 1000 100000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.repository import AsyncEntryRepository
+from app.core.streaming import entry_list_json
+from app.domain.database_models import Base, EntryDB
+
+
+def _seed(db_path: Path, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.execute(
+            insert(EntryDB),
+            [
+                {
+                    "owner_id": 1,
+                    "title": f"Designing Data-Intensive Applications, vol. {i}",
+                    "kind": "article" if i % 2 else "book",
+                    "link": f"https://example.com/articles/{i}?ref=list",
+                    "status": "planned",
+                }
+                for i in range(rows)
+            ],
+        )
+        session.commit()
+    engine.dispose()
+
+
+async def buffered(session) -> float:
+    records = await AsyncEntryRepository(session).get_all()
+    body = JSONResponse(
+        {
+            "items": [record.to_dict() for record in records],
+            "total": len(records),
+            "next_cursor": None,
+        }
+    ).body
+    first_byte = time.perf_counter()
+    del body
+    return first_byte
+
+
+async def streamed(session) -> float:
+    first_byte = None
+    batches = AsyncEntryRepository(session).stream_all()
+    async for _ in entry_list_json(batches):
+        first_byte = first_byte or time.perf_counter()
+    return first_byte
+
+
+async def _measure(db_path: Path, path) -> tuple:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with async_sessionmaker(bind=engine)() as session:
+        tracemalloc.start()
+        started = time.perf_counter()
+        first_byte = await path(session)
+        total = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    await engine.dispose()
+    return peak / 2**20, (first_byte - started) * 1000, total * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'path':>10}{'peak, MiB':>12}{'TTFB, ms':>11}{'total, ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            db_path = Path(tmp) / f"bench-{rows}.db"
+            _seed(db_path, rows)
+            for label, path in (("buffered", buffered), ("streamed", streamed)):
+                peak, ttfb, total = asyncio.run(_measure(db_path, path))
+                print(f"{rows:>8}{label:>10}{peak:>12.1f}{ttfb:>11.1f}{total:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Стоимость проверки одного title: прежний цикл re.search против скомпилированных
+правил из app.domain.models.
+
+Запуск: python -m benchmarks.bench_validation [--number 20000]
+"""
+
+import argparse
+import re
+import timeit
+
+from app.domain.models import _check_title_content, _clean_title
+
+LEGACY_SQL_PATTERNS = [
+    r"\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION)\b",
+    r"(\-\-|\;|\/\*|\*\/)",
+    r"\bWHERE\b.*\b1\s*=\s*1\b",
+    r"\bOR\b.*\b1\s*=\s*1\b",
+]
+LEGACY_DANGEROUS_PATTERNS = [
+    r"<script",
+    r"</script>",
+    r"javascript:",
+    r"onload=",
+    r"onerror=",
+    r"onclick=",
+    r"vbscript:",
+    r"data:",
+    r"<iframe",
+    r"</iframe>",
+    r"<object",
+    r"</object>",
+    r"<embed",
+    r"</embed>",
+    r"<form",
+    r"</form>",
+    r"alert\(",
+    r"confirm\(",
+    r"prompt\(",
+    r"eval\(",
+    r"expression\(",
+]
+
+INPUTS = {
+    "typical": "Designing Data-Intensive Applications, 2nd edition",
+    "typical_cyrillic": "Совершенный код. Практическое руководство",
+    "late_unsafe": "A long and perfectly ordinary title that ends with alert(",
+    "or_flood": ("or " * 66).strip(),
+    "keyword_near_miss": "selected inserts updated deleted dropped created " * 3,
+    "max_length": "x" * 200,
+}
+
+
+def legacy_check(v: str) -> bool:
+    v = v.strip()
+    v = re.sub(r'[<>{}`"\\]', "", v)
+    if not v or not v.strip():
+        return False
+    if not re.search(r"[a-zA-Zа-яА-Я0-9]", v):
+        return False
+    v_upper = v.upper()
+    for pattern in LEGACY_SQL_PATTERNS:
+        if re.search(pattern, v_upper, re.IGNORECASE):
+            return False
+    for pattern in LEGACY_DANGEROUS_PATTERNS:
+        if re.search(pattern, v, re.IGNORECASE):
+            return False
+    if re.match(r'^[!@#$%^&*()_+\-=\[\]{}|\\:;"<>,.?/~`]+$', v):
+        return False
+    return True
+
+
+def compiled_check(v: str) -> bool:
+    try:
+        _check_title_content(_clean_title(v))
+    except ValueError:
+        return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'input':<20}{'legacy, us':>12}{'compiled, us':>14}{'speedup':>9}")
+    for name, title in INPUTS.items():
+        title = title[:200]
+        assert legacy_check(title) == compiled_check(title), name
+        legacy = min(
+            timeit.repeat(lambda: legacy_check(title), number=args.number, repeat=3)
+        )
+        compiled = min(
+            timeit.repeat(lambda: compiled_check(title), number=args.number, repeat=3)
+        )
+        legacy_us = legacy / args.number * 1e6
+        compiled_us = compiled / args.number * 1e6
+        print(
+            f"{name:<20}{legacy_us:>12.2f}{compiled_us:>14.2f}"
+            f"{legacy_us / compiled_us:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
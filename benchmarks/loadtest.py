@@ -0,0 +1,369 @@
+"""Нагрузочный тест NFR-06 и NFR-12 (docs/security-nfr/NFR.md) в одном процессе.
+
+app.main:app вызывается через httpx.ASGITransport, без сервера и внешних
+сервисов. Нагрузка открытая: запросы уходят по расписанию с постоянной
+частотой, не дожидаясь ответов на предыдущие, а задержка считается от
+запланированного момента отправки. Медленный ответ не откладывает следующие
+запросы, поэтому в замер не закрадывается coordinated omission.
+
+Сценарии:
+- NFR-06: только GET /entries с частотой 20 RPS, p95 <= 200 мс;
+- NFR-12: смесь create/list/get/update/delete/upload (--mix), p95 <= 500 мс
+  для каждого маршрута.
+Задержки копятся в HDR-гистограммах (логарифмически-линейные корзины,
+погрешность < 1%) по маршрутам. База — временный файл SQLite, каталог
+загрузок — временный, лимиты запросов на время прогона выключены: они
+проверяются своими тестами. Клиент и приложение делят один цикл событий,
+так что замер включает и клиентскую часть — оценка сверху.
+
+Код выхода 1, если порог нарушен или были ответы 5xx. Короткий прогон есть и
+в tests/test_nfr.py, но только с RUN_LOAD_TESTS=1: в обычном наборе тестов
+пороги по времени на общих машинах CI дают ложные падения.
+
+Запуск: python -m benchmarks.loadtest [--duration 10] [--rate 20]
+        [--mix list=40,get=25,create=15,update=10,delete=5,upload=5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("TESTING", "true")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+
+from app.api.endpoints import uploads  # noqa: E402
+from app.core.cache import get_entry_cache  # noqa: E402
+from app.core.database import (  # noqa: E402
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    async_database_url,
+    create_engines,
+    get_async_db,
+    get_async_read_db,
+)
+from app.core.security import limiter  # noqa: E402
+from app.core.suggest import get_suggest_index  # noqa: E402
+from app.domain.database_models import Base  # noqa: E402
+from app.main import app  # noqa: E402
+
+# Пороги из docs/security-nfr/NFR.md, секунды.
+NFR_06_P95 = 0.200
+NFR_06_RATE = 20.0
+NFR_12_P95 = 0.500
+
+DEFAULT_MIX = {
+    "list": 40,
+    "get": 25,
+    "create": 15,
+    "update": 10,
+    "delete": 5,
+    "upload": 5,
+}
+# Операция смеси -> маршрут в отчёте.
+ROUTES = {
+    "list": "GET /entries",
+    "get": "GET /entries/{id}",
+    "create": "POST /entries",
+    "update": "PUT /entries/{id}",
+    "delete": "DELETE /entries/{id}",
+    "upload": "POST /uploads/upload",
+}
+SEED_ENTRIES = 200
+# Корзина гистограммы покрывает 1/2^HISTOGRAM_SUB_BITS своего диапазона.
+HISTOGRAM_SUB_BITS = 7
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 256
+
+
+class LatencyHistogram:
+    # HDR-гистограмма в микросекундах: значения до 2^(S+1) хранятся точно,
+    # дальше каждая степень двойки делится на 2^S линейных корзин. Память не
+    # зависит от числа замеров, перцентили берутся по верхней границе корзины.
+    def __init__(self, sub_bits: int = HISTOGRAM_SUB_BITS):
+        self.sub_bits = sub_bits
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.max = 0
+
+    def record(self, seconds: float) -> None:
+        value = max(1, round(seconds * 1_000_000))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        # Секунды; не больше максимума, чтобы граница корзины не завышала хвост.
+        if not self.total:
+            return 0.0
+        rank = max(1, -(-self.total * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.sub_bits - 1)
+        return (shift << self.sub_bits) + (value >> shift)
+
+    def _highest(self, index: int) -> int:
+        shift = max(0, (index >> self.sub_bits) - 1)
+        mantissa = index - (shift << self.sub_bits)
+        return ((mantissa + 1) << shift) - 1
+
+
+@dataclass
+class RouteStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items() if status >= 500)
+
+
+@dataclass
+class LoadReport:
+    rate: float
+    duration: float
+    routes: Dict[str, RouteStats] = field(default_factory=dict)
+    # Насколько отправка отставала от расписания (перегружен сам генератор).
+    max_lag: float = 0.0
+
+    def record(self, route: str, status: int, seconds: float) -> None:
+        stats = self.routes.setdefault(route, RouteStats())
+        stats.latency.record(seconds)
+        stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def violations(
+        self, p95_limit: float, routes: Optional[List[str]] = None
+    ) -> List[str]:
+        problems = []
+        for route in routes or sorted(self.routes):
+            stats = self.routes.get(route)
+            if stats is None:
+                problems.append(f"{route}: no requests")
+                continue
+            p95 = stats.latency.percentile(95)
+            if p95 > p95_limit:
+                problems.append(
+                    f"{route}: p95 {p95 * 1000:.1f} ms > {p95_limit * 1000:.0f} ms"
+                )
+            if stats.errors:
+                problems.append(f"{route}: {stats.errors} responses with 5xx")
+        return problems
+
+    def format(self) -> str:
+        lines = [
+            f"{self.rate:g} RPS x {self.duration:g} s, max send lag {self.max_lag * 1000:.1f} ms",
+            f"{'route':>26}{'count':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  statuses",
+        ]
+        for route, stats in sorted(self.routes.items()):
+            latency = stats.latency
+            ms = [latency.percentile(p) * 1000 for p in (50, 95, 99, 100)]
+            statuses = " ".join(f"{s}:{c}" for s, c in sorted(stats.statuses.items()))
+            lines.append(
+                f"{route:>26}{latency.total:>7}"
+                + "".join(f"{value:>8.1f}" for value in ms)
+                + f"  {statuses}"
+            )
+        return "\n".join(lines)
+
+
+class Traffic:
+    # Запросы смеси. id для get/update/delete берутся из записей, созданных
+    # при подготовке и самим create; delete их расходует.
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.ids: List[int] = []
+        self.sequence = 0
+
+    async def seed(self, count: int) -> None:
+        for _ in range(count):
+            await self.create()
+
+    async def list(self) -> httpx.Response:
+        return await self.client.get("/api/v1/entries/", params={"limit": 50})
+
+    async def get(self) -> httpx.Response:
+        entry_id = self._pick()
+        return await self.client.get(f"/api/v1/entries/{entry_id}")
+
+    async def create(self) -> httpx.Response:
+        self.sequence += 1
+        response = await self.client.post(
+            "/api/v1/entries/",
+            json={
+                "title": f"Load test entry {self.sequence}",
+                "kind": self.rng.choice(("book", "article")),
+                "link": f"https://example.com/load/{self.sequence}",
+                "status": "planned",
+            },
+        )
+        if response.status_code == 201:
+            self.ids.append(response.json()["id"])
+        return response
+
+    async def update(self) -> httpx.Response:
+        entry_id = self._pick()
+        status = self.rng.choice(("planned", "reading", "completed"))
+        return await self.client.put(
+            f"/api/v1/entries/{entry_id}", json={"status": status}
+        )
+
+    async def delete(self) -> httpx.Response:
+        entry_id = self.ids.pop(self.rng.randrange(len(self.ids))) if self.ids else 0
+        return await self.client.delete(f"/api/v1/entries/{entry_id}")
+
+    async def upload(self) -> httpx.Response:
+        files = {"file": ("cover.png", PNG, "image/png")}
+        return await self.client.post("/api/v1/uploads/upload", files=files)
+
+    def _pick(self) -> int:
+        return self.rng.choice(self.ids) if self.ids else 0
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX or not weight.isdigit():
+            raise ValueError(f"Bad mix item: {part!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+@asynccontextmanager
+async def isolated_app(directory: Path) -> AsyncIterator[None]:
+    # Приложение пишет во временную базу и каталог, без лимитов запросов.
+    url = f"sqlite:///{directory / 'loadtest.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    writer, reader = create_engines(async_database_url(url), async_=True, echo=False)
+
+    async def writer_db():
+        async with AsyncSessionLocal(bind=writer) as db:
+            yield db
+
+    async def reader_db():
+        async with AsyncReadSessionLocal(bind=reader) as db:
+            yield db
+
+    overrides = {get_async_db: writer_db, get_async_read_db: reader_db}
+    app.dependency_overrides.update(overrides)
+    limiter_enabled, upload_dir = limiter.enabled, uploads.UPLOAD_DIR
+    limiter.enabled, uploads.UPLOAD_DIR = False, str(directory)
+    get_entry_cache().clear()
+    get_suggest_index().clear()
+    try:
+        yield
+    finally:
+        for dependency in overrides:
+            app.dependency_overrides.pop(dependency, None)
+        limiter.enabled, uploads.UPLOAD_DIR = limiter_enabled, upload_dir
+        get_entry_cache().clear()
+        get_suggest_index().clear()
+        await writer.dispose()
+        await reader.dispose()
+
+
+async def run_load(
+    directory: Path,
+    rate: float,
+    duration: float,
+    mix: Dict[str, int],
+    seed_entries: int = SEED_ENTRIES,
+    seed: int = 0,
+) -> LoadReport:
+    # Открытая нагрузка: i-й запрос запланирован на start + i / rate и
+    # отправляется отдельной задачей, задержка — от запланированного момента.
+    report = LoadReport(rate, duration)
+    rng = random.Random(seed)
+    transport = httpx.ASGITransport(app=app)
+    async with isolated_app(directory), httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest"
+    ) as client:
+        traffic = Traffic(client, rng)
+        await traffic.seed(seed_entries)
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        operations: Dict[str, Callable[[], Awaitable[httpx.Response]]] = {
+            name: getattr(traffic, name) for name in names
+        }
+
+        async def fire(name: str, scheduled: float) -> None:
+            try:
+                status = (await operations[name]()).status_code
+            except Exception:
+                # Исключение из приложения засчитывается как ответ 500.
+                status = 500
+            report.record(ROUTES[name], status, time.perf_counter() - scheduled)
+
+        tasks = []
+        start = time.perf_counter()
+        for i in range(int(rate * duration)):
+            scheduled = start + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            report.max_lag = max(report.max_lag, time.perf_counter() - scheduled)
+            name = rng.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(fire(name, scheduled)))
+        await asyncio.gather(*tasks)
+    return report
+
+
+def check_nfr(
+    duration: float, rate: float = NFR_06_RATE, mix: Optional[Dict[str, int]] = None
+) -> Tuple[List[LoadReport], List[str]]:
+    # Оба сценария на чистой базе; возвращает отчёты и список нарушений.
+    reports, problems = [], []
+    scenarios = (
+        ("NFR-06", NFR_06_RATE, {"list": 1}, NFR_06_P95, [ROUTES["list"]]),
+        ("NFR-12", rate, mix or DEFAULT_MIX, NFR_12_P95, None),
+    )
+    for name, scenario_rate, scenario_mix, limit, routes in scenarios:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = asyncio.run(
+                run_load(Path(tmp), scenario_rate, duration, scenario_mix)
+            )
+        reports.append(report)
+        problems.extend(
+            f"{name} {problem}" for problem in report.violations(limit, routes)
+        )
+    return reports, problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=NFR_06_RATE)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    args = parser.parse_args()
+
+    reports, problems = check_nfr(args.duration, args.rate, args.mix)
+    for name, report in zip(("NFR-06", "NFR-12"), reports):
+        print(f"{name}: {report.format()}\n")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if problems:
+        sys.exit(1)
+    print("NFR-06, NFR-12: OK")
+
+
+if __name__ == "__main__":
+    main()
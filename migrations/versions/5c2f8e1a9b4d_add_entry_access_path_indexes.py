@@ -0,0 +1,35 @@
+"""Add entry access path indexes
+
+Revision ID: 5c2f8e1a9b4d
+Revises: 9b4e1d7c3a60
+Create Date: 2026-10-17 10:12:41.305617
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2f8e1a9b4d"
+down_revision: Union[str, Sequence[str], None] = "9b4e1d7c3a60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_entries_owner_id_id", "entries", ["owner_id", "id"])
+    op.create_index(
+        "ix_entries_owner_status_id", "entries", ["owner_id", "status", "id"]
+    )
+    op.create_index("ix_entries_owner_kind_id", "entries", ["owner_id", "kind", "id"])
+    op.create_index("ix_entries_owner_title_id", "entries", ["owner_id", "title", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_owner_title_id", table_name="entries")
+    op.drop_index("ix_entries_owner_kind_id", table_name="entries")
+    op.drop_index("ix_entries_owner_status_id", table_name="entries")
+    op.drop_index("ix_entries_owner_id_id", table_name="entries")
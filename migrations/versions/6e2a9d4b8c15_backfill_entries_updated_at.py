@@ -0,0 +1,37 @@
+"""Backfill entries updated_at
+
+Revision ID: 6e2a9d4b8c15
+Revises: a3e8c5f1b7d2
+Create Date: 2026-10-18 16:42:09.314870
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6e2a9d4b8c15"
+down_revision: Union[str, Sequence[str], None] = "a3e8c5f1b7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+entries = sa.table("entries", sa.column("updated_at", sa.DateTime()))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Строки, созданные до колонки, архивировались бы при первом же запуске:
+    # время их последней записи неизвестно, и отсчёт начинается с миграции.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    op.execute(
+        entries.update().where(entries.c.updated_at.is_(None)).values(updated_at=now)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Какие строки были NULL, уже не известно: заполненное время остаётся.
+    pass
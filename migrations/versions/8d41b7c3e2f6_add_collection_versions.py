@@ -0,0 +1,34 @@
+"""Add collection versions
+
+Revision ID: 8d41b7c3e2f6
+Revises: 5c2f8e1a9b4d
+Create Date: 2026-10-17 16:42:08.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41b7c3e2f6"
+down_revision: Union[str, Sequence[str], None] = "5c2f8e1a9b4d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "collection_versions",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("collection", sa.String(length=50), nullable=False),
+        sa.Column("version", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "collection"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("collection_versions")
@@ -0,0 +1,43 @@
+"""Create entries table if missing
+
+Revision ID: 9b4e1d7c3a60
+Revises: 017275651475
+Create Date: 2026-10-18 14:02:37.190524
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4e1d7c3a60"
+down_revision: Union[str, Sequence[str], None] = "017275651475"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 017275651475 была пустой: базы, помеченные ею, таблицы entries не
+    # получили, а у созданных через create_all она уже есть.
+    if sa.inspect(op.get_bind()).has_table("entries"):
+        return
+    op.create_table(
+        "entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("kind", sa.String(length=10), nullable=False),
+        sa.Column("link", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=15), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_entries_id"), "entries", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_entries_id"), table_name="entries")
+    op.drop_table("entries")
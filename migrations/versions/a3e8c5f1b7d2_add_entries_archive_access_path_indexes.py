@@ -0,0 +1,43 @@
+"""Add entries archive access path indexes
+
+Revision ID: a3e8c5f1b7d2
+Revises: f1d6b3e8a4c7
+Create Date: 2026-10-18 11:26:05.731448
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e8c5f1b7d2"
+down_revision: Union[str, Sequence[str], None] = "f1d6b3e8a4c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_entries_archive_owner_status_id",
+        "entries_archive",
+        ["owner_id", "status", "id"],
+    )
+    op.create_index(
+        "ix_entries_archive_owner_kind_id",
+        "entries_archive",
+        ["owner_id", "kind", "id"],
+    )
+    op.create_index(
+        "ix_entries_archive_owner_title_id",
+        "entries_archive",
+        ["owner_id", "title", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_archive_owner_title_id", table_name="entries_archive")
+    op.drop_index("ix_entries_archive_owner_kind_id", table_name="entries_archive")
+    op.drop_index("ix_entries_archive_owner_status_id", table_name="entries_archive")
@@ -0,0 +1,67 @@
+"""Add entry title search
+
+Revision ID: b7e9a2d4c1f3
+Revises: 8d41b7c3e2f6
+Create Date: 2026-10-17 17:20:54.604311
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e9a2d4c1f3"
+down_revision: Union[str, Sequence[str], None] = "8d41b7c3e2f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_entries_title_search ON entries "
+            "USING gin (to_tsvector('simple', title))"
+        )
+        return
+    if dialect != "sqlite":
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE entries_fts USING fts5(title, content='entries', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_fts_ai AFTER INSERT ON entries BEGIN "
+        "INSERT INTO entries_fts(rowid, title) VALUES (new.id, new.title); END"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_fts_ad AFTER DELETE ON entries BEGIN "
+        "INSERT INTO entries_fts(entries_fts, rowid, title) "
+        "VALUES ('delete', old.id, old.title); END"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_fts_au AFTER UPDATE OF title ON entries BEGIN "
+        "INSERT INTO entries_fts(entries_fts, rowid, title) "
+        "VALUES ('delete', old.id, old.title); "
+        "INSERT INTO entries_fts(rowid, title) VALUES (new.id, new.title); END"
+    )
+    # Уже существующие записи попадают в индекс через rebuild.
+    op.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_entries_title_search")
+        return
+    if dialect != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_ai")
+    op.execute("DROP TABLE IF EXISTS entries_fts")
@@ -0,0 +1,99 @@
+"""Add entry duplicate indexes
+
+Revision ID: c4a9e6f2d7b1
+Revises: b7e9a2d4c1f3
+Create Date: 2026-10-17 17:41:12.532908
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.core.duplicates import link_hash
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9e6f2d7b1"
+down_revision: Union[str, Sequence[str], None] = "b7e9a2d4c1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("entries", sa.Column("link_hash", sa.String(length=16)))
+    op.create_index("ix_entries_owner_link_hash", "entries", ["owner_id", "link_hash"])
+
+    # Хэш считается в Python (канонизация URL), поэтому существующие строки
+    # заполняются пачками по id.
+    bind = op.get_bind()
+    entries = sa.table(
+        "entries", sa.column("id"), sa.column("link"), sa.column("link_hash")
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(entries.c.id, entries.c.link)
+            .where(entries.c.id > last_id, entries.c.link.isnot(None))
+            .order_by(entries.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            entries.update()
+            .where(entries.c.id == sa.bindparam("row_id"))
+            .values(link_hash=sa.bindparam("hash")),
+            [{"row_id": row.id, "hash": link_hash(row.link)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_entries_title_trgm ON entries "
+            "USING gin (lower(title) gin_trgm_ops)"
+        )
+        return
+    if dialect != "sqlite":
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE entries_trigrams USING fts5(title, "
+        "content='entries', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_trigrams_ai AFTER INSERT ON entries BEGIN "
+        "INSERT INTO entries_trigrams(rowid, title) VALUES (new.id, new.title); END"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_trigrams_ad AFTER DELETE ON entries BEGIN "
+        "INSERT INTO entries_trigrams(entries_trigrams, rowid, title) "
+        "VALUES ('delete', old.id, old.title); END"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_trigrams_au AFTER UPDATE OF title ON entries BEGIN "
+        "INSERT INTO entries_trigrams(entries_trigrams, rowid, title) "
+        "VALUES ('delete', old.id, old.title); "
+        "INSERT INTO entries_trigrams(rowid, title) VALUES (new.id, new.title); END"
+    )
+    op.execute("INSERT INTO entries_trigrams(entries_trigrams) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_entries_title_trgm")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS entries_trigrams_au")
+        op.execute("DROP TRIGGER IF EXISTS entries_trigrams_ad")
+        op.execute("DROP TRIGGER IF EXISTS entries_trigrams_ai")
+        op.execute("DROP TABLE IF EXISTS entries_trigrams")
+
+    op.drop_index("ix_entries_owner_link_hash", table_name="entries")
+    op.drop_column("entries", "link_hash")
@@ -0,0 +1,41 @@
+"""Add entry counters
+
+Revision ID: d2b7f4c9e1a5
+Revises: c4a9e6f2d7b1
+Create Date: 2026-10-17 18:05:37.216480
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b7f4c9e1a5"
+down_revision: Union[str, Sequence[str], None] = "c4a9e6f2d7b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "entry_counters",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=15), nullable=False),
+        sa.Column("kind", sa.String(length=10), nullable=False),
+        sa.Column("count", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "status", "kind"),
+    )
+    # Счётчики для уже существующих записей.
+    op.execute(
+        "INSERT INTO entry_counters (owner_id, status, kind, count) "
+        "SELECT owner_id, status, kind, COUNT(*) FROM entries "
+        "GROUP BY owner_id, status, kind"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("entry_counters")
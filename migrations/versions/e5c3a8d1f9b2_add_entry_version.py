@@ -0,0 +1,32 @@
+"""Add entry version
+
+Revision ID: e5c3a8d1f9b2
+Revises: d2b7f4c9e1a5
+Create Date: 2026-10-17 19:12:48.604317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c3a8d1f9b2"
+down_revision: Union[str, Sequence[str], None] = "d2b7f4c9e1a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие строки получают версию 1 через server_default.
+    op.add_column(
+        "entries",
+        sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("entries", "version")
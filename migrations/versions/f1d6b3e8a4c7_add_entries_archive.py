@@ -0,0 +1,58 @@
+"""Add entries archive
+
+Revision ID: f1d6b3e8a4c7
+Revises: e5c3a8d1f9b2
+Create Date: 2026-10-17 21:04:13.518902
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1d6b3e8a4c7"
+down_revision: Union[str, Sequence[str], None] = "e5c3a8d1f9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие строки остаются с NULL и считаются давно не менявшимися.
+    op.add_column("entries", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_entries_status_updated_at",
+        "entries",
+        ["status", "updated_at"],
+        unique=False,
+    )
+    op.create_table(
+        "entries_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=200), nullable=False),
+        sa.Column("kind", sa.String(length=10), nullable=False),
+        sa.Column("link", sa.Text(), nullable=True),
+        sa.Column("link_hash", sa.String(length=16), nullable=True),
+        sa.Column("status", sa.String(length=15), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_entries_archive_owner_id_id",
+        "entries_archive",
+        ["owner_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_entries_archive_owner_id_id", table_name="entries_archive")
+    op.drop_table("entries_archive")
+    op.drop_index("ix_entries_status_updated_at", table_name="entries")
+    op.drop_column("entries", "updated_at")
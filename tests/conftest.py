@@ -3,6 +3,8 @@ import sys
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ["TESTING"] = "true"
@@ -12,6 +14,7 @@ os.environ["APP_DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["APP_API_KEY"] = "test_api_key"
 
 
+from app.core.repository import EntryRepository
 from app.domain.database_models import Base
 from app.main import app
 
@@ -27,7 +30,12 @@ def setup_database():
 
 @pytest.fixture(autouse=True)
 def clean_database():
+    from app.core.cache import get_entry_cache
     from app.core.database import SessionLocal
+    from app.core.suggest import get_suggest_index
+
+    get_entry_cache().clear()
+    get_suggest_index().clear()
 
     db = SessionLocal()
     try:
@@ -39,6 +47,23 @@ def clean_database():
     yield
 
 
+@pytest.fixture
+def db_session(tmp_path):
+    # Отдельная файловая база на тест, в обход приложения: движок закрывается
+    # после теста, даже если тест упал.
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def repository(db_session):
+    return EntryRepository(db_session)
+
+
 @pytest.fixture(scope="module")
 def test_client():
     with TestClient(app) as client:
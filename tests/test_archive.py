@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+from sqlalchemy import event, func, select, update
+
+from app.core.archive import archive_session
+from app.domain.database_models import EntryArchiveDB, EntryDB, utcnow
+from app.domain.models import EntryCreate, EntryUpdate
+
+
+def _seed(repository, statuses):
+    records = repository.create_many(
+        [
+            EntryCreate(title=f"Book {i}", kind="book", status=status)
+            for i, status in enumerate(statuses)
+        ]
+    )
+    return [record.id for record in records]
+
+
+def _age(db_session, days):
+    db_session.execute(
+        update(EntryDB).values(updated_at=utcnow() - timedelta(days=days))
+    )
+    db_session.commit()
+
+
+def _count(db_session, model):
+    return db_session.execute(select(func.count()).select_from(model)).scalar()
+
+
+def test_archive_moves_only_old_completed_entries(db_session, repository):
+    ids = _seed(repository, ["completed", "planned", "completed", "completed"])
+    _age(db_session, 100)
+    repository.update(ids[3], EntryUpdate(title="Touched"))
+    stats = repository.get_stats()
+    version = repository.get_collection_version()
+
+    archived = repository.archive_completed(utcnow() - timedelta(days=90), limit=10)
+
+    assert archived == {1: [ids[0], ids[2]]}
+    assert _count(db_session, EntryDB) == 2
+    assert _count(db_session, EntryArchiveDB) == 2
+    assert repository.get_stats() == stats
+    assert repository.get_collection_version() > version
+    assert repository.reconcile_counters() and repository.get_stats() == stats
+
+
+def test_entry_without_updated_at_is_not_archived(db_session, repository):
+    ids = _seed(repository, ["completed", "completed"])
+    _age(db_session, 100)
+    db_session.execute(
+        update(EntryDB).where(EntryDB.id == ids[0]).values(updated_at=None)
+    )
+    db_session.commit()
+
+    archived = repository.archive_completed(utcnow() - timedelta(days=90), limit=10)
+
+    assert archived == {1: [ids[1]]}
+
+
+def test_archive_reports_only_deleted_rows(db_session, repository):
+    ids = _seed(repository, ["completed", "completed"])
+    _age(db_session, 100)
+
+    touched = []
+
+    @event.listens_for(db_session, "do_orm_execute")
+    def touch(state):
+        # Запись в ids[0] между выборкой кандидатов и переносом.
+        if state.is_delete and not touched:
+            touched.append(ids[0])
+            stmt = update(EntryDB).where(EntryDB.id == ids[0])
+            db_session.execute(stmt.values(updated_at=utcnow()))
+
+    archived = repository.archive_completed(utcnow() - timedelta(days=90), limit=10)
+
+    assert archived == {1: [ids[1]]}
+    assert db_session.get(EntryDB, ids[0]) is not None
+    assert db_session.execute(select(EntryArchiveDB.id)).scalars().all() == [ids[1]]
+
+
+def test_archive_job_runs_in_batches(db_session, repository):
+    _seed(repository, ["completed"] * 7)
+    _age(db_session, 100)
+
+    assert archive_session(db_session, days=90, batch_size=3, pause=0) == 7
+    assert _count(db_session, EntryDB) == 0
+
+
+def test_archived_entry_reads_through_by_id(repository):
+    (entry_id,) = _seed(repository, ["completed"])
+    repository.archive_completed(utcnow() + timedelta(days=1), limit=10)
+
+    record = repository.get_by_id(entry_id)
+    assert record.title == "Book 0" and record.status == "completed"
+    assert repository.get_by_id(entry_id, fields=("title",)) == {"title": "Book 0"}
+    assert repository.get_entry_version(entry_id) == 1
+    assert repository.get_by_id(entry_id + 1) is None
+
+
+def test_list_includes_archived_only_on_request(repository):
+    ids = _seed(repository, ["completed", "planned", "completed", "planned"])
+    repository.archive_completed(utcnow() + timedelta(days=1), limit=10)
+
+    assert [e.id for e in repository.get_all()] == [ids[1], ids[3]]
+    assert [e.id for e in repository.get_all(include_archived=True)] == ids
+
+    page, cursor = repository.get_page(limit=3, include_archived=True)
+    assert [e.id for e in page] == ids[:3]
+    page, cursor = repository.get_page(limit=3, cursor=cursor, include_archived=True)
+    assert [e.id for e in page] == ids[3:] and cursor is None
+
+    page, _ = repository.get_page(
+        sort="title", fields=("title",), status="completed", include_archived=True
+    )
+    assert page == [{"title": "Book 0"}, {"title": "Book 2"}]
+
+
+def test_write_to_archived_entry_restores_it(db_session, repository):
+    ids = _seed(repository, ["completed", "completed", "completed"])
+    repository.archive_completed(utcnow() + timedelta(days=1), limit=10)
+
+    updated = repository.update(ids[0], EntryUpdate(status="reading"))
+    assert updated.status == "reading" and updated.id == ids[0]
+    assert repository.delete(ids[1]) is True
+    assert repository.get_by_id(ids[1]) is None
+    assert [e.id for e in repository.get_all()] == [ids[0]]
+    assert repository.get_stats()["total"] == 2
+
+    assert repository.delete_where(status="completed") == [ids[2]]
+    assert _count(db_session, EntryArchiveDB) == 0
+
+
+def test_bulk_writes_change_archived_entries_in_place(db_session, repository):
+    ids = _seed(repository, ["completed", "completed", "planned"])
+    repository.archive_completed(utcnow() + timedelta(days=1), limit=10)
+    stats = repository.get_stats()
+
+    assert repository.update_where(EntryUpdate(kind="article")) == ids
+    assert _count(db_session, EntryArchiveDB) == 2
+    archived = repository.get_by_id(ids[0])
+    assert archived.kind == "article" and archived.version == 2
+    assert repository.get_stats()["total"] == stats["total"]
+
+    assert repository.delete_where(status="completed") == ids[:2]
+    assert _count(db_session, EntryArchiveDB) == 0
+    assert [e.id for e in repository.get_all(include_archived=True)] == [ids[2]]
+    stats = repository.get_stats()
+    assert stats["total"] == 1
+    repository.reconcile_counters()
+    assert repository.get_stats() == stats
+
+
+def test_new_ids_never_reuse_archived_ids(repository):
+    ids = _seed(repository, ["completed", "completed"])
+    repository.archive_completed(utcnow() + timedelta(days=1), limit=10)
+
+    created = repository.create(EntryCreate(title="New", kind="book"))
+    batch = repository.create_many(
+        [EntryCreate(title=f"Batch {i}", kind="book") for i in range(2)]
+    )
+
+    assert created.id == ids[-1] + 1
+    assert [record.id for record in batch] == [created.id + 1, created.id + 2]
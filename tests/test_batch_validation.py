@@ -0,0 +1,112 @@
+import pytest
+from pydantic import ValidationError
+
+from app.domain.models import EntryCreate, EntryKind, EntryStatus, validate_entry_batch
+
+TITLES = [
+    "  Clean Code  ",
+    'Designing "Data-Intensive" {Applications}',
+    "Совершенный код",
+    "test'; DROP TABLE entries;--",
+    "Notes WHERE x\nOR y 1 = 1",
+    "a = b",
+    "Updated Edition",
+    "\u017felect *",
+    "onclic\u212a=go",
+    "<script>alert(1)</script>",
+    "<>",
+    "x" * 201,
+    "x\x00y",
+    42,
+    None,
+]
+LINKS = [
+    "https://Example.com/books/clean-code?ref=a#top",
+    "http://example.com?",
+    "  ",
+    "javascript:alert(1)",
+    "https://example.com/a;params?q=1",
+    "https://example.com:8080/",
+    "https://example.com/../etc/passwd",
+    "https://example.com/?q=<script>",
+    "https://пример.рф/",
+    "https://example.com/a\tb",
+    None,
+    "ftp://example.com",
+]
+KINDS = ["book", EntryKind.ARTICLE, "magazine", "article"]
+STATUSES = ["planned", EntryStatus.COMPLETED, "lost"]
+
+
+def _single(**fields):
+    try:
+        return EntryCreate(**fields), []
+    except ValidationError as e:
+        return None, e.errors()
+
+
+def _rows():
+    return [
+        (title, link, kind, status)
+        for i, title in enumerate(TITLES)
+        for j, link in enumerate(LINKS)
+        for kind, status in [(KINDS[(i + j) % 4], STATUSES[(i * j) % 3])]
+    ]
+
+
+def test_batch_matches_single_item_validation():
+    rows = _rows()
+    titles, links, kinds, statuses = (list(column) for column in zip(*rows))
+
+    checked = validate_entry_batch(titles, links, kinds, statuses)
+
+    for i, (title, link, kind, status) in enumerate(rows):
+        model, errors = _single(title=title, link=link, kind=kind, status=status)
+        assert checked.errors[i] == errors, rows[i]
+        assert checked.accepted[i] is (model is not None)
+        if model is not None:
+            assert checked.entries[i].dict() == model.dict()
+            assert (checked.titles[i], checked.links[i]) == (model.title, model.link)
+
+
+def test_titles_and_links_only():
+    checked = validate_entry_batch(
+        ["Clean Code", "DROP TABLE entries", "Refactoring"],
+        ["https://example.com/#x", None, "file:///etc/passwd"],
+    )
+
+    assert checked.accepted == [True, False, False]
+    assert checked.rejected == [False, True, True]
+    assert checked.titles == ["Clean Code", None, None]
+    assert checked.links == ["https://example.com/", None, None]
+    assert [[error["loc"] for error in errors] for errors in checked.errors] == [
+        [],
+        [("title",)],
+        [("link",)],
+    ]
+    assert checked.entries == [None, None, None]
+
+
+def test_article_without_link_is_rejected_by_domain_rule():
+    checked = validate_entry_batch(["Some Article"], [None], ["article"])
+
+    assert checked.errors == [
+        [
+            {
+                "loc": ("__root__",),
+                "msg": "Articles must have a link",
+                "type": "value_error",
+            }
+        ]
+    ]
+
+
+def test_columns_must_have_equal_length():
+    with pytest.raises(ValueError):
+        validate_entry_batch(["a", "b"], ["https://example.com"])
+
+
+def test_empty_batch():
+    checked = validate_entry_batch([], [], [], [])
+
+    assert (checked.accepted, checked.errors, checked.entries) == ([], [], [])
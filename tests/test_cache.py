@@ -0,0 +1,273 @@
+import pytest
+import redis
+from sqlalchemy import event
+
+from app.core.cache import EntryCache, LRUCache, RedisCache, get_entry_cache
+from app.core.repository import CachedEntryRepository, EntryRepository
+from app.domain.models import EntryBatchRequest, EntryCreate, EntryUpdate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    # Минимальная замена redis.Redis для тестов: только используемые команды.
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        self._check()
+
+    def _check(self):
+        if self.down:
+            raise redis.ConnectionError("redis is down")
+
+
+@pytest.fixture
+def cached_repo(db_session):
+    cache = EntryCache(LRUCache(maxsize=100, ttl=60))
+    repo = CachedEntryRepository(db_session, cache)
+    for i, status in enumerate(["planned", "reading", "completed"]):
+        repo.create(EntryCreate(title=f"Book {i}", kind="book", status=status))
+
+    statements = []
+    event.listen(
+        db_session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return repo, cache, statements
+
+
+class TestLRUCache:
+
+    def test_ttl_expires_entries(self):
+        clock = FakeClock()
+        cache = LRUCache(maxsize=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        clock.now = 5
+        assert cache.get("a") is None
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "expirations": 1,
+            "size": 0,
+        }
+
+    def test_size_bound_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.peek("b") is None
+        assert cache.peek("a") == 1
+        assert cache.peek("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+
+class TestEntryCache:
+
+    def test_shared_level_fills_local_level(self):
+        client = FakeRedis()
+        writer = EntryCache(LRUCache(), RedisCache(client))
+        reader = EntryCache(LRUCache(), RedisCache(client))
+
+        writer.set_entry(writer.entry_key(1), {"id": 1, "title": "Shared"})
+
+        assert reader.get_entry(reader.entry_key(1)) == {"id": 1, "title": "Shared"}
+        assert reader.stats()["shared"]["hits"] == 1
+        assert reader.local.peek("entry:1:0") == {"id": 1, "title": "Shared"}
+
+    def test_invalidation_is_visible_to_other_processes(self):
+        client = FakeRedis()
+        writer = EntryCache(LRUCache(), RedisCache(client))
+        reader = EntryCache(LRUCache(), RedisCache(client))
+
+        key = reader.list_key(1, None, None, "id", 50, None)
+        reader.set_list(key, [[], None])
+        entry_key = reader.entry_key(1)
+        reader.set_entry(entry_key, {"id": 1})
+        writer.invalidate(1, [1], {"planned"}, {"book"})
+
+        assert reader.list_key(1, None, None, "id", 50, None) != key
+        # Группа reading не затронута: её страницы остаются в кэше.
+        assert reader.list_key(1, "reading", None, "id", 50, None) == (
+            "entries:1:reading::0:id:50:"
+        )
+        # Запись в локальном уровне читателя осталась, но под старым ключом.
+        assert reader.entry_key(1) != entry_key
+        assert reader.get_entry(reader.entry_key(1)) is None
+
+    def test_redis_errors_bypass_the_cache(self):
+        client = FakeRedis()
+        cache = EntryCache(LRUCache(), RedisCache(client))
+        client.down = True
+
+        assert cache.list_key(1, None, None, "id", 50, None) is None
+        assert cache.entry_key(1) is None
+        assert cache.stats()["shared"]["errors"] == 2
+
+
+class TestCachedEntryRepository:
+
+    def test_reads_are_served_from_cache(self, cached_repo):
+        repo, cache, statements = cached_repo
+
+        first = repo.get_by_id(1)
+        page, _ = repo.get_page(limit=10)
+        assert repo.get_by_id(1) == first
+        assert repo.get_page(limit=10)[0] == page
+
+        assert len(statements) == 2
+        assert cache.stats()["local"]["hits"] == 2
+
+    def test_update_invalidates_only_affected_keys(self, cached_repo):
+        repo, cache, statements = cached_repo
+        for entry_id in (1, 2, 3):
+            repo.get_by_id(entry_id)
+        for status in (None, "planned", "reading", "completed"):
+            repo.get_page(status=status, limit=10)
+        statements.clear()
+
+        repo.update(1, EntryUpdate(status="reading"))
+        statements.clear()
+
+        assert repo.get_by_id(1).status == "reading"
+        assert repo.get_by_id(2).status == "reading"
+        assert [r.id for r in repo.get_page(status="reading", limit=10)[0]] == [1, 2]
+        assert repo.get_page(status="planned", limit=10)[0] == []
+        repo.get_page(status="completed", limit=10)
+        repo.get_page(limit=10)
+
+        # Перечитаны: запись 1, списки planned, reading и общий; completed — нет.
+        assert len(statements) == 4
+
+    def test_title_update_keeps_other_status_lists(self, cached_repo):
+        repo, cache, statements = cached_repo
+        repo.get_by_id(2)
+        repo.get_page(status="planned", limit=10)
+        repo.get_page(status="reading", limit=10)
+
+        repo.update(2, EntryUpdate(title="Renamed"))
+        statements.clear()
+
+        assert repo.get_page(status="planned", limit=10)[0][0].title == "Book 0"
+        assert repo.get_page(status="reading", limit=10)[0][0].title == "Renamed"
+        assert len(statements) == 1
+
+    def test_delete_and_bulk_writes_invalidate(self, cached_repo):
+        repo, cache, statements = cached_repo
+        repo.get_by_id(3)
+        repo.get_page(status="completed", limit=10)
+
+        repo.delete(3)
+        assert repo.get_by_id(3) is None
+        assert repo.get_page(status="completed", limit=10)[0] == []
+
+        repo.update_where(EntryUpdate(status="completed"), status="planned")
+        assert [r.id for r in repo.get_page(status="completed", limit=10)[0]] == [1]
+
+        repo.delete_where(status="completed")
+        assert repo.get_page(status="completed", limit=10)[0] == []
+
+    def test_delete_of_uncached_entry_invalidates_its_owner(self, cached_repo):
+        repo, cache, statements = cached_repo
+        entry = repo.create(EntryCreate(title="Other", kind="book"), owner_id=2)
+        repo.get_page(owner_id=2, limit=10)
+
+        # Записи нет в кэше: владелец берётся из удалённой строки, а не 1.
+        assert cache.peek_entry(entry.id) is None
+        repo.delete(entry.id)
+        assert repo.get_page(owner_id=2, limit=10)[0] == []
+
+    def test_list_key_follows_collection_version(self, cached_repo):
+        repo, cache, statements = cached_repo
+        version = repo.get_collection_version()
+        assert len(repo.get_page(limit=10, version=version)[0]) == 3
+
+        # Запись мимо кэша, как у импорта или архивации в другом процессе.
+        EntryRepository(repo.db).create(EntryCreate(title="Imported", kind="book"))
+        version = repo.get_collection_version()
+        assert len(repo.get_page(limit=10, version=version)[0]) == 4
+
+    def test_write_through_one_cache_is_visible_through_another(self, cached_repo):
+        repo, cache, statements = cached_repo
+        client = FakeRedis()
+        first = CachedEntryRepository(
+            repo.db, EntryCache(LRUCache(), RedisCache(client))
+        )
+        second = CachedEntryRepository(
+            repo.db, EntryCache(LRUCache(), RedisCache(client))
+        )
+        # Обе записи попали в локальные уровни обоих «процессов».
+        assert first.get_by_id(1).title == second.get_by_id(1).title == "Book 0"
+
+        first.update(1, EntryUpdate(title="Renamed"))
+
+        record = second.get_by_id(1)
+        assert (record.title, record.version) == ("Renamed", 2)
+
+    def test_batch_invalidates_touched_entries(self, cached_repo):
+        repo, cache, statements = cached_repo
+        repo.get_by_id(1)
+        repo.get_page(limit=10)
+
+        batch = EntryBatchRequest(
+            operations=[
+                {"op": "update", "id": 1, "data": {"title": "Batched"}},
+                {"op": "create", "data": {"title": "Fresh", "kind": "book"}},
+            ]
+        )
+        repo.apply_batch(batch.operations)
+
+        assert repo.get_by_id(1).title == "Batched"
+        assert [r.title for r in repo.get_page(limit=10)[0]][-1] == "Fresh"
+
+
+def test_api_reads_go_through_cache(test_client, sample_entry_data):
+    created = test_client.post("/api/v1/entries", json=sample_entry_data).json()
+    url = f"/api/v1/entries/{created['id']}"
+
+    test_client.get(url)
+    test_client.get(url)
+    response = test_client.put(url, json={"status": "reading"})
+    assert response.status_code == 200
+
+    assert test_client.get(url).json()["status"] == "reading"
+    stats = test_client.get("/api/v1/health/cache").json()
+    assert stats["local"]["hits"] == 1
+    assert stats["local"]["misses"] == 2
+    assert stats == get_entry_cache().stats()
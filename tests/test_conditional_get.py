@@ -0,0 +1,113 @@
+from sqlalchemy import event
+
+from app.core.database import async_engine
+from app.core.etag import etag_matches
+from app.domain.models import EntryCreate, EntryUpdate
+
+
+def _count_statements(call):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = call()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    return response, statements
+
+
+class TestConditionalList:
+
+    def test_unchanged_list_returns_304_without_reading_rows(
+        self, test_client, created_entry
+    ):
+        first = test_client.get("/api/v1/entries")
+        etag = first.headers["ETag"]
+
+        response, statements = _count_statements(
+            lambda: test_client.get("/api/v1/entries", headers={"If-None-Match": etag})
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert len(statements) == 1
+        assert "collection_versions" in statements[0]
+
+    def test_write_changes_list_etag(self, test_client, created_entry):
+        etag = test_client.get("/api/v1/entries").headers["ETag"]
+
+        test_client.put(
+            f"/api/v1/entries/{created_entry['id']}", json={"status": "reading"}
+        )
+        response = test_client.get("/api/v1/entries", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["items"][0]["status"] == "reading"
+
+    def test_query_parameters_change_list_etag(self, test_client, created_entry):
+        plain = test_client.get("/api/v1/entries").headers["ETag"]
+        filtered = test_client.get("/api/v1/entries?status=planned").headers["ETag"]
+        page = test_client.get("/api/v1/entries?limit=10").headers["ETag"]
+
+        assert len({plain, filtered, page}) == 3
+
+        response = test_client.get(
+            "/api/v1/entries?status=planned", headers={"If-None-Match": plain}
+        )
+        assert response.status_code == 200
+
+
+class TestConditionalItem:
+
+    def test_unchanged_entry_returns_304(self, test_client, created_entry):
+        url = f"/api/v1/entries/{created_entry['id']}"
+        etag = test_client.get(url).headers["ETag"]
+
+        response, statements = _count_statements(
+            lambda: test_client.get(url, headers={"If-None-Match": etag})
+        )
+
+        assert response.status_code == 304
+        # Версия для ETag лежит в закэшированной записи: БД не читается.
+        assert statements == []
+
+    def test_deleted_entry_is_not_revalidated(self, test_client, created_entry):
+        url = f"/api/v1/entries/{created_entry['id']}"
+        etag = test_client.get(url).headers["ETag"]
+
+        test_client.delete(url)
+        response = test_client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 404
+
+
+def test_etag_matching_rules():
+    etag = 'W/"entries-3-abc"'
+
+    assert etag_matches('W/"entries-3-abc"', etag)
+    assert etag_matches('"entries-3-abc"', etag)
+    assert etag_matches('"other", W/"entries-3-abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"entries-4-abc"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_repository_bumps_version_on_every_write(repository):
+    versions = [repository.get_collection_version()]
+    created = repository.create(EntryCreate(title="Versioned", kind="book"))
+    versions.append(repository.get_collection_version())
+    repository.update(created.id, EntryUpdate(status="reading"))
+    versions.append(repository.get_collection_version())
+    repository.update(999, EntryUpdate(status="reading"))
+    repository.delete(999)
+    versions.append(repository.get_collection_version())
+    repository.delete(created.id)
+    versions.append(repository.get_collection_version())
+
+    assert versions == [0, 1, 2, 2, 3]
+    assert repository.get_collection_version(owner_id=2) == 0
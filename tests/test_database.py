@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import checkpoint, create_engines
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'profile.db'}"
+
+
+def _pragma(engine, name):
+    with engine.connect() as connection:
+        return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_default_profile_uses_one_engine(db_url):
+    writer, reader = create_engines(db_url, "default", echo=False)
+
+    assert writer is reader
+    assert _pragma(writer, "journal_mode") == "delete"
+
+
+def test_production_profile_tunes_connections(db_url):
+    writer, reader = create_engines(db_url, "production", echo=False)
+
+    assert writer is not reader
+    for engine in (writer, reader):
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "synchronous") == 1
+        assert _pragma(engine, "cache_size") == -65536
+        assert _pragma(engine, "busy_timeout") == 5000
+    assert _pragma(writer, "query_only") == 0
+    assert _pragma(reader, "query_only") == 1
+
+
+def test_reader_pool_rejects_writes(db_url):
+    writer, reader = create_engines(db_url, "production", echo=False)
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+
+    with pytest.raises(OperationalError, match="readonly"):
+        with reader.begin() as connection:
+            connection.execute(text("INSERT INTO t VALUES (1)"))
+
+
+def test_readers_are_not_blocked_by_open_write(db_url):
+    writer, reader = create_engines(db_url, "production", echo=False)
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+
+    with writer.begin() as connection:
+        connection.execute(text("INSERT INTO t VALUES (2)"))
+        # Незавершённая запись не блокирует читателя: он видит прошлый снимок.
+        with reader.connect() as read:
+            assert read.execute(text("SELECT count(*) FROM t")).scalar() == 1
+
+
+def test_async_profile_applies_pragmas(db_url):
+    url = db_url.replace("sqlite://", "sqlite+aiosqlite://")
+    writer, reader = create_engines(url, "production", async_=True, echo=False)
+
+    async def pragmas():
+        async with reader.connect() as connection:
+            result = await connection.exec_driver_sql("PRAGMA query_only")
+            query_only = result.scalar()
+            result = await connection.exec_driver_sql("PRAGMA journal_mode")
+            journal_mode = result.scalar()
+        await writer.dispose()
+        await reader.dispose()
+        return query_only, journal_mode
+
+    assert asyncio.run(pragmas()) == (1, "wal")
+
+
+def test_checkpoint_truncates_wal(db_url):
+    writer, _ = create_engines(db_url, "production", echo=False)
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1)"))
+
+    assert checkpoint("TRUNCATE", writer) == (0, 0, 0)
+    with pytest.raises(ValueError):
+        checkpoint("NOW; DROP TABLE t", writer)
@@ -0,0 +1,173 @@
+import pytest
+
+from app.core.duplicates import (
+    canonical_link,
+    link_hash,
+    query_trigrams,
+    required_trigrams,
+    title_similarity,
+)
+
+
+def _create(test_client, title, link=None, kind="book", **params):
+    payload = {"title": title, "kind": kind, "status": "planned"}
+    if link:
+        payload["link"] = link
+    return test_client.post("/api/v1/entries", json=payload, params=params)
+
+
+class TestCanonicalLink:
+
+    @pytest.mark.parametrize(
+        "link",
+        [
+            "http://www.Example.com/books/ddia/",
+            "https://example.com/books/ddia",
+            "https://EXAMPLE.com/books/ddia/",
+        ],
+    )
+    def test_equivalent_links_share_hash(self, link):
+        assert canonical_link(link) == "example.com/books/ddia"
+        assert link_hash(link) == link_hash("https://example.com/books/ddia")
+
+    def test_query_is_significant(self):
+        assert link_hash("https://example.com/a?id=1") != link_hash(
+            "https://example.com/a?id=2"
+        )
+
+    def test_no_link_has_no_hash(self):
+        assert link_hash(None) is None
+
+
+class TestTitleSimilarity:
+
+    def test_case_accents_and_spacing_are_ignored(self):
+        assert title_similarity("Café  Society", "cafe society") == 1.0
+
+    def test_small_typo_is_similar(self):
+        assert title_similarity("Clean Architecture", "Clean Architecure") >= 0.5
+
+    def test_different_titles_are_not_similar(self):
+        assert title_similarity("Clean Code", "Refactoring") == 0.0
+
+
+class TestRequiredTrigrams:
+
+    def test_rarest_trigrams_are_required(self):
+        title = "Clean Architecture"
+        counts = {trigram: 100 for trigram in query_trigrams(title)}
+        counts.update({"tur": 0, "hit": 1, "cle": 2})
+
+        required = required_trigrams(title, counts)
+
+        # 19 триграмм pg_trgm: похожему названию недостаёт не больше трёх.
+        assert len(required) == 5
+        assert required[:3] == ["tur", "hit", "cle"]
+
+    def test_similar_title_contains_a_required_trigram(self):
+        title = "Designing Data-Intensive Applications"
+        counts = {trigram: i for i, trigram in enumerate(query_trigrams(title), 1)}
+        # Самая редкая триграмма есть только в title: фильтр не держится на ней.
+        counts["ons"] = 0
+        similar = "designing data intensive application"
+
+        assert title_similarity(title, similar) >= 0.8
+        assert any(trigram in similar for trigram in required_trigrams(title, counts))
+
+
+class TestDuplicateCheckOnCreate:
+
+    def test_same_link_is_reported(self, test_client):
+        first = _create(
+            test_client,
+            "Designing Data-Intensive Applications",
+            "https://example.com/ddia/",
+        ).json()
+
+        response = _create(
+            test_client, "DDIA", "http://www.example.com/ddia", kind="article"
+        )
+
+        assert response.status_code == 201
+        assert response.headers["X-Duplicate-Of"] == str(first["id"])
+
+    def test_similar_title_is_reported(self, test_client):
+        first = _create(test_client, "The Pragmatic Programmer").json()
+
+        response = _create(test_client, "the pragmatic  programmer")
+
+        assert response.headers["X-Duplicate-Of"] == str(first["id"])
+
+    def test_unrelated_entry_is_not_reported(self, test_client):
+        _create(test_client, "The Pragmatic Programmer")
+
+        response = _create(test_client, "Programming Pearls")
+
+        assert response.status_code == 201
+        assert "X-Duplicate-Of" not in response.headers
+
+    def test_reject_policy_returns_conflict(self, test_client):
+        first = _create(test_client, "Refactoring", "https://example.com/refactoring")
+        first = first.json()
+
+        response = _create(
+            test_client,
+            "Refactoring",
+            "https://example.com/refactoring",
+            on_duplicate="reject",
+        )
+
+        assert response.status_code == 409
+        assert response.headers["content-type"] == "application/problem+json"
+        duplicates = response.json()["details"]["duplicates"]
+        assert [(d["id"], d["reason"]) for d in duplicates] == [(first["id"], "link")]
+        assert test_client.get("/api/v1/entries").json()["total"] == 1
+
+    def test_updated_link_is_rehashed(self, test_client):
+        entry = _create(test_client, "Some Book", "https://example.com/old").json()
+        test_client.put(
+            f"/api/v1/entries/{entry['id']}", json={"link": "https://example.com/new"}
+        )
+
+        response = _create(
+            test_client,
+            "Another Book",
+            "https://example.com/new/",
+            on_duplicate="reject",
+        )
+
+        assert response.status_code == 409
+
+
+class TestDuplicateReport:
+
+    def test_groups_entries_by_canonical_link(self, test_client):
+        a = _create(test_client, "Book A", "https://example.com/a").json()
+        _create(test_client, "Book B", "https://example.com/b")
+        c = _create(test_client, "Book C", "https://www.example.com/a/").json()
+
+        response = test_client.get("/api/v1/entries/duplicates")
+
+        assert response.status_code == 200
+        groups = response.json()["groups"]
+        assert [[item["id"] for item in group["items"]] for group in groups] == [
+            [a["id"], c["id"]]
+        ]
+
+    def test_cursor_pagination_covers_all_groups(self, test_client):
+        for i in range(5):
+            _create(test_client, f"Book {i}", f"https://example.com/{i}")
+            _create(test_client, f"Copy {i}", f"https://example.com/{i}/")
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            page = test_client.get("/api/v1/entries/duplicates", params=params).json()
+            seen.extend(len(group["items"]) for group in page["groups"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert seen == [2] * 5
@@ -1,3 +1,12 @@
+import json
+from datetime import timedelta
+
+from app.core.cache import get_entry_cache
+from app.core.database import SessionLocal
+from app.core.repository import CachedEntryRepository
+from app.domain.database_models import utcnow
+
+
 class TestCreateEntry:
 
     def test_create_entry_success(self, test_client, sample_entry_data):
@@ -20,15 +29,150 @@ class TestGetEntries:
         response = test_client.get("/api/v1/entries")
 
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json() == {"items": [], "total": 0, "next_cursor": None}
 
     def test_get_entries_with_data(self, test_client, created_entry):
         response = test_client.get("/api/v1/entries")
 
         assert response.status_code == 200
         data = response.json()
-        assert len(data) == 1
-        assert data[0]["title"] == "Test Book Title"
+        assert data["total"] == 1
+        assert data["items"][0]["title"] == "Test Book Title"
+        assert data["next_cursor"] is None
+
+
+class TestEntriesPagination:
+
+    @staticmethod
+    def _create(test_client, title, status="planned"):
+        response = test_client.post(
+            "/api/v1/entries", json={"title": title, "kind": "book", "status": status}
+        )
+        assert response.status_code == 201
+        return response.json()
+
+    @staticmethod
+    def _collect(test_client, **params):
+        pages, cursor = [], None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            response = test_client.get("/api/v1/entries", params=query)
+            assert response.status_code == 200
+            data = response.json()
+            pages.append(data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_all_entries_once(self, test_client):
+        created = [self._create(test_client, f"Book {i}") for i in range(7)]
+
+        pages = self._collect(test_client, limit=3)
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        ids = [item["id"] for page in pages for item in page]
+        assert ids == [entry["id"] for entry in created]
+
+    def test_sort_by_title_with_ties(self, test_client):
+        for title in ["Beta", "Alpha", "Beta", "Gamma", "Alpha"]:
+            self._create(test_client, title)
+
+        pages = self._collect(test_client, limit=2, sort="title")
+        items = [item for page in pages for item in page]
+
+        assert [item["title"] for item in items] == [
+            "Alpha",
+            "Alpha",
+            "Beta",
+            "Beta",
+            "Gamma",
+        ]
+        assert len({item["id"] for item in items}) == 5
+
+    def test_status_filter_is_applied_to_every_page(self, test_client):
+        for i in range(5):
+            self._create(test_client, f"Book {i}", "reading" if i % 2 else "planned")
+
+        pages = self._collect(test_client, limit=1, status="reading")
+
+        items = [item for page in pages for item in page]
+        assert len(items) == 2
+        assert all(item["status"] == "reading" for item in items)
+
+    def test_kind_filter(self, test_client):
+        self._create(test_client, "Some book")
+        test_client.post(
+            "/api/v1/entries",
+            json={"title": "Some article", "kind": "article", "link": "https://a.io"},
+        )
+
+        data = test_client.get("/api/v1/entries", params={"kind": "article"}).json()
+
+        assert [item["title"] for item in data["items"]] == ["Some article"]
+
+    def test_cursor_is_stable_under_concurrent_inserts(self, test_client):
+        for i in range(4):
+            self._create(test_client, f"Book {i}")
+
+        first = test_client.get("/api/v1/entries", params={"limit": 2}).json()
+        self._create(test_client, "Inserted later")
+        second = test_client.get(
+            "/api/v1/entries", params={"limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+
+        seen = [item["title"] for item in first["items"] + second["items"]]
+        assert seen == ["Book 0", "Book 1", "Book 2", "Book 3"]
+
+    def test_invalid_cursor(self, test_client):
+        response = test_client.get("/api/v1/entries", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 422
+        assert response.json()["type"] == "/errors/validation"
+
+    def test_cursor_from_other_sort_is_rejected(self, test_client):
+        for i in range(3):
+            self._create(test_client, f"Book {i}")
+        cursor = test_client.get("/api/v1/entries", params={"limit": 1}).json()[
+            "next_cursor"
+        ]
+
+        response = test_client.get(
+            "/api/v1/entries", params={"cursor": cursor, "sort": "title"}
+        )
+
+        assert response.status_code == 422
+
+    def test_limit_bounds(self, test_client):
+        assert (
+            test_client.get("/api/v1/entries", params={"limit": 0}).status_code == 422
+        )
+        assert (
+            test_client.get("/api/v1/entries", params={"limit": 201}).status_code == 422
+        )
+
+
+class TestTrustedReadPath:
+
+    def test_stored_rows_are_not_revalidated(self, test_client, created_entry):
+        from app.core.database import SessionLocal
+        from app.domain.database_models import EntryDB
+
+        # Строка, записанная до ужесточения правил, не должна ронять чтение.
+        db = SessionLocal()
+        try:
+            db.query(EntryDB).filter(EntryDB.id == created_entry["id"]).update(
+                {"title": "legacy -- title"}
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        item = test_client.get(f"/api/v1/entries/{created_entry['id']}")
+        listing = test_client.get("/api/v1/entries")
+
+        assert item.status_code == 200
+        assert item.json()["title"] == "legacy -- title"
+        assert listing.json()["items"][0] == item.json()
 
 
 class TestGetEntry:
@@ -95,3 +239,64 @@ class TestDeleteEntry:
         assert get_response.status_code == 404
         error_data = get_response.json()
         assert error_data["type"] == "/errors/not-found"
+
+
+class TestArchivedEntries:
+
+    def test_archived_entries_read_through(self, test_client):
+        created = test_client.post(
+            "/api/v1/entries",
+            json={"title": "Done", "kind": "book", "status": "completed"},
+        ).json()
+        test_client.post("/api/v1/entries", json={"title": "Next", "kind": "book"})
+        plain_etag = test_client.get("/api/v1/entries").headers["ETag"]
+        with SessionLocal() as db:
+            CachedEntryRepository(db, get_entry_cache()).archive_completed(
+                utcnow() + timedelta(days=1), limit=10
+            )
+
+        response = test_client.get(f"/api/v1/entries/{created['id']}")
+        assert response.status_code == 200
+        assert response.json()["title"] == "Done"
+
+        hot = test_client.get("/api/v1/entries")
+        everything = test_client.get(
+            "/api/v1/entries", params={"include_archived": True}
+        )
+        assert [item["title"] for item in hot.json()["items"]] == ["Next"]
+        assert [item["title"] for item in everything.json()["items"]] == [
+            "Done",
+            "Next",
+        ]
+        assert hot.headers["ETag"] != plain_etag
+        assert hot.headers["ETag"] != everything.headers["ETag"]
+
+    def test_export_includes_archived_entries(self, test_client):
+        titles = ["Old 1", "Current", "Old 2"]
+        created = [
+            test_client.post(
+                "/api/v1/entries",
+                json={
+                    "title": title,
+                    "kind": "book",
+                    "status": "completed" if title.startswith("Old") else "planned",
+                },
+            ).json()
+            for title in titles
+        ]
+        with SessionLocal() as db:
+            CachedEntryRepository(db, get_entry_cache()).archive_completed(
+                utcnow() + timedelta(days=1), limit=10
+            )
+
+        response = test_client.get("/api/v1/entries/export")
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert [entry["title"] for entry in exported] == titles
+
+        resumed = test_client.get(
+            "/api/v1/entries/export", params={"after_id": created[0]["id"]}
+        )
+        assert [json.loads(line)["title"] for line in resumed.text.splitlines()] == [
+            "Current",
+            "Old 2",
+        ]
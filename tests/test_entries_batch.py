@@ -0,0 +1,203 @@
+from sqlalchemy import event
+
+from app.core.database import async_engine
+
+
+def _book(title, **extra):
+    return {"title": title, "kind": "book", **extra}
+
+
+class TestBatchEntries:
+
+    def test_mixed_operations_in_order(self, test_client, created_entry):
+        entry_id = created_entry["id"]
+
+        response = test_client.post(
+            "/api/v1/entries:batch",
+            json={
+                "operations": [
+                    {"op": "create", "data": _book("First")},
+                    {"op": "create", "data": _book("Second")},
+                    {"op": "update", "id": entry_id, "data": {"status": "reading"}},
+                    {"op": "delete", "id": entry_id},
+                    {"op": "delete", "id": 999},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == [201, 201, 200, 204, 404]
+        assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+        assert results[0]["entry"]["title"] == "First"
+        assert results[2]["entry"]["status"] == "reading"
+        assert results[4]["detail"] == "Entry with id 999 not found"
+
+        titles = [
+            item["title"] for item in test_client.get("/api/v1/entries").json()["items"]
+        ]
+        assert titles == ["First", "Second"]
+
+    def test_update_of_entry_created_in_same_batch(self, test_client):
+        first = test_client.post(
+            "/api/v1/entries:batch",
+            json={"operations": [{"op": "create", "data": _book("Draft")}]},
+        ).json()["results"][0]
+
+        response = test_client.post(
+            "/api/v1/entries:batch",
+            json={
+                "operations": [
+                    {"op": "create", "data": _book("Another")},
+                    {"op": "update", "id": first["id"], "data": {"title": "Final"}},
+                    {"op": "delete", "id": first["id"]},
+                    {"op": "update", "id": first["id"], "data": {"title": "Gone"}},
+                ]
+            },
+        )
+
+        statuses = [r["status"] for r in response.json()["results"]]
+        assert statuses == [201, 200, 204, 404]
+
+    def test_invalid_item_rejects_whole_batch(self, test_client):
+        response = test_client.post(
+            "/api/v1/entries:batch",
+            json={
+                "operations": [
+                    {"op": "create", "data": _book("Valid")},
+                    {"op": "create", "data": _book("<script>alert(1)</script>")},
+                ]
+            },
+        )
+
+        assert response.status_code == 422
+        assert response.json()["type"] == "/errors/validation"
+        assert test_client.get("/api/v1/entries").json()["items"] == []
+
+    def test_unknown_operation_and_limits(self, test_client):
+        unknown = test_client.post(
+            "/api/v1/entries:batch", json={"operations": [{"op": "upsert", "id": 1}]}
+        )
+        empty = test_client.post("/api/v1/entries:batch", json={"operations": []})
+
+        assert unknown.status_code == 422
+        assert empty.status_code == 422
+
+    def test_bulk_statements(self, test_client):
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        operations = [{"op": "create", "data": _book(f"Book {i}")} for i in range(50)]
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            response = test_client.post(
+                "/api/v1/entries:batch", json={"operations": operations}
+            )
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+        assert response.status_code == 200
+        inserts = [
+            s for s in statements if s.lstrip().startswith("INSERT INTO entries")
+        ]
+        assert len(inserts) == 1
+
+
+class TestBulkByFilter:
+
+    @staticmethod
+    def _seed(test_client):
+        operations = [
+            {"op": "create", "data": _book("Book A", status="reading")},
+            {"op": "create", "data": _book("Book B", status="reading")},
+            {"op": "create", "data": _book("Book C", status="planned")},
+            {
+                "op": "create",
+                "data": {
+                    "title": "Article",
+                    "kind": "article",
+                    "link": "https://example.com/a",
+                    "status": "completed",
+                },
+            },
+        ]
+        results = test_client.post(
+            "/api/v1/entries:batch", json={"operations": operations}
+        ).json()["results"]
+        return [r["id"] for r in results]
+
+    def test_bulk_update_by_status(self, test_client):
+        ids = self._seed(test_client)
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            response = test_client.patch(
+                "/api/v1/entries",
+                params={"status": "reading"},
+                json={"status": "completed"},
+            )
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+        assert response.status_code == 200
+        assert response.json() == {"affected": 2, "ids": ids[:2]}
+        # Группы (status, kind) до обновления, сам UPDATE, версия и счётчики.
+        # В архиве только завершённые записи: фильтр reading его не читает.
+        assert len(statements) == 4
+        assert not any("entries_archive" in statement for statement in statements)
+        assert statements[0].lstrip().upper().startswith("SELECT")
+        assert statements[1].lstrip().upper().startswith("UPDATE")
+        assert "collection_versions" in statements[2]
+        assert "entry_counters" in statements[3]
+
+        completed = test_client.get(
+            "/api/v1/entries", params={"status": "completed"}
+        ).json()
+        assert completed["total"] == 3
+
+    def test_bulk_delete_by_kind_and_status(self, test_client):
+        ids = self._seed(test_client)
+
+        response = test_client.delete(
+            "/api/v1/entries", params={"kind": "article", "status": "completed"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"affected": 1, "ids": [ids[3]]}
+        assert test_client.get("/api/v1/entries").json()["total"] == 3
+
+    def test_bulk_operation_without_match(self, test_client):
+        self._seed(test_client)
+
+        response = test_client.delete("/api/v1/entries", params={"kind": "article"})
+        again = test_client.delete("/api/v1/entries", params={"kind": "article"})
+
+        assert response.json()["affected"] == 1
+        assert again.json() == {"affected": 0, "ids": []}
+
+    def test_filter_is_required(self, test_client):
+        self._seed(test_client)
+
+        delete_all = test_client.delete("/api/v1/entries")
+        update_all = test_client.patch("/api/v1/entries", json={"status": "planned"})
+
+        assert delete_all.status_code == 422
+        assert update_all.status_code == 422
+        assert test_client.get("/api/v1/entries").json()["total"] == 4
+
+    def test_bulk_update_body_is_validated(self, test_client):
+        self._seed(test_client)
+
+        response = test_client.patch(
+            "/api/v1/entries",
+            params={"status": "reading"},
+            json={"title": "DROP TABLE entries"},
+        )
+
+        assert response.status_code == 422
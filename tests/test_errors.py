@@ -40,7 +40,7 @@ def test_content_type_problem_json(test_client):
 
 
 def test_method_not_allowed_rfc7807(test_client):
-    response = test_client.patch("/api/v1/entries")
+    response = test_client.put("/api/v1/entries")
 
     assert response.status_code == 405
     data = response.json()
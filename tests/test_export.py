@@ -0,0 +1,158 @@
+import asyncio
+import csv
+import io
+import json
+import zlib
+
+import pytest
+
+from app.core.errors import ApiError
+from app.core.export import (
+    ExportFormat,
+    ExportResponse,
+    ExportSlots,
+    encode_export,
+    export_slots,
+)
+
+
+def _seed(test_client, count):
+    return [
+        test_client.post(
+            "/api/v1/entries",
+            json={"title": f"Книга, том {i}", "kind": "book", "status": "planned"},
+        ).json()
+        for i in range(count)
+    ]
+
+
+def _ndjson(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestExportEntries:
+
+    def test_ndjson_export_contains_every_entry(self, test_client):
+        created = _seed(test_client, 5)
+
+        response = test_client.get("/api/v1/entries/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "entries.ndjson" in response.headers["content-disposition"]
+        assert _ndjson(response.text) == created
+
+    def test_csv_export_with_fields(self, test_client):
+        created = _seed(test_client, 3)
+
+        response = test_client.get(
+            "/api/v1/entries/export", params={"format": "csv", "fields": "title"}
+        )
+
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows == [
+            {"id": str(entry["id"]), "title": entry["title"]} for entry in created
+        ]
+
+    def test_gzip_export_is_decoded_by_client(self, test_client):
+        created = _seed(test_client, 3)
+
+        response = test_client.get("/api/v1/entries/export", params={"gzip": "true"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert _ndjson(response.text) == created
+
+    def test_export_resumes_after_last_received_id(self, test_client):
+        created = _seed(test_client, 6)
+
+        response = test_client.get(
+            "/api/v1/entries/export", params={"after_id": created[2]["id"]}
+        )
+
+        assert _ndjson(response.text) == created[3:]
+
+    def test_export_slot_is_released(self, test_client):
+        _seed(test_client, 2)
+        for _ in range(export_slots.limit + 1):
+            assert test_client.get("/api/v1/entries/export").status_code == 200
+        assert export_slots.active == 0
+
+
+def test_truncated_gzip_stream_is_readable_up_to_last_batch():
+    async def batches():
+        yield [{"id": 1, "title": "A"}]
+        yield [{"id": 2, "title": "B"}]
+
+    async def collect():
+        return [
+            chunk
+            async for chunk in encode_export(
+                batches(), ExportFormat.NDJSON, ("id", "title"), compress=True
+            )
+        ]
+
+    chunks = asyncio.run(collect())
+    # Обрыв после второй пачки: завершающий блок gzip не получен.
+    partial = zlib.decompressobj(wbits=31).decompress(b"".join(chunks[:2]))
+
+    assert _ndjson(partial.decode()) == [
+        {"id": 1, "title": "A"},
+        {"id": 2, "title": "B"},
+    ]
+
+
+def test_concurrent_exports_are_limited():
+    slots = ExportSlots(limit=1)
+    slots.acquire()
+
+    with pytest.raises(ApiError) as error:
+        slots.acquire()
+
+    assert error.value.status == 429
+    slots.release()
+    slots.acquire()
+
+
+def _unstarted_export(slots):
+    started = []
+
+    async def body():
+        started.append(True)
+        yield b"never sent"
+
+    slots.acquire()
+    return ExportResponse(body(), slots), started
+
+
+def test_export_slot_is_released_on_disconnect_before_body():
+    slots = ExportSlots(limit=1)
+    response, started = _unstarted_export(slots)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # Клиент ушёл, пока отправлялись заголовки.
+        await asyncio.sleep(3600)
+
+    asyncio.run(response({"type": "http"}, receive, send))
+
+    assert started == [] and slots.active == 0
+
+
+def test_export_slot_is_released_when_send_fails():
+    slots = ExportSlots(limit=1)
+    response, started = _unstarted_export(slots)
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        raise OSError("connection reset")
+
+    # anyio может обернуть ошибку отправки в ExceptionGroup.
+    with pytest.raises(Exception):
+        asyncio.run(response({"type": "http"}, receive, send))
+
+    assert started == [] and slots.active == 0
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.database import async_engine
+from app.core.group_commit import GroupCommitWriter, get_entry_writer
+from app.domain.database_models import EntryDB
+from app.domain.models import EntryCreate, EntryUpdate
+from app.main import app
+
+
+def _entry(i):
+    return EntryCreate(title=f"Book {i}", kind="book")
+
+
+async def _count_entries():
+    async with async_engine.connect() as connection:
+        return (await connection.execute(select(func.count(EntryDB.id)))).scalar()
+
+
+def test_concurrent_creates_share_commits():
+    async def scenario():
+        writer = GroupCommitWriter(window=0.01)
+        records = await asyncio.gather(*(writer.create(_entry(i)) for i in range(50)))
+        await writer.stop()
+        return writer, records, await _count_entries()
+
+    writer, records, stored = asyncio.run(scenario())
+
+    assert [record.title for record in records] == [f"Book {i}" for i in range(50)]
+    assert len({record.id for record in records}) == 50
+    assert stored == 50
+    assert writer.commits < 50
+
+
+def test_update_and_delete_report_missing_entries():
+    async def scenario():
+        writer = GroupCommitWriter()
+        record = await writer.create(_entry(1))
+        updated = await writer.update(record.id, EntryUpdate(status="completed"))
+        missing = await writer.update(record.id + 1, EntryUpdate(status="completed"))
+        deleted = await writer.delete(record.id)
+        deleted_again = await writer.delete(record.id)
+        await writer.stop()
+        return updated.status, missing, deleted, deleted_again
+
+    assert asyncio.run(scenario()) == ("completed", None, True, False)
+
+
+def test_failing_operation_does_not_fail_its_group():
+    async def scenario():
+        writer = GroupCommitWriter(window=0.01)
+        results = await asyncio.gather(
+            writer.create(_entry(1)),
+            writer.update(1, None),
+            writer.create(_entry(2)),
+            return_exceptions=True,
+        )
+        await writer.stop()
+        return results, await _count_entries()
+
+    (first, error, second), stored = asyncio.run(scenario())
+
+    assert isinstance(error, AttributeError)
+    assert (first.title, second.title, stored) == ("Book 1", "Book 2", 2)
+
+
+def test_stop_flushes_queued_requests():
+    async def scenario():
+        writer = GroupCommitWriter(window=0.05)
+        pending = asyncio.gather(*(writer.create(_entry(i)) for i in range(3)))
+        await asyncio.sleep(0)
+        await writer.stop()
+        return len(await pending)
+
+    assert asyncio.run(scenario()) == 3
+
+
+@pytest.fixture
+def writer_client(test_client):
+    writer = GroupCommitWriter()
+    app.dependency_overrides[get_entry_writer] = lambda: writer
+    yield test_client
+    test_client.portal.call(writer.stop)
+    app.dependency_overrides.pop(get_entry_writer)
+
+
+def test_endpoints_write_through_writer(writer_client, sample_entry_data):
+    created = writer_client.post("/api/v1/entries", json=sample_entry_data)
+    assert created.status_code == 201
+    entry_id = created.json()["id"]
+
+    updated = writer_client.put(
+        f"/api/v1/entries/{entry_id}", json={"status": "reading"}
+    )
+    assert updated.json()["status"] == "reading"
+    fetched = writer_client.get(f"/api/v1/entries/{entry_id}")
+    assert fetched.json()["status"] == "reading"
+
+    assert writer_client.delete(f"/api/v1/entries/{entry_id}").status_code == 204
+    assert writer_client.delete(f"/api/v1/entries/{entry_id}").status_code == 404
+    missing = writer_client.put(f"/api/v1/entries/{entry_id}", json={"title": "x"})
+    assert missing.status_code == 404
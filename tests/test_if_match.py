@@ -0,0 +1,161 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.etag import entry_etag, if_match_versions
+from app.core.repository import VersionMismatchError
+from app.domain.models import EntryBatchUpdate, EntryCreate, EntryUpdate
+
+
+def _etag(test_client, entry_id, **params):
+    return test_client.get(f"/api/v1/entries/{entry_id}", params=params).headers["ETag"]
+
+
+class TestIfMatch:
+
+    def test_stale_put_is_rejected(self, test_client, created_entry):
+        url = f"/api/v1/entries/{created_entry['id']}"
+        etag = _etag(test_client, created_entry["id"])
+
+        first = test_client.put(
+            url, json={"status": "reading"}, headers={"If-Match": etag}
+        )
+        second = test_client.put(
+            url, json={"status": "completed"}, headers={"If-Match": etag}
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 412
+        assert second.headers["content-type"] == "application/problem+json"
+        body = second.json()
+        assert body["type"] == "/errors/precondition-failed"
+        assert body["details"]["etag"] == _etag(test_client, created_entry["id"])
+        assert test_client.get(url).json()["status"] == "reading"
+
+    def test_fresh_etag_after_update_matches(self, test_client, created_entry):
+        url = f"/api/v1/entries/{created_entry['id']}"
+        test_client.put(url, json={"status": "reading"})
+        etag = _etag(test_client, created_entry["id"])
+
+        response = test_client.put(
+            url, json={"status": "completed"}, headers={"If-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+
+    def test_put_returns_etag_of_new_version(self, test_client, created_entry):
+        url = f"/api/v1/entries/{created_entry['id']}"
+        test_client.get(url)
+
+        response = test_client.put(url, json={"title": "Renamed"})
+
+        assert response.headers["ETag"] == entry_etag(created_entry["id"], 2, None)
+        # Закэшированная до PUT запись не отдаётся со старым ETag.
+        fresh = test_client.get(url)
+        assert fresh.headers["ETag"] == response.headers["ETag"]
+        assert fresh.json() == response.json()
+        chained = test_client.put(
+            url,
+            json={"status": "reading"},
+            headers={"If-Match": response.headers["ETag"]},
+        )
+        assert chained.status_code == 200
+
+    def test_projection_etag_identifies_the_same_version(
+        self, test_client, created_entry
+    ):
+        etag = _etag(test_client, created_entry["id"], fields="title")
+
+        response = test_client.put(
+            f"/api/v1/entries/{created_entry['id']}",
+            json={"title": "Renamed"},
+            headers={"If-Match": etag},
+        )
+
+        assert response.status_code == 200
+
+    def test_stale_delete_keeps_entry(self, test_client, created_entry):
+        url = f"/api/v1/entries/{created_entry['id']}"
+        stale = _etag(test_client, created_entry["id"])
+        test_client.put(url, json={"status": "reading"})
+
+        rejected = test_client.delete(url, headers={"If-Match": stale})
+        fresh = _etag(test_client, created_entry["id"])
+        deleted = test_client.delete(url, headers={"If-Match": fresh})
+
+        assert rejected.status_code == 412
+        assert deleted.status_code == 204
+        assert test_client.get(url).status_code == 404
+
+    @pytest.mark.parametrize(
+        "if_match, expected",
+        [("*", 200), ('"unrelated"', 412), ("weak", 412)],
+    )
+    def test_if_match_forms(self, test_client, created_entry, if_match, expected):
+        if if_match == "weak":
+            if_match = "W/" + _etag(test_client, created_entry["id"])
+
+        response = test_client.put(
+            f"/api/v1/entries/{created_entry['id']}",
+            json={"status": "reading"},
+            headers={"If-Match": if_match},
+        )
+
+        assert response.status_code == expected
+
+    def test_missing_entry_is_not_found(self, test_client):
+        response = test_client.put(
+            "/api/v1/entries/999999",
+            json={"status": "reading"},
+            headers={"If-Match": entry_etag(999999, 1)},
+        )
+
+        assert response.status_code == 404
+
+
+def test_if_match_versions():
+    etag = entry_etag(7, 3, ("title",))
+
+    assert if_match_versions(None, 7) is None
+    assert if_match_versions("*", 7) is None
+    assert if_match_versions(f'{etag}, "entry-8-4-00"', 7) == {3}
+    assert if_match_versions(f"W/{etag}", 7) == set()
+
+
+def test_conditional_update_is_a_single_statement(repository):
+    record = repository.create(EntryCreate(title="Versioned", kind="book"))
+    statements = []
+    bind = repository.db.get_bind()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", count)
+    repository.update(record.id, EntryUpdate(title="First editor"), {1})
+    event.remove(bind, "before_cursor_execute", count)
+
+    updates = [s for s in statements if s.startswith("UPDATE entries")]
+    assert len(updates) == 1
+    assert "version IN" in updates[0]
+    assert not any("FOR UPDATE" in s for s in statements)
+    assert repository.get_entry_version(record.id) == 2
+
+    with pytest.raises(VersionMismatchError) as error:
+        repository.update(record.id, EntryUpdate(title="Second editor"), {1})
+    assert error.value.version == 2
+    assert repository.get_by_id(record.id).title == "First editor"
+
+
+def test_every_write_path_bumps_version(repository):
+    record = repository.create(EntryCreate(title="Versioned", kind="book"))
+    repository.update(record.id, EntryUpdate(status="reading"))
+    repository.apply_batch(
+        [EntryBatchUpdate(op="update", id=record.id, data={"status": "completed"})]
+    )
+    repository.update_where(EntryUpdate(kind="article"), status="completed")
+
+    assert repository.get_entry_version(record.id) == 4
+    with pytest.raises(VersionMismatchError):
+        repository.delete(record.id, {3})
+    assert repository.delete(record.id, {4}) is True
+    assert repository.delete(record.id, {4}) is False
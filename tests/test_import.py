@@ -0,0 +1,149 @@
+import io
+import json
+
+from app.core.export import ExportFormat
+from app.core.importer import MAX_IMPORT_ERRORS, import_entries, read_records
+
+
+def _import(test_client, name, content, **params):
+    return test_client.post(
+        "/api/v1/entries/import",
+        files={"file": (name, content.encode("utf-8"))},
+        params=params,
+    )
+
+
+def _ndjson(*records):
+    return "".join(
+        (record if isinstance(record, str) else json.dumps(record)) + "\n"
+        for record in records
+    )
+
+
+class TestImportEntries:
+
+    def test_ndjson_import_reports_bad_lines_and_keeps_going(self, test_client):
+        content = _ndjson(
+            {"title": "Clean Code", "kind": "book"},
+            "{not json",
+            {"title": "DROP TABLE entries", "kind": "book"},
+            "",
+            {"title": "DDIA", "kind": "article", "link": "https://example.com/ddia"},
+            {"title": "No link", "kind": "article"},
+        )
+
+        response = _import(test_client, "entries.ndjson", content)
+
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == 2
+        assert report["failed"] == 3
+        assert [error["line"] for error in report["errors"]] == [2, 3, 6]
+        assert report["errors"][0]["detail"].startswith("Invalid JSON")
+        assert "prohibited SQL patterns" in report["errors"][1]["detail"]
+        titles = [
+            item["title"] for item in test_client.get("/api/v1/entries").json()["items"]
+        ]
+        assert titles == ["Clean Code", "DDIA"]
+
+    def test_csv_import_round_trips_export(self, test_client):
+        for i in range(3):
+            test_client.post(
+                "/api/v1/entries",
+                json={"title": f"Book, vol. {i}", "kind": "book", "status": "reading"},
+            )
+        exported = test_client.get(
+            "/api/v1/entries/export", params={"format": "csv"}
+        ).text
+
+        report = _import(test_client, "backup.csv", exported).json()
+
+        assert report == {
+            "imported": 3,
+            "failed": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+        stats = test_client.get("/api/v1/entries/stats").json()
+        assert stats["by_status"]["reading"] == 6
+
+    def test_format_can_be_given_explicitly(self, test_client):
+        content = _ndjson({"title": "Refactoring", "kind": "book"})
+
+        assert _import(test_client, "upload.txt", content).status_code == 422
+        report = _import(test_client, "upload.txt", content, format="ndjson").json()
+        assert report["imported"] == 1
+
+    def test_imported_entries_are_searchable(self, test_client):
+        _import(
+            test_client,
+            "e.ndjson",
+            _ndjson({"title": "Rust in Action", "kind": "book"}),
+        )
+
+        response = test_client.get("/api/v1/entries/suggest", params={"prefix": "rus"})
+
+        assert [item["title"] for item in response.json()["items"]] == [
+            "Rust in Action"
+        ]
+
+
+class _Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def create_many(self, entries, owner_id=1):
+        self.batches.append(len(entries))
+        return entries
+
+
+def test_import_inserts_in_batches():
+    content = _ndjson(*({"title": f"Book {i}", "kind": "book"} for i in range(7)))
+    recorder = _Recorder()
+
+    report = import_entries(
+        recorder, io.BytesIO(content.encode()), ExportFormat.NDJSON, batch_size=3
+    )
+
+    assert report.imported == 7
+    assert recorder.batches == [3, 3, 1]
+
+
+def test_error_list_is_capped():
+    content = _ndjson(*(["[]"] * (MAX_IMPORT_ERRORS + 5)))
+
+    report = import_entries(
+        _Recorder(), io.BytesIO(content.encode()), ExportFormat.NDJSON
+    )
+
+    assert report.failed == MAX_IMPORT_ERRORS + 5
+    assert report.to_dict()["errors_truncated"] is True
+
+
+def test_csv_multiline_fields_keep_line_numbers():
+    content = 'title,kind\n"Two\nlines",book\nok,book\n'
+
+    records = list(read_records(io.BytesIO(content.encode()), ExportFormat.CSV))
+
+    assert [(line, record["title"]) for line, record, _ in records] == [
+        (3, "Two\nlines"),
+        (4, "ok"),
+    ]
+
+
+def test_invalid_utf8_line_is_reported_and_skipped():
+    valid = _ndjson({"title": "Book", "kind": "book"}).encode()
+    content = valid + b'{"title": "\xff", "kind": "book"}\n' + valid
+
+    report = import_entries(_Recorder(), io.BytesIO(content), ExportFormat.NDJSON)
+
+    assert report.imported == 2
+    assert report.errors == [{"line": 2, "detail": "Line is not valid UTF-8"}]
+
+
+def test_csv_bom_is_ignored():
+    content = "\ufefftitle,kind\nBook,book\n".encode("utf-8")
+
+    records = list(read_records(io.BytesIO(content), ExportFormat.CSV))
+
+    assert records == [(2, {"title": "Book", "kind": "book"}, None)]
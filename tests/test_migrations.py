@@ -0,0 +1,123 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect
+
+from app.core.duplicates import link_hash
+from app.core.migrate import alembic_config, migrate
+from app.domain.database_models import Base, is_search_object
+
+
+def _migrated_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "head")
+    return engine
+
+
+def test_upgrade_head_matches_models(tmp_path):
+    engine = _migrated_engine(tmp_path)
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(
+            connection,
+            opts={"include_name": lambda *args: not is_search_object(*args)},
+        )
+        diff = compare_metadata(context, Base.metadata)
+
+    assert diff == []
+
+
+def test_upgrade_creates_access_path_indexes(tmp_path):
+    engine = _migrated_engine(tmp_path)
+
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspect(engine).get_indexes("entries")
+    }
+
+    assert indexes["ix_entries_owner_status_id"] == ["owner_id", "status", "id"]
+    assert indexes["ix_entries_owner_kind_id"] == ["owner_id", "kind", "id"]
+
+
+def test_downgrade_to_base(tmp_path):
+    engine = _migrated_engine(tmp_path)
+
+    with engine.begin() as connection:
+        command.downgrade(alembic_config(connection), "base")
+
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+
+
+def test_upgrade_indexes_existing_titles_for_search(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "8d41b7c3e2f6")
+        connection.exec_driver_sql(
+            "INSERT INTO entries (owner_id, title, kind, status) "
+            "VALUES (1, 'Existing search target', 'book', 'planned')"
+        )
+        command.upgrade(alembic_config(connection), "head")
+        rows = connection.exec_driver_sql(
+            "SELECT rowid FROM entries_fts WHERE entries_fts MATCH 'search'"
+        ).all()
+
+    assert rows == [(1,)]
+
+
+def test_upgrade_backfills_link_hashes_and_trigrams(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "b7e9a2d4c1f3")
+        connection.exec_driver_sql(
+            "INSERT INTO entries (owner_id, title, kind, link, status) "
+            "VALUES (1, 'Existing duplicate', 'article', "
+            "'https://www.example.com/a/', 'planned')"
+        )
+        command.upgrade(alembic_config(connection), "head")
+        hashes = connection.exec_driver_sql("SELECT link_hash FROM entries").all()
+        trigrams = connection.exec_driver_sql(
+            "SELECT rowid FROM entries_trigrams WHERE entries_trigrams MATCH 'dup'"
+        ).all()
+
+    assert hashes == [(link_hash("https://example.com/a"),)]
+    assert trigrams == [(1,)]
+
+
+def test_upgrade_database_stamped_at_empty_initial_revision(tmp_path):
+    # Как закоммиченная reading_list.db: помечена 017275651475, таблиц нет.
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as connection:
+        command.stamp(alembic_config(connection), "017275651475")
+        command.upgrade(alembic_config(connection), "head")
+
+    assert "entries" in inspect(engine).get_table_names()
+
+
+def test_migrate_adopts_schema_created_by_create_all(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    assert migrate(engine) == "stamp"
+    assert migrate(engine) == "upgrade"
+    with engine.connect() as connection:
+        head = ScriptDirectory.from_config(alembic_config(connection))
+        revision = MigrationContext.configure(connection).get_current_revision()
+    assert revision == head.get_current_head()
+
+
+def test_upgrade_backfills_updated_at(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    with engine.begin() as connection:
+        command.upgrade(alembic_config(connection), "a3e8c5f1b7d2")
+        connection.exec_driver_sql(
+            "INSERT INTO entries (owner_id, title, kind, status) "
+            "VALUES (1, 'Before updated_at', 'book', 'completed')"
+        )
+        command.upgrade(alembic_config(connection), "head")
+        rows = connection.exec_driver_sql(
+            "SELECT count(*) FROM entries WHERE updated_at IS NULL"
+        ).scalar()
+
+    assert rows == 0
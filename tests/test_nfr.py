@@ -7,6 +7,7 @@ from fastapi.testclient import TestClient
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.main import app
+from benchmarks.loadtest import LatencyHistogram, check_nfr
 
 
 class TestNFRValidation:
@@ -95,3 +96,24 @@ class TestNFRValidation:
         assert invalid_count == len(
             invalid_statuses
         ), f"Invalid status not rejected: {invalid_count}/{len(invalid_statuses)}"
+
+    # Замер по часам с порогами p95: на медленной или общей машине CI даёт
+    # ложные падения, поэтому запускается только явно (RUN_LOAD_TESTS=1).
+    @pytest.mark.skipif(
+        not os.getenv("RUN_LOAD_TESTS"), reason="set RUN_LOAD_TESTS=1 to run"
+    )
+    def test_nfr_06_and_nfr_12_under_open_loop_load(self):
+        reports, problems = check_nfr(duration=2)
+
+        assert not problems, "\n".join(problems)
+        assert all(report.routes for report in reports)
+
+    def test_latency_histogram_percentiles_within_one_percent(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        assert histogram.total == 1000
+        assert histogram.percentile(95) == pytest.approx(0.950, rel=0.01)
+        assert histogram.percentile(50) == pytest.approx(0.500, rel=0.01)
+        assert histogram.percentile(100) == 1.0
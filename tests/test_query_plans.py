@@ -0,0 +1,261 @@
+import re
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.pagination import encode_cursor
+from app.core.repository import EntryRepository
+from app.domain.database_models import utcnow
+from app.domain.models import EntryCreate, EntryUpdate
+
+# "SCAN n CONSTANT ROWS" — проход по списку VALUES многострочного INSERT.
+FULL_SCAN = re.compile(r"\bSCAN (?!.*\bUSING\b)(?!\d+ CONSTANT ROWS)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+# Горячие запросы: каждый должен идти по индексу и отдавать строки уже в порядке
+# курсора, иначе стоимость страницы растёт вместе с таблицей.
+HOT_CALLS = {
+    "page": (
+        lambda repo: repo.get_page(limit=10),
+        "ix_entries_owner_id_id",
+    ),
+    "page_cursor": (
+        lambda repo: repo.get_page(limit=10, cursor=encode_cursor("id", 5, 5)),
+        "ix_entries_owner_id_id",
+    ),
+    "page_status": (
+        lambda repo: repo.get_page(status="reading", limit=10),
+        "ix_entries_owner_status_id",
+    ),
+    "page_status_cursor": (
+        lambda repo: repo.get_page(
+            status="reading", limit=10, cursor=encode_cursor("id", 5, 5)
+        ),
+        "ix_entries_owner_status_id",
+    ),
+    "page_kind": (
+        lambda repo: repo.get_page(kind="article", limit=10),
+        "ix_entries_owner_kind_id",
+    ),
+    "page_title": (
+        lambda repo: repo.get_page(
+            limit=10, sort="title", cursor=encode_cursor("title", "Book 5", 5)
+        ),
+        "ix_entries_owner_title_id",
+    ),
+    "page_status_fields": (
+        lambda repo: repo.get_page(
+            status="reading", limit=10, fields=("id", "title", "status")
+        ),
+        "ix_entries_owner_status_id",
+    ),
+    "all_status": (
+        lambda repo: repo.get_all(status="completed"),
+        "ix_entries_owner_status_id",
+    ),
+    "by_id": (
+        lambda repo: repo.get_by_id(3),
+        "INTEGER PRIMARY KEY",
+    ),
+    "stats": (
+        lambda repo: repo.get_stats(),
+        "sqlite_autoindex_entry_counters_1",
+    ),
+    "page_archived": (
+        lambda repo: repo.get_page(limit=10, include_archived=True),
+        "ix_entries_archive_owner_id_id",
+    ),
+    "page_archived_cursor": (
+        lambda repo: repo.get_page(
+            limit=10, cursor=encode_cursor("id", 5, 5), include_archived=True
+        ),
+        "ix_entries_archive_owner_id_id",
+    ),
+    "page_archived_status": (
+        lambda repo: repo.get_page(status="completed", limit=10, include_archived=True),
+        "ix_entries_archive_owner_status_id",
+    ),
+    "page_archived_kind": (
+        lambda repo: repo.get_page(kind="article", limit=10, include_archived=True),
+        "ix_entries_archive_owner_kind_id",
+    ),
+    "page_archived_title": (
+        lambda repo: repo.get_page(
+            limit=10,
+            sort="title",
+            cursor=encode_cursor("title", "Book 5", 5),
+            include_archived=True,
+        ),
+        "ix_entries_archive_owner_title_id",
+    ),
+    # Выборка пачки, удаление с RETURNING и вставка удалённых строк в архив; у
+    # INSERT ... VALUES и UPSERT версии коллекции плана нет.
+    "archive_batch": (
+        lambda repo: repo.archive_completed(utcnow() + timedelta(days=1), limit=5),
+        [
+            "ix_entries_status_updated_at",
+            "INTEGER PRIMARY KEY",
+            None,
+            None,
+        ],
+    ),
+    "archive_owner_batch": (
+        lambda repo: repo.archive_completed(
+            utcnow() + timedelta(days=1), limit=5, owner_id=1
+        ),
+        [
+            "ix_entries_owner_status_id",
+            "INTEGER PRIMARY KEY",
+            None,
+            None,
+        ],
+    ),
+}
+
+WRITE_CALLS = {
+    "create": lambda repo: repo.create(EntryCreate(title="New book", kind="book")),
+    "update": lambda repo: repo.update(4, EntryUpdate(status="completed")),
+    "delete": lambda repo: repo.delete(6),
+    "update_where": lambda repo: repo.update_where(
+        EntryUpdate(status="completed"), status="reading"
+    ),
+    "delete_where": lambda repo: repo.delete_where(kind="book", status="planned"),
+}
+
+
+@pytest.fixture
+def plan_session(db_session, repository):
+    for i in range(20):
+        repository.create(
+            EntryCreate(
+                title=f"Book {i}",
+                kind="article" if i % 3 else "book",
+                link=f"https://example.com/{i}",
+                status=["planned", "reading", "completed"][i % 3],
+            )
+        )
+
+    return db_session.get_bind(), db_session
+
+
+def _capture(engine, session, call):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        # У executemany план один на все строки: хватает первой.
+        statements.append((statement, parameters[0] if many else parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call(EntryRepository(session))
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def _query_plan(engine, statement, parameters):
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def _plans(engine, session, call):
+    return [
+        (statement, _query_plan(engine, statement, parameters))
+        for statement, parameters in _capture(engine, session, call)
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_CALLS))
+def test_hot_queries_use_indexes(plan_session, name):
+    engine, session = plan_session
+    call, expected = HOT_CALLS[name]
+
+    plans = _plans(engine, session, call)
+
+    assert plans
+    # Строка — индекс для всех запросов вызова, список — по запросу на каждый.
+    if isinstance(expected, str):
+        expected = [expected] * len(plans)
+    assert len(plans) == len(expected), f"{name}: {[s for s, _ in plans]}"
+    for (statement, plan), expected_index in zip(plans, expected):
+        details = " | ".join(plan)
+        if expected_index is not None:
+            assert expected_index in details, f"{name}: {statement} -> {details}"
+        assert not FULL_SCAN.search(details), f"{name}: {statement} -> {details}"
+        assert not TEMP_SORT.search(details), f"{name}: {statement} -> {details}"
+
+
+@pytest.mark.parametrize("name", sorted(WRITE_CALLS))
+def test_write_statements_do_not_scan(plan_session, name):
+    engine, session = plan_session
+
+    for statement, plan in _plans(engine, session, WRITE_CALLS[name]):
+        details = " | ".join(plan)
+        assert not FULL_SCAN.search(details), f"{name}: {statement} -> {details}"
+
+
+def test_archive_is_skipped_for_other_statuses(plan_session):
+    engine, session = plan_session
+
+    plans = _plans(
+        engine,
+        session,
+        lambda repo: repo.get_page(status="reading", limit=10, include_archived=True),
+    )
+
+    assert len(plans) == 1
+    assert "entries_archive" not in plans[0][0]
+
+
+def test_search_uses_full_text_index(plan_session):
+    engine, session = plan_session
+
+    plans = _plans(engine, session, lambda repo: repo.search("book 5"))
+
+    assert len(plans) == 1
+    statement, plan = plans[0]
+    details = " | ".join(plan)
+    assert "VIRTUAL TABLE INDEX" in details, f"{statement} -> {details}"
+    assert "SEARCH entries USING INTEGER PRIMARY KEY" in details, details
+    assert not re.search(r"\bSCAN entries\b", details), details
+
+
+def test_duplicate_lookup_uses_link_and_trigram_indexes(plan_session):
+    engine, session = plan_session
+
+    plans = _plans(
+        engine,
+        session,
+        lambda repo: repo.find_duplicates("Book 5", "https://example.com/5"),
+    )
+
+    # Ссылка, частоты триграмм "boo" и "ook" одним запросом, затем кандидаты.
+    assert len(plans) == 3
+    link_details = " | ".join(plans[0][1])
+    assert "ix_entries_owner_link_hash" in link_details, link_details
+    for _, plan in plans[1:]:
+        title_details = " | ".join(plan)
+        assert "VIRTUAL TABLE INDEX" in title_details, title_details
+        assert not re.search(r"\bSCAN entries\b", title_details), title_details
+    # Внешний цикл поиска кандидатов — FTS, entries читается по первичному
+    # ключу, а не проверкой MATCH для каждой строки владельца.
+    candidates = plans[-1][1]
+    assert "VIRTUAL TABLE INDEX" in candidates[0], candidates
+    assert "INTEGER PRIMARY KEY" in candidates[1], candidates
+
+
+def test_duplicate_report_groups_by_link_hash_index(plan_session):
+    engine, session = plan_session
+
+    plans = _plans(engine, session, lambda repo: repo.duplicate_groups())
+
+    statement, plan = plans[0]
+    details = " | ".join(plan)
+    assert "COVERING INDEX ix_entries_owner_link_hash" in details, details
+    assert not TEMP_SORT.search(details), f"{statement} -> {details}"
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.repository import AsyncEntryRepository, EntryRepository
+from app.domain.models import EntryCreate, EntryUpdate
+
+# Сколько SQL-запросов допускается на одну операцию записи. Транзакционные
+# BEGIN/COMMIT не считаются: они не проходят через cursor.execute. Успешная
+# запись добавляет upsert версии коллекции и upsert entry_counters; смена
+# status/kind и массовые операции сначала читают прежние пары (status, kind).
+# Промах по id ещё пробует вернуть строку из архива, массовые операции без
+# фильтра по незавершённому статусу проходят по обоим слоям: entries и
+# entries_archive.
+STATEMENT_BUDGET = {
+    "create": 3,
+    "update": 4,
+    "update_missing": 2,
+    "delete": 3,
+    "delete_missing": 2,
+    "update_where": 6,
+    "delete_where": 6,
+}
+
+FALLBACK_BUDGET = {
+    "create": 3,
+    "update": 5,
+    "update_missing": 2,
+    "delete": 4,
+    "delete_missing": 2,
+    "update_where": 7,
+    "delete_where": 7,
+}
+
+OPERATIONS = {
+    "create": lambda repo: repo.create(EntryCreate(title="Another", kind="book")),
+    "update": lambda repo: repo.update(1, EntryUpdate(status="reading")),
+    "update_missing": lambda repo: repo.update(999, EntryUpdate(status="reading")),
+    "delete": lambda repo: repo.delete(1),
+    "delete_missing": lambda repo: repo.delete(999),
+    "update_where": lambda repo: repo.update_where(
+        EntryUpdate(status="completed"), kind="book"
+    ),
+    "delete_where": lambda repo: repo.delete_where(kind="book"),
+}
+
+
+@pytest.fixture
+def repo_engine(db_session, repository):
+    # Каждая операция идёт в своей сессии поверх движка общей фикстуры.
+    repository.create(
+        EntryCreate(title="Existing", kind="book", link="https://example.com")
+    )
+    db_session.close()
+    return db_session.get_bind()
+
+
+def _run_counting(engine, operation):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    session = sessionmaker(bind=engine)()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = OPERATIONS[operation](EntryRepository(session))
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        session.close()
+    return result, statements
+
+
+@pytest.mark.parametrize("operation", sorted(OPERATIONS))
+def test_write_statement_budget(repo_engine, operation):
+    _, statements = _run_counting(repo_engine, operation)
+
+    assert len(statements) == STATEMENT_BUDGET[operation], statements
+    if operation != "update_missing":
+        assert any("RETURNING" in statement for statement in statements)
+
+
+@pytest.mark.parametrize("operation", sorted(OPERATIONS))
+def test_write_statement_budget_without_returning(repo_engine, operation, monkeypatch):
+    for flag in ("insert_returning", "update_returning", "delete_returning"):
+        monkeypatch.setattr(repo_engine.dialect, flag, False)
+
+    _, statements = _run_counting(repo_engine, operation)
+
+    assert len(statements) == FALLBACK_BUDGET[operation], statements
+    assert all("RETURNING" not in statement for statement in statements)
+
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_write_results_match_with_and_without_returning(
+    repo_engine, returning, monkeypatch
+):
+    if not returning:
+        for flag in ("insert_returning", "update_returning", "delete_returning"):
+            monkeypatch.setattr(repo_engine.dialect, flag, False)
+
+    created, _ = _run_counting(repo_engine, "create")
+    updated, _ = _run_counting(repo_engine, "update")
+    missing, _ = _run_counting(repo_engine, "update_missing")
+    deleted, _ = _run_counting(repo_engine, "delete")
+    not_deleted, _ = _run_counting(repo_engine, "delete_missing")
+
+    assert created.to_dict() == {
+        "id": 2,
+        "owner_id": 1,
+        "title": "Another",
+        "kind": "book",
+        "link": None,
+        "status": "planned",
+    }
+    assert updated.status == "reading"
+    assert updated.link == "https://example.com"
+    assert missing is None
+    assert deleted is True
+    assert not_deleted is False
+
+
+def test_async_repository_uses_the_same_statements(repo_engine):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{repo_engine.url.database}")
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            async with async_sessionmaker(bind=engine)() as session:
+                repo = AsyncEntryRepository(session)
+                created = await repo.create(EntryCreate(title="Async", kind="book"))
+                updated = await repo.update(created.id, EntryUpdate(status="reading"))
+                page, next_cursor = await repo.get_page(limit=1)
+                deleted = await repo.delete(created.id)
+        finally:
+            await engine.dispose()
+        return created, updated, page, next_cursor, deleted, statements
+
+    created, updated, page, next_cursor, deleted, statements = asyncio.run(scenario())
+
+    assert created.title == "Async"
+    assert updated.status == "reading"
+    assert [record.title for record in page] == ["Existing"]
+    assert next_cursor is not None
+    assert deleted is True
+    assert len(statements) == 11
@@ -51,7 +51,7 @@ class TestRFC7807ErrorFormat:
         assert error_data["status"] == 422
 
     def test_method_not_allowed_format(self, test_client):
-        response = test_client.patch("/api/v1/entries")
+        response = test_client.put("/api/v1/entries")
 
         assert response.status_code == 405
         assert response.headers["content-type"] == "application/problem+json"
@@ -148,7 +148,7 @@ class TestRFC7807ErrorFormat:
     def test_error_response_structure_consistency(self, test_client):
         error_endpoints = [
             ("/api/v1/nonexistent", 404),
-            ("/api/v1/entries", "PATCH"),
+            ("/api/v1/entries", "PUT"),
         ]
 
         for endpoint, method in error_endpoints:
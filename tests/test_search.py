@@ -0,0 +1,92 @@
+import pytest
+
+
+def _create(test_client, title, kind="book"):
+    payload = {"title": title, "kind": kind, "status": "planned"}
+    if kind == "article":
+        payload["link"] = "https://example.com/article"
+    return test_client.post("/api/v1/entries", json=payload).json()
+
+
+def _search(test_client, **params):
+    response = test_client.get("/api/v1/entries/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestSearchEntries:
+
+    def test_returns_ranked_matches_only(self, test_client):
+        _create(test_client, "Refactoring")
+        _create(test_client, "Clean Code")
+        _create(test_client, "Code Complete, second edition of the classic")
+        _create(test_client, "The Pragmatic Programmer")
+
+        titles = [item["title"] for item in _search(test_client, q="code")["items"]]
+
+        # Короткий заголовок ранжируется выше (bm25 учитывает длину документа).
+        assert titles == ["Clean Code", "Code Complete, second edition of the classic"]
+
+    def test_matches_word_prefixes_and_unicode(self, test_client):
+        _create(test_client, "Designing Data-Intensive Applications")
+        _create(test_client, "Чистая архитектура")
+
+        assert _search(test_client, q="design data")["total"] == 1
+        assert _search(test_client, q="архит")["items"][0]["title"] == (
+            "Чистая архитектура"
+        )
+
+    def test_index_follows_updates_and_deletes(self, test_client):
+        entry = _create(test_client, "Working Effectively with Legacy Code")
+        url = f"/api/v1/entries/{entry['id']}"
+
+        test_client.put(url, json={"title": "Domain-Driven Design"})
+        assert _search(test_client, q="legacy")["items"] == []
+        assert _search(test_client, q="domain")["total"] == 1
+
+        test_client.delete(url)
+        assert _search(test_client, q="domain")["items"] == []
+
+    def test_cursor_pagination_covers_all_matches(self, test_client):
+        for i in range(7):
+            _create(test_client, f"Python recipes volume {i}")
+        _create(test_client, "Rust in Action")
+
+        seen, cursor = [], None
+        while True:
+            params = {"q": "python", "limit": 3, "fields": "title"}
+            if cursor:
+                params["cursor"] = cursor
+            page = _search(test_client, **params)
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        assert len(seen) == len(set(seen)) == 7
+        assert set(page["items"][0]) == {"id", "title"}
+
+    @pytest.mark.parametrize(
+        "query", ['"unbalanced', "NEAR(code", "code OR", "title:code*"]
+    )
+    def test_query_syntax_is_not_interpreted(self, test_client, query):
+        _create(test_client, "Clean Code")
+
+        response = test_client.get("/api/v1/entries/search", params={"q": query})
+
+        assert response.status_code == 200
+
+    def test_query_without_words_is_rejected(self, test_client):
+        response = test_client.get("/api/v1/entries/search", params={"q": "!!! ?"})
+
+        assert response.status_code == 422
+        assert response.headers["content-type"] == "application/problem+json"
+
+    def test_search_cursor_is_not_a_list_cursor(self, test_client):
+        for i in range(3):
+            _create(test_client, f"Go patterns {i}")
+        cursor = _search(test_client, q="go", limit=1)["next_cursor"]
+
+        response = test_client.get("/api/v1/entries", params={"cursor": cursor})
+
+        assert response.status_code == 422
@@ -0,0 +1,165 @@
+import json
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import ShardRouter
+from app.core.rebalance import ShardMoveError, misplaced, move_owner
+from app.core.repository import EntryRepository
+from app.domain.database_models import Base, EntryDB, utcnow
+from app.domain.models import EntryCreate, EntryKind, EntryStatus
+
+
+@pytest.fixture
+def router(tmp_path):
+    shards = {name: f"sqlite:///{tmp_path / name}.db" for name in ("a", "b", "c")}
+    router = ShardRouter(shards, echo=False)
+    for bind in router.writers():
+        Base.metadata.create_all(bind=bind)
+    yield router
+    router.dispose()
+
+
+def _create(router, owner_id, count, status=EntryStatus.PLANNED):
+    with router.session(owner_id) as db:
+        return EntryRepository(db).create_many(
+            [
+                EntryCreate(title=f"Book {i}", kind=EntryKind.BOOK, status=status)
+                for i in range(count)
+            ],
+            owner_id,
+        )
+
+
+def _owners(router, name):
+    with Session(router.engines(name).writer) as db:
+        return set(db.scalars(select(EntryDB.owner_id).distinct()))
+
+
+def test_ring_is_stable_and_spreads_owners():
+    shards = {name: "sqlite://" for name in ("a", "b", "c")}
+    first, second = ShardRouter(shards), ShardRouter(dict(reversed(shards.items())))
+
+    placement = {owner_id: first.shard_for(owner_id) for owner_id in range(3000)}
+    assert placement == {o: second.shard_for(o) for o in placement}
+    counts = [list(placement.values()).count(name) for name in shards]
+    assert min(counts) > 600
+
+
+def test_adding_shard_moves_only_owners_to_it():
+    old = ShardRouter({name: "sqlite://" for name in ("a", "b", "c")})
+    new = ShardRouter({name: "sqlite://" for name in ("a", "b", "c", "d")})
+
+    moved = [o for o in range(3000) if old.shard_for(o) != new.shard_for(o)]
+    assert all(new.shard_for(o) == "d" for o in moved)
+    assert 0.1 < len(moved) / 3000 < 0.4
+
+
+def test_pinned_owner_overrides_ring_and_survives_save(tmp_path):
+    router = ShardRouter({"a": "sqlite://", "b": "sqlite://"})
+    owner_id = next(o for o in range(100) if router.hashed_shard(o) == "a")
+    router.pin(owner_id, "b")
+    path = tmp_path / "shards.json"
+    router.save(str(path))
+
+    loaded = ShardRouter.load(str(path))
+    assert loaded.shard_for(owner_id) == "b"
+    assert json.loads(path.read_text())["owners"] == {str(owner_id): "b"}
+
+    loaded.pin(owner_id, "a")
+    assert loaded.owners == {}
+    with pytest.raises(ValueError, match="unknown shards"):
+        ShardRouter({"a": "sqlite://"}, {1: "x"})
+
+
+def test_sessions_write_to_owner_shard(router):
+    for owner_id in range(1, 10):
+        _create(router, owner_id, 2)
+
+    for name in router.shards:
+        owners = _owners(router, name)
+        assert all(router.shard_for(o) == name for o in owners)
+
+
+def test_move_owner_copies_rows_and_cleans_source(router, tmp_path):
+    owner_id = 7
+    source = router.shard_for(owner_id)
+    target = next(name for name in router.shards if name != source)
+    created = _create(router, owner_id, 3, EntryStatus.COMPLETED)
+    with router.session(owner_id) as db:
+        old_version = EntryRepository(db).get_collection_version(owner_id)
+
+    path = tmp_path / "shards.json"
+    report = move_owner(router, owner_id, target, path=str(path))
+
+    assert report.moved == 3 and report.renumbered == {}
+    assert router.shard_for(owner_id) == target
+    assert ShardRouter.load(str(path)).shard_for(owner_id) == target
+    assert owner_id not in _owners(router, source)
+    with router.session(owner_id) as db:
+        repository = EntryRepository(db)
+        assert [e.id for e in repository.get_all(owner_id=owner_id)] == [
+            e.id for e in created
+        ]
+        assert repository.get_collection_version(owner_id) > old_version
+        assert repository.get_stats(owner_id)["by_status"]["completed"] == 3
+        assert repository.search("Book", owner_id=owner_id)[0]
+    assert misplaced(router) == []
+
+
+def test_move_owner_refuses_id_collisions_unless_renumbered(router):
+    source = router.shard_for(1)
+    target = next(name for name in router.shards if name != source)
+    other = next(o for o in range(2, 100) if router.shard_for(o) == target)
+    _create(router, 1, 2)
+    _create(router, other, 1)
+
+    with pytest.raises(ShardMoveError, match="already exist"):
+        move_owner(router, 1, target, path=None)
+    assert router.shard_for(1) == source
+
+    report = move_owner(router, 1, target, renumber=True, path=None)
+    assert report.moved == 2
+    assert list(report.renumbered) == [1]
+    with router.session(1) as db:
+        ids = [e.id for e in EntryRepository(db).get_all(owner_id=1)]
+    assert sorted(ids) == sorted([2, report.renumbered[1]])
+
+
+def test_misplaced_lists_owners_after_adding_shard(router, tmp_path):
+    for owner_id in range(1, 30):
+        _create(router, owner_id, 1)
+    shards = dict(router.shards, d=f"sqlite:///{tmp_path / 'd'}.db")
+    grown = ShardRouter(shards, echo=False)
+    Base.metadata.create_all(bind=grown.engines("d").writer)
+
+    moves = misplaced(grown)
+    assert moves and all(target == "d" for _, _, target in moves)
+    for owner_id, source, target in moves:
+        move_owner(grown, owner_id, target, source=source, path=None)
+    assert misplaced(grown) == []
+    assert grown.owners == {}
+    grown.dispose()
+
+
+def test_misplaced_lists_owners_with_only_archived_entries(router, tmp_path):
+    owners = range(1, 30)
+    for owner_id in owners:
+        _create(router, owner_id, 1, EntryStatus.COMPLETED)
+        with router.session(owner_id) as db:
+            EntryRepository(db).archive_completed(
+                utcnow() + timedelta(days=1), limit=10, owner_id=owner_id
+            )
+    shards = dict(router.shards, d=f"sqlite:///{tmp_path / 'd'}.db")
+    grown = ShardRouter(shards, echo=False)
+    Base.metadata.create_all(bind=grown.engines("d").writer)
+
+    moves = misplaced(grown)
+    assert moves and all(target == "d" for _, _, target in moves)
+    assert not any(_owners(grown, name) for name in grown.shards)
+    for owner_id, source, target in moves:
+        move_owner(grown, owner_id, target, source=source, path=None)
+    assert misplaced(grown) == []
+    grown.dispose()
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.database import async_engine
+
+
+def _select_statements(call):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = call()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    return response, [s for s in statements if "FROM entries" in s]
+
+
+def _create(test_client, title, status="planned"):
+    response = test_client.post(
+        "/api/v1/entries",
+        json={
+            "title": title,
+            "kind": "article",
+            "link": f"https://example.com/{title.replace(' ', '-')}",
+            "status": status,
+        },
+    )
+    return response.json()
+
+
+class TestSparseFieldsets:
+
+    def test_list_projects_columns_and_payload(self, test_client):
+        _create(test_client, "First")
+        _create(test_client, "Second", status="reading")
+
+        response, statements = _select_statements(
+            lambda: test_client.get("/api/v1/entries?fields=title,status")
+        )
+
+        assert response.status_code == 200
+        assert response.json()["items"] == [
+            {"id": 1, "title": "First", "status": "planned"},
+            {"id": 2, "title": "Second", "status": "reading"},
+        ]
+        assert len(statements) == 1
+        selected = statements[0].split("FROM")[0]
+        assert "link" not in selected
+        assert "kind" not in selected
+
+    def test_projection_keeps_cursor_pagination(self, test_client):
+        for title in ("Gamma", "Alpha", "Beta"):
+            _create(test_client, title)
+
+        first = test_client.get(
+            "/api/v1/entries?fields=status&sort=title&limit=2"
+        ).json()
+        second = test_client.get(
+            "/api/v1/entries",
+            params={
+                "fields": "status",
+                "sort": "title",
+                "limit": 2,
+                "cursor": first["next_cursor"],
+            },
+        ).json()
+
+        assert [item["id"] for item in first["items"]] == [2, 3]
+        assert [item["id"] for item in second["items"]] == [1]
+        assert set(first["items"][0]) == {"id", "status"}
+        assert second["next_cursor"] is None
+
+    def test_item_projection(self, test_client):
+        entry = _create(test_client, "Single")
+        url = f"/api/v1/entries/{entry['id']}"
+
+        narrow, statements = _select_statements(
+            lambda: test_client.get(url, params={"fields": "link"})
+        )
+        test_client.get(url)
+        cached = test_client.get(url, params={"fields": "title,kind"})
+
+        assert narrow.json() == {"id": entry["id"], "link": entry["link"]}
+        assert "title" not in statements[0]
+        assert cached.json() == {
+            "id": entry["id"],
+            "title": "Single",
+            "kind": "article",
+        }
+
+    def test_projection_changes_etag(self, test_client):
+        entry = _create(test_client, "Tagged")
+        url = f"/api/v1/entries/{entry['id']}"
+
+        full = test_client.get(url).headers["ETag"]
+        narrow = test_client.get(url, params={"fields": "title"}).headers["ETag"]
+
+        assert full != narrow
+
+    @pytest.mark.parametrize("fields", ["title,password", "__class__", " , "])
+    def test_invalid_fields_are_rejected(self, test_client, fields):
+        response = test_client.get("/api/v1/entries", params={"fields": fields})
+
+        assert response.status_code == 422
+        assert response.headers["content-type"] == "application/problem+json"
@@ -0,0 +1,109 @@
+from sqlalchemy import func, select
+
+from app.domain.database_models import EntryCounterDB, EntryDB
+from app.domain.models import EntryCreate, EntryUpdate
+
+
+def _create(test_client, title, kind="book", status="planned"):
+    payload = {"title": title, "kind": kind, "status": status}
+    if kind == "article":
+        payload["link"] = f"https://example.com/{title.replace(' ', '-')}"
+    return test_client.post("/api/v1/entries", json=payload).json()
+
+
+def _stats(test_client):
+    response = test_client.get("/api/v1/entries/stats")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestEntryStats:
+
+    def test_empty_collection_reports_zeros(self, test_client):
+        assert _stats(test_client) == {
+            "total": 0,
+            "by_status": {"planned": 0, "reading": 0, "completed": 0},
+            "by_kind": {"book": 0, "article": 0},
+        }
+
+    def test_counts_follow_create_update_and_delete(self, test_client):
+        first = _create(test_client, "Book one")
+        _create(test_client, "Article one", kind="article", status="reading")
+        third = _create(test_client, "Book two", status="completed")
+
+        test_client.put(f"/api/v1/entries/{first['id']}", json={"status": "reading"})
+        test_client.delete(f"/api/v1/entries/{third['id']}")
+
+        stats = _stats(test_client)
+        assert stats["total"] == 2
+        assert stats["by_status"] == {"planned": 0, "reading": 2, "completed": 0}
+        assert stats["by_kind"] == {"book": 1, "article": 1}
+
+    def test_counts_follow_batch_and_bulk_operations(self, test_client):
+        entry = _create(test_client, "Book one")
+        test_client.post(
+            "/api/v1/entries:batch",
+            json={
+                "operations": [
+                    {"op": "create", "data": {"title": "Batch book", "kind": "book"}},
+                    {"op": "update", "id": entry["id"], "data": {"status": "reading"}},
+                    {
+                        "op": "update",
+                        "id": entry["id"],
+                        "data": {"status": "completed"},
+                    },
+                    {"op": "delete", "id": 999},
+                ]
+            },
+        )
+        test_client.patch(
+            "/api/v1/entries", params={"status": "planned"}, json={"kind": "article"}
+        )
+
+        stats = _stats(test_client)
+        assert stats["by_status"] == {"planned": 1, "reading": 0, "completed": 1}
+        assert stats["by_kind"] == {"book": 1, "article": 1}
+
+        test_client.delete("/api/v1/entries", params={"kind": "article"})
+        assert _stats(test_client)["total"] == 1
+
+    def test_etag_changes_with_collection(self, test_client):
+        etag = test_client.get("/api/v1/entries/stats").headers["ETag"]
+
+        cached = test_client.get(
+            "/api/v1/entries/stats", headers={"If-None-Match": etag}
+        )
+        _create(test_client, "Book one")
+        fresh = test_client.get(
+            "/api/v1/entries/stats", headers={"If-None-Match": etag}
+        )
+
+        assert cached.status_code == 304
+        assert fresh.status_code == 200
+
+
+def test_reconcile_recomputes_counters_from_entries(db_session, repository):
+    for i in range(6):
+        repository.create(
+            EntryCreate(title=f"Book {i}", kind="book"), owner_id=i % 2 + 1
+        )
+    repository.update(1, EntryUpdate(status="completed"))
+
+    # Расхождение, которое транзакционное обновление не создало бы.
+    db_session.execute(EntryCounterDB.__table__.update().values(count=100))
+    db_session.execute(EntryDB.__table__.delete().where(EntryDB.id == 2))
+    db_session.commit()
+
+    assert repository.reconcile_counters(owner_id=1) == 2
+    assert repository.get_stats(owner_id=1)["by_status"] == {
+        "planned": 2,
+        "reading": 0,
+        "completed": 1,
+    }
+    assert repository.get_stats(owner_id=2)["total"] == 100
+
+    repository.reconcile_counters()
+    counted = db_session.execute(
+        select(func.count()).where(EntryDB.owner_id == 2)
+    ).scalar()
+    assert repository.get_stats(owner_id=2)["total"] == counted == 2
@@ -0,0 +1,93 @@
+import asyncio
+
+from app.core.streaming import entry_list_json
+from app.domain.models import EntryCreate
+
+
+def _create(test_client, title, status="planned"):
+    payload = {"title": title, "kind": "book", "status": status}
+    return test_client.post("/api/v1/entries", json=payload).json()
+
+
+class TestStreamedEntryList:
+
+    def test_stream_returns_every_matching_entry(self, test_client):
+        created = [_create(test_client, f"Книга {i}") for i in range(250)]
+
+        response = test_client.get("/api/v1/entries", params={"stream": "true"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert body["items"] == created
+        assert body["total"] == 250
+        assert body["next_cursor"] is None
+
+    def test_stream_applies_filters_fields_and_cursor(self, test_client):
+        for i in range(6):
+            _create(test_client, f"Book {i}", status="reading" if i % 2 else "planned")
+
+        first = test_client.get(
+            "/api/v1/entries", params={"status": "reading", "limit": 1}
+        ).json()
+        response = test_client.get(
+            "/api/v1/entries",
+            params={
+                "status": "reading",
+                "fields": "title",
+                "cursor": first["next_cursor"],
+                "stream": "true",
+            },
+        )
+
+        assert response.json()["items"] == [
+            {"id": item["id"], "title": item["title"]}
+            for item in test_client.get(
+                "/api/v1/entries", params={"status": "reading"}
+            ).json()["items"][1:]
+        ]
+
+    def test_stream_supports_conditional_requests(self, test_client):
+        _create(test_client, "Book")
+        params = {"stream": "true"}
+        etag = test_client.get("/api/v1/entries", params=params).headers["ETag"]
+
+        response = test_client.get(
+            "/api/v1/entries", params=params, headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+
+    def test_empty_stream_is_valid_json(self, test_client):
+        response = test_client.get("/api/v1/entries", params={"stream": "true"})
+
+        assert response.json() == {"items": [], "total": 0, "next_cursor": None}
+
+
+def test_iter_all_reads_in_batches(repository):
+    for i in range(7):
+        repository.create(EntryCreate(title=f"Book {i}", kind="book"))
+
+    batches = list(repository.iter_all(fields=("id",), batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [item["id"] for batch in batches for item in batch] == list(range(1, 8))
+
+
+def test_json_is_emitted_per_batch():
+    async def batches():
+        yield [{"id": 1}]
+        yield []
+        yield [{"id": 2}, {"id": 3}]
+
+    async def collect():
+        return [chunk async for chunk in entry_list_json(batches())]
+
+    chunks = asyncio.run(collect())
+
+    assert chunks == [
+        b'{"items":[',
+        b'{"id":1}',
+        b',{"id":2},{"id":3}',
+        b'],"total":3,"next_cursor":null}',
+    ]
@@ -0,0 +1,164 @@
+from sqlalchemy import event
+
+from app.core.changes import EntryChange
+from app.core.database import SessionLocal, async_engine
+from app.core.repository import EntryRepository
+from app.core.suggest import SuggestIndex, get_suggest_index, normalize_title
+from app.domain.models import EntryUpdate
+
+
+def _create(test_client, title):
+    payload = {"title": title, "kind": "book", "status": "planned"}
+    return test_client.post("/api/v1/entries", json=payload).json()
+
+
+def _suggest(test_client, prefix, **params):
+    response = test_client.get(
+        "/api/v1/entries/suggest", params={"prefix": prefix, **params}
+    )
+    assert response.status_code == 200, response.text
+    return [item["title"] for item in response.json()["items"]]
+
+
+def _count_statements(call):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        result = call()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    return result, statements
+
+
+class TestSuggestEndpoint:
+
+    def test_matches_title_and_word_prefixes(self, test_client):
+        _create(test_client, "Clean Code")
+        _create(test_client, "Code Complete")
+        _create(test_client, "Чистая Архитектура")
+        _create(test_client, "Café Society")
+
+        assert _suggest(test_client, "clean c") == ["Clean Code"]
+        assert sorted(_suggest(test_client, "CO")) == ["Clean Code", "Code Complete"]
+        assert _suggest(test_client, "архит") == ["Чистая Архитектура"]
+        assert _suggest(test_client, "cafe") == ["Café Society"]
+        assert _suggest(test_client, "rust") == []
+
+    def test_warm_index_does_not_touch_database(self, test_client):
+        _create(test_client, "Refactoring")
+        _suggest(test_client, "re")
+
+        titles, statements = _count_statements(lambda: _suggest(test_client, "ref"))
+
+        assert titles == ["Refactoring"]
+        assert statements == []
+
+    def test_index_follows_writes(self, test_client):
+        entry = _create(test_client, "Legacy Code")
+        url = f"/api/v1/entries/{entry['id']}"
+        assert _suggest(test_client, "leg") == ["Legacy Code"]
+
+        _create(test_client, "Learning Go")
+        assert _suggest(test_client, "le") == ["Learning Go", "Legacy Code"]
+
+        test_client.put(url, json={"title": "Domain-Driven Design"})
+        assert _suggest(test_client, "leg") == []
+        assert _suggest(test_client, "domain") == ["Domain-Driven Design"]
+
+        test_client.delete(url)
+        assert _suggest(test_client, "domain") == []
+
+    def test_index_follows_bulk_writes(self, test_client):
+        _create(test_client, "Kotlin in Action")
+        assert _suggest(test_client, "kot") == ["Kotlin in Action"]
+
+        test_client.post(
+            "/api/v1/entries:batch",
+            json={
+                "operations": [
+                    {"op": "create", "data": {"title": "Kafka Streams", "kind": "book"}}
+                ]
+            },
+        )
+        assert _suggest(test_client, "k") == ["Kafka Streams", "Kotlin in Action"]
+
+        test_client.delete("/api/v1/entries", params={"status": "planned"})
+        assert _suggest(test_client, "k") == []
+
+    def test_limit_and_blank_prefix(self, test_client):
+        for i in range(5):
+            _create(test_client, f"Python {i}")
+
+        assert len(_suggest(test_client, "py", limit=3)) == 3
+        response = test_client.get("/api/v1/entries/suggest", params={"prefix": "  "})
+        assert response.status_code == 422
+
+
+def test_only_committed_writes_are_published(test_client):
+    entry = _create(test_client, "Original")
+    _suggest(test_client, "orig")
+
+    db = SessionLocal()
+    try:
+        repository = EntryRepository(db)
+        repository.update(entry["id"], EntryUpdate(title="Phantom"))
+        repository.update(999, EntryUpdate(title="Missing"))
+    finally:
+        db.close()
+    assert _suggest(test_client, "phantom") == ["Phantom"]
+    assert _suggest(test_client, "missing") == []
+
+
+class TestSuggestIndex:
+
+    def test_memory_budget_evicts_least_recently_used_owner(self):
+        index = SuggestIndex(max_keys=4)
+        for owner_id in (1, 2):
+            assert index.begin_build(owner_id)
+            index.finish_build(owner_id, [{"id": owner_id, "title": "two words"}])
+        index.lookup(1, "two", 10)
+
+        index.begin_build(3)
+        index.finish_build(3, [{"id": 3, "title": "one"}])
+
+        assert index.lookup(2, "two", 10) is None
+        assert index.lookup(1, "two", 10) == [{"id": 1, "title": "two words"}]
+        assert index.stats() == {"owners": 2, "keys": 3, "builds": 3, "evictions": 1}
+
+    def test_oversized_owner_is_not_indexed(self):
+        index = SuggestIndex(max_keys=2)
+        index.begin_build(1)
+        index.finish_build(1, [{"id": 1, "title": "a b c"}])
+
+        assert index.lookup(1, "a", 10) is None
+        assert not index.begin_build(1)
+
+    def test_changes_during_build_are_replayed(self):
+        index = SuggestIndex()
+        index.begin_build(1)
+        index.apply([EntryChange(1, 1, "Renamed"), EntryChange(2, 1, None)])
+        index.finish_build(1, [{"id": 1, "title": "Old"}, {"id": 2, "title": "Gone"}])
+
+        assert index.lookup(1, "renamed", 10) == [{"id": 1, "title": "Renamed"}]
+        assert index.lookup(1, "old", 10) == []
+        assert index.lookup(1, "gone", 10) == []
+
+    def test_expired_index_is_rebuilt(self, test_client):
+        _create(test_client, "Stale Title")
+        _suggest(test_client, "stale")
+        index = get_suggest_index()
+        index.ttl = 0
+        try:
+            assert index.lookup(1, "stale", 10) is None
+        finally:
+            index.ttl = SuggestIndex().ttl
+        assert _suggest(test_client, "stale") == ["Stale Title"]
+
+
+def test_normalize_title():
+    assert normalize_title("  Ёлки   и  ПАЛКИ ") == "елки и палки"
+    assert normalize_title("Straße") == "strasse"
@@ -1,4 +1,7 @@
-from app.domain.models import EntryCreate, EntryKind
+import pytest
+from pydantic import ValidationError
+
+from app.domain.models import EntryCreate, EntryKind, EntryUpdate
 
 
 class TestInputValidationSecurity:
@@ -208,3 +211,53 @@ def test_dangerous_characters_removal():
         title="Normal Title with Spaces", kind="book", status="planned"
     )
     assert "Normal Title with Spaces" == safe_entry.title
+
+
+@pytest.mark.parametrize(
+    "title, message",
+    [
+        ("sElEcT name", "prohibited SQL patterns"),
+        ("ſelect name", "prohibited SQL patterns"),
+        ("a /* comment", "prohibited SQL patterns"),
+        ("x or y 1 = 1", "prohibited SQL patterns"),
+        ("JaVaScRiPt: void", "unsafe content"),
+        ("eval(payload)", "unsafe content"),
+        ("Button onClick=go", "unsafe content"),
+    ],
+)
+def test_title_rules_apply_to_create_and_update(title, message):
+    # Create и update используют один и тот же скомпилированный набор правил.
+    with pytest.raises(ValidationError, match=message):
+        EntryCreate(title=title, kind="book")
+    with pytest.raises(ValidationError, match=message):
+        EntryUpdate(title=title)
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Selected essays",
+        "Or else 1=2",
+        "OR\n1=1 on a new line",
+        "Data structures: a primer",
+        "Книга про SQL",
+    ],
+)
+def test_title_rules_do_not_reject_benign_titles(title):
+    assert EntryCreate(title=title, kind="book").title == title
+
+
+@pytest.mark.parametrize(
+    "link, message",
+    [
+        ("FTP://example.com", "Dangerous URL scheme"),
+        ("https://example.com/a//b", "dangerous sequences"),
+        ("https://example.com/a?next=JavaScript", "unsafe query"),
+        ("https://bad_domain.com", "Invalid domain format"),
+    ],
+)
+def test_link_rules_apply_to_create_and_update(link, message):
+    with pytest.raises(ValidationError, match=message):
+        EntryCreate(title="Book", kind="book", link=link)
+    with pytest.raises(ValidationError, match=message):
+        EntryUpdate(link=link)